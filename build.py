@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Builds every contract under contracts/, for each network, in a process pool.
+
+    ./build.py                          # release build of all contracts for mainnet and testnet
+    ./build.py --env testnet            # only the testnet variants
+    ./build.py GhostMarketNFT           # only the given contracts
+    ./build.py --debug                  # keep the debug instrumentation and generate the .nefdbgnfo files
+    ./build.py --no-cache               # compile again even if the compile cache has the outputs
+
+Outputs are written to build/<env>/<contract>.nef, next to their .manifest.json (and .nefdbgnfo).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from boa3.boa3 import Boa3
+
+import compile_cache
+import preprocess
+
+GHOST_ROOT = os.path.dirname(os.path.abspath(__file__))
+CONTRACTS_DIR = preprocess.CONTRACTS_DIR
+BUILD_DIR = os.path.join(GHOST_ROOT, 'build')
+ENVIRONMENTS = ['mainnet', 'testnet']
+
+
+@contextmanager
+def suppress_stdout():
+    with open(os.devnull, "w") as devnull:
+        old_stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = old_stdout
+
+
+@contextmanager
+def forget_modules(file_names: list[str]):
+    """
+    Remove the local modules of a build from `sys.modules`, before and after compiling.
+
+    neo3-boa leaves the modules a contract imports in `sys.modules`, where the next compile in the same process would
+    find them instead of the ones next to the contract it compiles.
+    """
+    names = [os.path.splitext(file_name)[0] for file_name in file_names]
+    for name in names:
+        sys.modules.pop(name, None)
+    try:
+        yield
+    finally:
+        for name in names:
+            sys.modules.pop(name, None)
+
+
+def discover_contracts(contracts_dir: str = CONTRACTS_DIR) -> list[str]:
+    """
+    Get the path of every contract under `contracts_dir`.
+
+    A contract is a python file defining `manifest_metadata`, the modules shared by the contracts are skipped. Files
+    whose name is not a valid identifier (like the legacy GhostMarket.NFT.py) can't be compiled by neo3-boa and are
+    skipped.
+    """
+    contracts = []
+    for root, _, files in os.walk(contracts_dir):
+        for file_name in sorted(files):
+            name, extension = os.path.splitext(file_name)
+            if extension != '.py' or not name.isidentifier():
+                continue
+
+            path = os.path.join(root, file_name)
+            with open(path) as contract_file:
+                if 'def manifest_metadata(' in contract_file.read():
+                    contracts.append(path)
+    return sorted(contracts)
+
+
+def contract_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def build_contract(path: str, nef_path: str, env: str = None, debug: bool = False, use_cache: bool = True) -> str:
+    """
+    Compile the contract at `path` into `nef_path`, removing the outputs of previous builds first.
+
+    Release builds compile the preprocessed contract and the modules it imports, written to a temporary folder. Debug
+    builds compile the source as is and also generate the debug info. The outputs are taken from the compile cache when
+    the same sources were already compiled with the same flags.
+
+    :return: the path of the generated nef file
+    """
+    for output_path in compile_cache.output_paths(nef_path):
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    os.makedirs(os.path.dirname(nef_path), exist_ok=True)
+
+    file_name = os.path.basename(path)
+    sources = preprocess.contract_sources(path, release=not debug)
+    modules = {name: source for name, source in sources.items() if name != file_name}
+
+    key = compile_cache.cache_key(sources[file_name], file_name, env, debug, source_path=os.path.abspath(path),
+                                  modules=modules)
+    if use_cache and compile_cache.lookup(key, nef_path):
+        return nef_path
+
+    with suppress_stdout(), forget_modules(list(modules)):
+        if debug:
+            Boa3.compile_and_save(path, output_path=nef_path, root_folder=CONTRACTS_DIR, env=env, debug=True)
+        else:
+            with tempfile.TemporaryDirectory() as build_dir:
+                cleaned_path = preprocess.write_sources(sources, build_dir)
+                Boa3.compile_and_save(cleaned_path, output_path=nef_path, env=env)
+
+    if use_cache:
+        compile_cache.store(key, nef_path)
+    return nef_path
+
+
+def build_target(path: str, env: str, build_dir: str, debug: bool, use_cache: bool) -> str:
+    nef_path = os.path.join(build_dir, env, contract_name(path) + '.nef')
+    return build_contract(path, nef_path, env=env, debug=debug, use_cache=use_cache)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Build the GhostMarket contracts.')
+    parser.add_argument('contracts', nargs='*', help='names of the contracts to build (default: all of them)')
+    parser.add_argument('--env', action='append', choices=ENVIRONMENTS,
+                        help='network to build for, can be repeated (default: all of them)')
+    parser.add_argument('--output', default=BUILD_DIR, help='build folder (default: %(default)s)')
+    parser.add_argument('--debug', action='store_true', help='keep the debug instrumentation and generate debug info')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help='always compile, without reading or writing the compile cache')
+    parser.add_argument('--jobs', type=int, default=None, help='number of parallel builds (default: cpu count)')
+    args = parser.parse_args()
+
+    contracts = discover_contracts()
+    names = [contract_name(path) for path in contracts]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        print(f'contract names must be unique: {", ".join(duplicated)}')
+        return 1
+
+    if args.contracts:
+        unknown = sorted(set(args.contracts) - set(names))
+        if unknown:
+            print(f'unknown contracts: {", ".join(unknown)}')
+            return 1
+        contracts = [path for path in contracts if contract_name(path) in args.contracts]
+
+    environments = args.env if args.env else ENVIRONMENTS
+    targets = [(path, env) for path in contracts for env in environments]
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(build_target, path, env, args.output, args.debug, args.use_cache): (path, env)
+                   for path, env in targets}
+        for future in as_completed(futures):
+            path, env = futures[future]
+            try:
+                nef_path = future.result()
+                print(f'{contract_name(path)} ({env}): {os.path.relpath(nef_path)}')
+            except Exception:
+                failed += 1
+                print(f'{contract_name(path)} ({env}): build failed')
+                traceback.print_exc()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
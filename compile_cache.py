@@ -0,0 +1,133 @@
+"""
+Content-addressed cache of the compiler outputs.
+
+An entry is keyed on the sources that are given to the compiler (the contract and the local modules it imports), the
+neo3-boa version and the compile flags, so a contract is only compiled again when one of them changes. Entries are
+folders under the cache dir holding the .nef, the .manifest.json and, for debug builds, the .nefdbgnfo. The least
+recently used entries are evicted once the cache grows past its size limit.
+
+    GHOST_BUILD_CACHE_DIR       cache folder (default: .build_cache/)
+    GHOST_BUILD_CACHE_SIZE      size limit in MB (default: 64)
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from importlib import metadata
+
+GHOST_ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('GHOST_BUILD_CACHE_DIR', os.path.join(GHOST_ROOT, '.build_cache'))
+CACHE_SIZE = int(float(os.environ.get('GHOST_BUILD_CACHE_SIZE', 64)) * 1024 * 1024)
+
+OUTPUT_EXTENSIONS = ['.nef', '.manifest.json', '.nefdbgnfo']
+# outputs every entry has, the debug info is only there for debug builds
+REQUIRED_EXTENSIONS = ['.nef', '.manifest.json']
+
+
+def boa_version() -> str:
+    return metadata.version('neo3-boa')
+
+
+def cache_key(source: str, file_name: str, env: str | None, debug: bool, source_path: str = None,
+              modules: dict[str, str] = None) -> str:
+    """
+    Get the cache key of a compilation.
+
+    :param source: the source given to the compiler
+    :param file_name: the file name of the source, the compiled contract is named after it
+    :param env: the compile environment
+    :param debug: whether the debug info is generated
+    :param source_path: path of the compiled file, the debug info references it so it's part of the key of debug builds
+    :param modules: the sources of the local modules imported by the contract, keyed by file name
+    """
+    digest = hashlib.sha256()
+    parts = [boa_version(), file_name, env or '', str(debug), (source_path or '') if debug else '', source]
+    for module_name, module_source in sorted((modules or {}).items()):
+        parts.extend([module_name, module_source])
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def output_paths(nef_path: str) -> list[str]:
+    base_path, _ = os.path.splitext(nef_path)
+    return [base_path + extension for extension in OUTPUT_EXTENSIONS]
+
+
+def entry_path(key: str, cache_dir: str = CACHE_DIR) -> str:
+    return os.path.join(cache_dir, key)
+
+
+def lookup(key: str, nef_path: str, cache_dir: str = CACHE_DIR) -> bool:
+    """
+    Copy the outputs cached under `key` next to `nef_path`.
+
+    :return: whether the key was in the cache, with all its required outputs
+    """
+    entry = entry_path(key, cache_dir)
+    if not os.path.isdir(entry):
+        return False
+
+    for extension in REQUIRED_EXTENSIONS:
+        if not os.path.isfile(os.path.join(entry, 'contract' + extension)):
+            # incomplete entry, compiled again and stored anew
+            shutil.rmtree(entry, ignore_errors=True)
+            return False
+
+    for extension, output_path in zip(OUTPUT_EXTENSIONS, output_paths(nef_path)):
+        cached_path = os.path.join(entry, 'contract' + extension)
+        if extension in REQUIRED_EXTENSIONS or os.path.exists(cached_path):
+            shutil.copyfile(cached_path, output_path)
+
+    # the entry modification time tracks its last use for the eviction
+    os.utime(entry)
+    return True
+
+
+def store(key: str, nef_path: str, cache_dir: str = CACHE_DIR, size_limit: int = CACHE_SIZE):
+    """
+    Store the outputs next to `nef_path` under `key`, then evict the old entries past the size limit.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    # the entry is written aside and moved in place, so parallel builds never see a partial entry
+    staging = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+    for extension, output_path in zip(OUTPUT_EXTENSIONS, output_paths(nef_path)):
+        if os.path.exists(output_path):
+            shutil.copyfile(output_path, os.path.join(staging, 'contract' + extension))
+
+    try:
+        os.rename(staging, entry_path(key, cache_dir))
+    except OSError:
+        # another build stored the same entry first
+        shutil.rmtree(staging, ignore_errors=True)
+
+    evict(cache_dir, size_limit)
+
+
+def entry_size(entry: str) -> int:
+    return sum(os.path.getsize(os.path.join(entry, file_name)) for file_name in os.listdir(entry))
+
+
+def evict(cache_dir: str = CACHE_DIR, size_limit: int = CACHE_SIZE):
+    """
+    Remove the least recently used entries until the cache fits in `size_limit` bytes.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if name.startswith('.') or not os.path.isdir(entry):
+            continue
+        try:
+            entries.append((os.path.getmtime(entry), entry_size(entry), entry))
+        except FileNotFoundError:
+            # evicted by a parallel build
+            continue
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total_size <= size_limit:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
@@ -1,20 +1,27 @@
 from typing import Any, Dict, List, Union, cast
 
 from boa3.builtin.compile_time import CreateNewEvent, NeoMetadata, public
-from boa3.builtin.type.helper import to_bytes
+from boa3.builtin.type.helper import to_bytes, to_int
 from boa3.builtin.interop.blockchain import get_contract, Transaction
-from boa3.builtin.interop.contract import CallFlags, call_contract, destroy_contract, get_call_flags, update_contract
+from boa3.builtin.interop.contract import call_contract, destroy_contract
 from boa3.builtin.interop.iterator import Iterator
 from boa3.builtin.contract import abort
-from boa3.builtin.interop.json import json_deserialize
-from boa3.builtin.interop.runtime import check_witness, get_network, script_container
-from boa3.builtin.interop.stdlib import serialize, deserialize, atoi
-from boa3.builtin.interop.storage import delete, get, get_int, get_bool, get_uint160, put, put_bool, put_int, put_uint160, put_str, find, get_read_only_context
+from boa3.builtin.interop.json import json_deserialize, json_serialize
+from boa3.builtin.interop.runtime import address_version, check_witness, get_network, script_container
+from boa3.builtin.interop.stdlib import base58_check_decode, base64_encode, serialize, deserialize, atoi, memory_compare
+from boa3.builtin.interop.storage import delete, get, get_int, put, put_int, find, get_read_only_context
 from boa3.builtin.interop.storage.findoptions import FindOptions
 from boa3.builtin.type import UInt160
 from boa3.builtin.interop.runtime import get_network
 from boa3.builtin.contract import to_script_hash
 
+# a single import, neo3-boa only exports the public methods of the last import of a module
+from ghost_runtime import (
+    getAuthorizedAddress, setAuthorizedAddress, isPaused, updatePause, update, verify, STATE_PAUSED,
+    contract_deployed, contract_paused, debug, expect, get_contract_state, init_runtime, migrate_runtime,
+    set_contract_flag, validateAddress
+)
+
 
 # -------------------------------------------
 # METADATA
@@ -44,12 +51,6 @@ TOKEN_SYMBOL = 'GHOST'
 # Number of decimal places
 TOKEN_DECIMALS = 0
 
-# Whether the smart contract was deployed or not
-DEPLOYED = b'deployed'
-
-# Whether the smart contract is paused or not
-PAUSED = b'paused'
-
 
 # -------------------------------------------
 # PREFIXES
@@ -64,6 +65,9 @@ SUPPLY_PREFIX = b'SPP'
 META_PREFIX = b'MDP'
 LOCKED_VIEW_COUNT_PREFIX = b'LVCP'
 ROYALTIES_PREFIX = b'RYP'
+ROYALTIES_INFO_PREFIX = b'RIP'
+CREATOR_PREFIX = b'CRP'
+COLLECTION_PREFIX = b'CLP'
 
 
 # -------------------------------------------
@@ -71,7 +75,67 @@ ROYALTIES_PREFIX = b'RYP'
 # -------------------------------------------
 
 TOKEN_COUNT = b'TOKEN_COUNT'
+# List of the authorized addresses written by previous versions, moved to the ghost_runtime keys on update
 AUTH_ADDRESSES = b'AUTH_ADDRESSES'
+STORAGE_VERSION = b'STORAGE_VERSION'
+# Number of the first token minted with an ordered token id, absent while they're not enabled
+ORDERED_IDS_START = b'ORDERED_IDS_START'
+COLLECTION_COUNT = b'COLLECTION_COUNT'
+
+
+# -------------------------------------------
+# TOKEN RECORD
+# -------------------------------------------
+
+# The record stored under TOKEN_PREFIX is the owner followed by one byte of flags, telling which of the optional token
+# records were written. The flags byte is left out when no optional record was written. Records written before storage
+# version 1 are the owner alone too, they aren't rewritten on update: the flags of a record that is the owner alone are
+# computed from the optional records of the token when they're needed. The locked content view counter is flagged since
+# storage version 2. Tokens in the creator index are flagged too, and get the creator address after the flags byte once
+# they leave the account of their creator.
+PACKED_STORAGE_VERSION = 2
+OWNER_SIZE = 20
+TOKEN_FLAG_LOCKED = 1
+TOKEN_FLAG_ROYALTIES = 2
+TOKEN_FLAG_VIEWED = 4
+TOKEN_FLAG_CREATOR = 8
+
+# Royalties are stored as a serialized array of [recipient, bps] pairs. Tokens minted before keep the json they were
+# minted with, told apart by the first byte of the serialized array. The metadata of the tokens of a collection is
+# stored the same way, as a serialized [collectionId, meta] array told apart from the json metadata of the others.
+SERIALIZED_ARRAY = 0x40
+SERIALIZED_INTEGER = 0x21
+SERIALIZED_BYTESTRING = 0x28
+
+# Compressed metadata is this byte, which can't start a json text, followed by a serialized array of the json split in
+# parts: byte strings copied as is, or the index of a string of the dictionary in `decompress_meta`.
+COMPRESSED_META = 0x01
+# Number of strings of the dictionary in `decompress_meta`
+META_DICTIONARY_SIZE = 17
+
+# The metadata of tokens minted with `mintUri` isn't stored, only this byte followed by the hash of its content and its
+# URI, which `properties` returns as they are.
+URI_META = 0x02
+CONTENT_HASH_SIZE = 32
+
+# Maximum combined royalties of a token, in BPS
+MAX_ROYALTIES_BPS = 5000
+
+# Maximum number of token ids returned by a page
+MAX_PAGE_SIZE = 100
+
+
+# -------------------------------------------
+# TOKEN IDS
+# -------------------------------------------
+
+# Token ids are the token number as a variable length little endian integer, unless ordered token ids are enabled by
+# this flag of the contract state. Ordered token ids are the token number as ORDERED_ID_SIZE bytes big endian, so they
+# are stored in mint order and the ids of each block of ORDERED_ID_BLOCK_SIZE tokens share all but their last byte.
+STATE_ORDERED_IDS = 4
+ORDERED_ID_SIZE = 8
+ORDERED_ID_OFFSET = 1 << 64
+ORDERED_ID_BLOCK_SIZE = 256
 
 
 # -------------------------------------------
@@ -89,16 +153,6 @@ on_transfer = CreateNewEvent(
     'Transfer'
 )
 
-on_auth = CreateNewEvent(
-    # trigger when an address has been authorized/whitelisted.
-    [
-        ('authorized', UInt160),
-        ('type', int),
-        ('add', bool),
-    ],
-    'Authorized'
-)
-
 on_unlock = CreateNewEvent(
     [
         ('tokenId', bytes),
@@ -107,24 +161,7 @@ on_unlock = CreateNewEvent(
     'UnlockIncremented'
 )
 
-# DEBUG_START
-# -------------------------------------------
-# DEBUG
-# -------------------------------------------
 
-on_debug = CreateNewEvent(
-    [
-        ('params', list),
-    ],
-    'Debug'
-)
-
-def debug(params: list):
-    allow_notify = get_call_flags() & CallFlags.ALLOW_NOTIFY
-    if allow_notify == CallFlags.ALLOW_NOTIFY:
-        on_debug(params)
-
-# DEBUG_END
 # -------------------------------------------
 # NEP-11 METHODS
 # -------------------------------------------
@@ -207,6 +244,47 @@ def tokensOf(owner: UInt160) -> Iterator:
     context = get_read_only_context()
     return find(mk_account_key(owner), context, flags)
 
+
+@public(safe=True)
+def tokensOfPaged(owner: UInt160, start: bytes, limit: int) -> List[Any]:
+    """
+    Get a page of the token ids owned by the specified address
+
+    Pages are walked by passing the cursor of a page as the start of the next one, starting with an empty start.
+
+    :param owner: the owner address to retrieve the tokens for
+    :type owner: UInt160
+    :param start: the cursor returned with the previous page, the page starts after it
+    :type start: bytes
+    :param limit: the maximum number of token ids in the page
+    :type limit: int
+    :return: the list of token ids and the cursor of the next page, empty if it's the last page.
+    :raise AssertionError: raised if `owner` length is not 20 or if `limit` is not between 1 and MAX_PAGE_SIZE.
+    """
+    expect(validateAddress(owner), "tokensOfPaged - not a valid address")
+    return find_page(mk_account_key(owner), start, limit)
+
+
+@public(safe=True)
+def tokensByCreator(creator: UInt160, start: bytes, limit: int) -> List[Any]:
+    """
+    Get a page of the token ids minted by the specified address, whoever owns them now
+
+    Pages are walked like the pages of `tokensOfPaged`. Burned tokens are left out, and so are the tokens minted before
+    the creator index.
+
+    :param creator: the address that minted the tokens
+    :type creator: UInt160
+    :param start: the cursor returned with the previous page, the page starts after it
+    :type start: bytes
+    :param limit: the maximum number of token ids in the page
+    :type limit: int
+    :return: the list of token ids and the cursor of the next page, empty if it's the last page.
+    :raise AssertionError: raised if `creator` length is not 20 or if `limit` is not between 1 and MAX_PAGE_SIZE.
+    """
+    expect(validateAddress(creator), "tokensByCreator - not a valid address")
+    return find_page(mk_creator_key(creator), start, limit)
+
 @public(name='onNEP11Payment')
 def on_nep11_payment(from_address: UInt160, amount: int, token_id: bytes, data: Any):
     """
@@ -249,8 +327,9 @@ def transfer(to: UInt160, tokenId: bytes, data: Any) -> bool:
     :raise AssertionError: raised if `to` length is not 20 or if `tokenId` is not a valid NFT or if the contract is paused.
     """
     expect(validateAddress(to), "transfer - not a valid address")
-    expect(not isPaused(), "transfer - contract paused")
-    token_owner = get_owner_of(tokenId)
+    expect(not contract_paused(), "transfer - contract paused")
+    record = get_token_record(tokenId)
+    token_owner = record_owner(record)
     expect(token_owner != UInt160.zero, "Token not found")
 
     if not check_witness(token_owner):
@@ -262,12 +341,80 @@ def transfer(to: UInt160, tokenId: bytes, data: Any) -> bool:
 
         set_balance(to, 1)
 
-        set_owner_of(tokenId, to)
+        set_token_record(tokenId, with_record_owner(record, to))
         add_token_account(to, tokenId)
     post_transfer(token_owner, to, tokenId, data)
     return True
 
 
+@public
+def multiTransfer(to: List[UInt160], tokenIds: List[bytes], data: Any) -> List[bool]:
+    """
+    Transfers multiple tokens, the token tokenIds[i] being sent to to[i]
+
+    Each transfer follows `transfer`, but the witness of each owner is checked once and the balances are written once per
+    address for the whole batch. The Transfer events are fired and the onNEP11Payment methods are called once all the
+    transfers are done.
+
+    :param to: the address to transfer each token to
+    :type to: List[UInt160]
+    :param tokenIds: the tokens to transfer
+    :type tokenIds: List[bytes]
+    :param data: whatever data is pertinent to the onPayment method
+    :type data: Any
+    :return: whether each transfer was successful, as a list.
+    :raise AssertionError: raised if `to` and `tokenIds` don't have the same length, if any `to` length is not 20 or if
+        any `tokenId` is not a valid NFT or if the contract is paused.
+    """
+    count = len(tokenIds)
+    expect(len(to) == count, "multiTransfer - to and tokenIds should have the same length")
+    expect(not contract_paused(), "multiTransfer - contract paused")
+
+    transferred: List[bool] = []
+    owners: List[UInt160] = []
+    witnesses: Dict[UInt160, bool] = {}
+    balance_changes: Dict[UInt160, int] = {}
+    for index in range(count):
+        receiver = to[index]
+        tokenId = tokenIds[index]
+        expect(validateAddress(receiver), "multiTransfer - not a valid address")
+        record = get_token_record(tokenId)
+        token_owner = record_owner(record)
+        expect(token_owner != UInt160.zero, "Token not found")
+        owners.append(token_owner)
+
+        if not has_key(witnesses, token_owner):
+            witnesses[token_owner] = check_witness(token_owner)
+        if not witnesses[token_owner]:
+            transferred.append(False)
+            continue
+
+        if token_owner != receiver:
+            remove_token_account(token_owner, tokenId)
+            set_token_record(tokenId, with_record_owner(record, receiver))
+            add_token_account(receiver, tokenId)
+
+            if has_key(balance_changes, token_owner):
+                balance_changes[token_owner] = balance_changes[token_owner] - 1
+            else:
+                balance_changes[token_owner] = -1
+            if has_key(balance_changes, receiver):
+                balance_changes[receiver] = balance_changes[receiver] + 1
+            else:
+                balance_changes[receiver] = 1
+        transferred.append(True)
+
+    for account in balance_changes.keys():
+        if balance_changes[account] != 0:
+            set_balance(account, balance_changes[account])
+
+    # the receivers are only called once the state of the whole batch is written
+    for index in range(count):
+        if transferred[index]:
+            post_transfer(owners[index], to[index], tokenIds[index], data)
+    return transferred
+
+
 def post_transfer(token_owner: Union[UInt160, None], to: Union[UInt160, None], tokenId: bytes, data: Any):
     """
     Checks if the one receiving NEP-11 tokens is a smart contract and if it's one the onPayment method will be called - internal
@@ -306,6 +453,29 @@ def ownerOf(tokenId: bytes) -> UInt160:
     return owner
 
 
+@public(safe=True)
+def ownerOfMany(tokenIds: List[bytes]) -> List[Any]:
+    """
+    Get the owners of the specified tokens.
+
+    The owners are returned in the order of the tokens, with null in place of the owner of a token that doesn't exist.
+
+    :param tokenIds: the tokens for which to check the ownership
+    :type tokenIds: List[bytes]
+    :return: the owner of each token, or null if it doesn't exist.
+    :raise AssertionError: raised if there are more than MAX_PAGE_SIZE tokens.
+    """
+    expect(len(tokenIds) <= MAX_PAGE_SIZE, "ownerOfMany - too many tokens")
+    owners: List[Any] = []
+    for tokenId in tokenIds:
+        record = get_token_record(tokenId)
+        if len(record) == 0:
+            owners.append(None)
+        else:
+            owners.append(record_owner(record))
+    return owners
+
+
 @public(safe=True)
 def tokens() -> Iterator:
     """
@@ -318,6 +488,70 @@ def tokens() -> Iterator:
     return find(TOKEN_PREFIX, context, flags)
 
 
+@public(safe=True)
+def tokensPaged(start: bytes, limit: int) -> List[Any]:
+    """
+    Get a page of the tokens minted by the contract
+
+    Pages are walked by passing the cursor of a page as the start of the next one, starting with an empty start.
+
+    :param start: the cursor returned with the previous page, the page starts after it
+    :type start: bytes
+    :param limit: the maximum number of token ids in the page
+    :type limit: int
+    :return: the list of token ids and the cursor of the next page, empty if it's the last page.
+    :raise AssertionError: raised if `limit` is not between 1 and MAX_PAGE_SIZE.
+    """
+    return find_page(TOKEN_PREFIX, start, limit)
+
+
+@public(safe=True)
+def tokensSince(lastId: bytes, limit: int) -> List[bytes]:
+    """
+    Get the tokens minted after a token, in mint order
+
+    Only the tokens minted with ordered token ids are returned, an empty `lastId` starts with the first of them. Burned
+    tokens are skipped, so the page of the last tokens minted can be shorter than `limit`.
+
+    :param lastId: the ordered token id the page starts after, usually the last one of the previous page
+    :type lastId: bytes
+    :param limit: the maximum number of token ids in the page
+    :type limit: int
+    :return: the ids of the tokens minted after `lastId`
+    :raise AssertionError: raised if ordered token ids are not enabled, if `lastId` is not an ordered token id or if
+        `limit` is not between 1 and MAX_PAGE_SIZE.
+    """
+    expect(limit > 0, "limit has to be positive")
+    expect(limit <= MAX_PAGE_SIZE, "limit can not exceed the max page size")
+    first = get_int(ORDERED_IDS_START, get_read_only_context())
+    expect(first != 0, "tokensSince - ordered token ids are not enabled")
+
+    number = first
+    if len(lastId) != 0:
+        expect(len(lastId) == ORDERED_ID_SIZE, "tokensSince - not an ordered token id")
+        number = ordered_token_number(lastId) + 1
+        if number < first:
+            number = first
+
+    page: List[bytes] = []
+    count = get_int(TOKEN_COUNT, get_read_only_context())
+    while number <= count:
+        # the tokens of a block are found with a single prefix, starting with the block of `number`
+        blockStart = number - number % ORDERED_ID_BLOCK_SIZE
+        block = mk_ordered_token_id(number)[:ORDERED_ID_SIZE - 1]
+        keys = find(mk_token_key(block), get_read_only_context(), FindOptions.REMOVE_PREFIX | FindOptions.KEYS_ONLY)
+        while keys.next():
+            suffix = cast(bytes, keys.value)
+            if len(suffix) == 1:
+                offset: int = suffix[0]
+                if blockStart + offset >= number:
+                    page.append(block + suffix)
+                    if len(page) == limit:
+                        return page
+        number = blockStart + ORDERED_ID_BLOCK_SIZE
+    return page
+
+
 @public(safe=True)
 def properties(tokenId: bytes) -> Dict[Any, Any]:
     """
@@ -330,9 +564,9 @@ def properties(tokenId: bytes) -> Dict[Any, Any]:
     :return: a serialized NVM object containing the properties for the given NFT.
     :raise AssertionError: raised if `tokenId` is not a valid NFT, or if no metadata available.
     """
-    metaBytes = cast(str, get_meta(tokenId))
-    expect(len(metaBytes) != 0, 'properties - no metadata available for token')
-    metaObject = cast(Dict[str, str], json_deserialize(metaBytes))
+    meta = get_meta(tokenId)
+    expect(len(meta) != 0, 'properties - no metadata available for token')
+    metaObject = cast(Dict[Any, Any], read_properties(meta))
     debug(['properties: ', metaObject])
     return metaObject
 
@@ -352,9 +586,44 @@ def propertiesJson(tokenId: bytes) -> bytes:
     meta = get_meta(tokenId)
     expect(len(meta) != 0, 'propertiesJson - no metadata available for token')
     debug(['properties: ', meta])
+    if meta[0] == SERIALIZED_ARRAY:
+        return cast(bytes, json_serialize(read_properties(meta)))
+    if meta[0] == COMPRESSED_META:
+        return decompress_meta(meta)
+    if meta[0] == URI_META:
+        # json can't hold the raw bytes of the hash
+        properties = uri_properties(meta)
+        properties['contentHash'] = base64_encode(meta[1:CONTENT_HASH_SIZE + 1])
+        return cast(bytes, json_serialize(properties))
     return meta
 
 
+@public(safe=True)
+def propertiesMany(tokenIds: List[bytes]) -> List[Any]:
+    """
+    Get the properties of the specified tokens.
+
+    The properties are returned in the order of the tokens, with null in place of the properties of a token that doesn't
+    exist, whose compressed, collection or URI metadata is malformed or whose collection doesn't exist, so a single
+    token doesn't fail the whole batch. Json that can't be parsed still fails it, parsing failures can't be caught.
+
+    :param tokenIds: the tokens for which to check the properties
+    :type tokenIds: List[bytes]
+    :return: the properties of each token as returned by `properties`, or null if it doesn't exist or if its metadata
+        can't be decoded.
+    :raise AssertionError: raised if there are more than MAX_PAGE_SIZE tokens.
+    """
+    expect(len(tokenIds) <= MAX_PAGE_SIZE, "propertiesMany - too many tokens")
+    result: List[Any] = []
+    for tokenId in tokenIds:
+        meta = get_meta(tokenId)
+        if len(meta) == 0:
+            result.append(None)
+        else:
+            result.append(checked_properties(meta))
+    return result
+
+
 @public
 def _deploy(data: Any, upgrade: bool):
     """
@@ -362,9 +631,10 @@ def _deploy(data: Any, upgrade: bool):
     """
     debug(["deploy now"])
     if upgrade:
+        migrate_storage()
         return
 
-    if get_bool(DEPLOYED, get_read_only_context()):
+    if contract_deployed():
         return
 
     tx = cast(Transaction, script_container)
@@ -392,19 +662,34 @@ def _deploy(data: Any, upgrade: bool):
 
 def internal_deploy(owner: UInt160):
 
-    put_bool(DEPLOYED, True)
-    put_bool(PAUSED, False)
+    init_runtime(owner)
     put_int(TOKEN_COUNT, 0)
-
-    auth: List[UInt160] = []
-    auth.append(owner)
-    serialized = serialize(auth)
-    put(AUTH_ADDRESSES, serialized)
+    put_int(STORAGE_VERSION, PACKED_STORAGE_VERSION)
 
 # -------------------------------------------
 # GHOSTMARKET METHODS
 # -------------------------------------------
 
+@public
+def enableOrderedTokenIds():
+    """
+    Mint the next tokens with ordered token ids, which can't be disabled afterwards.
+
+    Ordered token ids are fixed width and big endian, so they are iterated in mint order, and `tokensSince` returns the
+    tokens minted after a given one. The ids of the tokens minted before don't change.
+
+    :raise AssertionError: raised if witness is not verified.
+    """
+    verified: bool = verify()
+    expect(verified, 'enableOrderedTokenIds - `account` is not allowed for enableOrderedTokenIds')
+    if get_int(ORDERED_IDS_START, get_read_only_context()) != 0:
+        return
+
+    put_int(ORDERED_IDS_START, get_int(TOKEN_COUNT, get_read_only_context()) + 1)
+    set_contract_flag(STATE_ORDERED_IDS, True)
+    debug(['enableOrderedTokenIds: ', get_contract_state()])
+
+
 @public
 def burn(tokenId: bytes) -> bool:
     """
@@ -415,7 +700,7 @@ def burn(tokenId: bytes) -> bool:
     :return: whether the burn was successful.
     :raise AssertionError: raised if the contract is paused.
     """
-    expect(not isPaused(), "burn - contract paused")
+    expect(not contract_paused(), "burn - contract paused")
     return internal_burn(tokenId)
 
 
@@ -424,13 +709,36 @@ def multiBurn(tokens: List[bytes]) -> List[bool]:
     """
     Burn multiple tokens.
 
+    The balances and the supply are updated once for the whole batch, grouped by owner.
+
     :param tokens: list of tokens to burn
     :type tokens: bytes list
     :return: whether each burn was successful, as a list.
+    :raise AssertionError: raised if the contract is paused.
     """
+    expect(not contract_paused(), "multiBurn - contract paused")
+
     burned: List[bool] = []
-    for i in tokens:
-        burned.append(burn(i))
+    burned_count: Dict[UInt160, int] = {}
+    for tokenId in tokens:
+        record = get_token_record(tokenId)
+        owner = record_owner(record)
+        if check_witness(owner):
+            remove_token(tokenId, owner, record)
+            if has_key(burned_count, owner):
+                burned_count[owner] = burned_count[owner] + 1
+            else:
+                burned_count[owner] = 1
+            burned.append(True)
+        else:
+            burned.append(False)
+
+    total = 0
+    for owner in burned_count.keys():
+        set_balance(owner, -burned_count[owner])
+        total = total + burned_count[owner]
+    if total != 0:
+        add_to_supply(-total)
     return burned
 
 
@@ -441,19 +749,54 @@ def mint(account: UInt160, meta: bytes, lockedContent: bytes, royalties: bytes)
 
     :param account: the address of the account that is minting token
     :type account: UInt160
-    :param meta: the metadata to use for this token
+    :param meta: the metadata to use for this token, as json or compressed by metadata.py
     :type meta: bytes 
     :param lockedContent: the lock content to use for this token
     :type lockedContent: bytes 
     :param royalties: the royalties to use for this token
     :type royalties: bytes 
     :return: tokenId of the token minted
-    :raise AssertionError: raised if the contract is paused or if check witness fails.
+    :raise AssertionError: raised if the contract is paused, if check witness fails or if `meta` is in a format
+        reserved to the contract.
     """
-    expect(not isPaused(), "mint - contract paused")
+    state = get_contract_state()
+    expect((state & STATE_PAUSED) == 0, "mint - contract paused")
     expect(check_witness(account), "mint - invalid witness" )
+    expect(not is_reserved_meta(meta), "mint - `meta` format is reserved")
 
-    return internal_mint(account, meta, lockedContent, royalties)
+    return internal_mint(account, meta, lockedContent, royalties, (state & STATE_ORDERED_IDS) != 0)
+
+
+@public
+def mintUri(account: UInt160, uri: bytes, contentHash: bytes, lockedContent: bytes, royalties: bytes) -> bytes:
+    """
+    Mint new token, referencing its metadata by URI instead of storing it.
+
+    `properties` returns a map of the URI as `tokenURI` and of the hash of the metadata as `contentHash`, readers fetch
+    the metadata and check it against the hash.
+
+    :param account: the address of the account that is minting token
+    :type account: UInt160
+    :param uri: the URI of the metadata
+    :type uri: bytes
+    :param contentHash: the hash of the metadata, 32 bytes like its SHA-256
+    :type contentHash: bytes
+    :param lockedContent: the lock content to use for this token
+    :type lockedContent: bytes
+    :param royalties: the royalties to use for this token
+    :type royalties: bytes
+    :return: tokenId of the token minted
+    :raise AssertionError: raised if the contract is paused, if check witness fails, if uri is empty or if contentHash
+        isn't 32 bytes.
+    """
+    state = get_contract_state()
+    expect((state & STATE_PAUSED) == 0, "mintUri - contract paused")
+    expect(check_witness(account), "mintUri - invalid witness")
+    expect(len(uri) != 0, "mintUri - `uri` can not be empty")
+    expect(len(contentHash) == CONTENT_HASH_SIZE, "mintUri - `contentHash` should be 32 bytes")
+
+    meta = to_bytes(URI_META) + contentHash + uri
+    return internal_mint(account, meta, lockedContent, royalties, (state & STATE_ORDERED_IDS) != 0)
 
 
 @public
@@ -463,23 +806,70 @@ def multiMint(account: UInt160, meta: List[bytes], lockedContent: List[bytes], r
 
     :param account: the address of the account that is minting tokens
     :type account: UInt160
-    :param meta: the metadata to use for this token
+    :param meta: the metadata to use for each token, as json or compressed by metadata.py
     :type meta: bytes 
     :param lockedContent: the lock content to use for this token
     :type lockedContent: bytes 
     :param royalties: the royalties to use for this token
     :type royalties: bytes 
     :return: list of tokenId of the tokens minted
-    :raise AssertionError: raised if royalties or lockContent or meta is not a list
+    :raise AssertionError: raised if royalties or lockContent or meta is not a list or if their lengths differ, if the
+        contract is paused, if check witness fails or if a `meta` is in a format reserved to the contract.
     """
-    expect(isinstance(meta, list), "multiMint - meta format should be a list!")
-    expect(isinstance(lockedContent, list), "multiMint - lock content format should be a list!")
-    expect(isinstance(royalties, list), "multiMint - royalties format should be a list!")
+    return internal_multi_mint(account, meta, lockedContent, royalties, b'')
+
+
+@public
+def createCollection(creator: UInt160, meta: bytes) -> bytes:
+    """
+    Create a collection, holding the metadata shared by its tokens.
+
+    :param creator: the address of the account creating the collection, the only one minting its tokens
+    :type creator: UInt160
+    :param meta: the metadata shared by the tokens of the collection, as a json object
+    :type meta: bytes
+    :return: the id of the collection
+    :raise AssertionError: raised if the contract is paused, if check witness fails or if meta is empty.
+    """
+    expect(not contract_paused(), "createCollection - contract paused")
+    expect(check_witness(creator), "createCollection - invalid witness")
+    expect(len(meta) != 0, "createCollection - `meta` can not be empty")
+
+    collectionNumber = get_int(COLLECTION_COUNT, get_read_only_context()) + 1
+    put_int(COLLECTION_COUNT, collectionNumber)
+    collectionId = to_bytes(collectionNumber)
+    put(mk_collection_key(collectionId), creator + meta)
+    debug(['createCollection: ', collectionId])
+    return collectionId
+
+
+@public
+def multiMintInCollection(collectionId: bytes, meta: List[bytes], lockedContent: List[bytes],
+                          royalties: List[bytes]) -> List[bytes]:
+    """
+    Mint new tokens in a collection, to the account of its creator.
+
+    The tokens only store their own metadata, merged over the metadata of the collection by `properties`,
+    `propertiesJson` and `propertiesMany`. Their own metadata can be empty.
+
+    :param collectionId: the id of the collection
+    :type collectionId: bytes
+    :param meta: the metadata of each token that isn't shared with the collection, as json objects
+    :type meta: List[bytes]
+    :param lockedContent: the lock content to use for each token
+    :type lockedContent: List[bytes]
+    :param royalties: the royalties to use for each token
+    :type royalties: List[bytes]
+    :return: list of tokenId of the tokens minted
+    :raise AssertionError: raised if the collection doesn't exist, if royalties or lockContent or meta is not a list or
+        if their lengths differ, if the contract is paused, if the witness of the collection creator fails or if a
+        `meta` is in a format reserved to the contract.
+    """
+    collection = get(mk_collection_key(collectionId), get_read_only_context())
+    expect(len(collection) != 0, "multiMintInCollection - collection not found")
+    creator = cast(UInt160, collection[:OWNER_SIZE])
+    return internal_multi_mint(creator, meta, lockedContent, royalties, collectionId)
 
-    nfts: List[bytes] = []
-    for i in range(0, len(meta)):
-        nfts.append(mint(account, meta[i], lockedContent[i], royalties[i]))
-    return nfts
 
 @public(safe=True)
 def getRoyalties(tokenId: bytes) -> bytes:
@@ -488,7 +878,7 @@ def getRoyalties(tokenId: bytes) -> bytes:
 
     :param tokenId: the token to get royalties values
     :type tokenId: bytes
-    :return: bytes of addresses and values for this token royalties.
+    :return: bytes of addresses and values for this token royalties, as the json given on mint.
     :raise AssertionError: raised if any `tokenId` is not a valid NFT.
     """
     royalties = get_royalties(tokenId)
@@ -512,6 +902,41 @@ def royaltyInfo(tokenId: bytes, royaltyToken: UInt160, salePrice: int) -> List[L
     royalties = get_royalties_info(tokenId, salePrice)
     return royalties
 
+@public(safe=True)
+def royaltyInfoMany(tokenIds: List[bytes], royaltyToken: UInt160, salePrices: List[int]) -> List[Any]:
+    """
+    Get the royalties values of the specified tokens - official standard.
+
+    The royalties are returned in the order of the tokens, with null in place of the royalties of a token that doesn't
+    exist.
+
+    :param tokenIds: the tokens used to calculate royalties values
+    :type tokenIds: List[bytes]
+    :param royaltyToken: the currency used to calculate royalties values
+    :type royaltyToken: UInt160
+    :param salePrices: the sale amount of each token used to calculate royalties values
+    :type salePrices: List[int]
+    :return: the royalties of each token as returned by `royaltyInfo`, or null if it doesn't exist.
+    :raise AssertionError: raised if there are more than MAX_PAGE_SIZE tokens or if `tokenIds` and `salePrices` don't
+        have the same length.
+    """
+    count = len(tokenIds)
+    expect(count <= MAX_PAGE_SIZE, "royaltyInfoMany - too many tokens")
+    expect(len(salePrices) == count, "royaltyInfoMany - tokens and sale prices should have the same length")
+    result: List[Any] = []
+    for index in range(count):
+        tokenId = tokenIds[index]
+        record = get_token_record(tokenId)
+        if len(record) == 0:
+            result.append(None)
+        elif record_flags(tokenId, record) & TOKEN_FLAG_ROYALTIES == 0:
+            # tokens without the flag have no royalties, their key isn't read
+            no_royalties: List[List[Any]] = []
+            result.append(no_royalties)
+        else:
+            result.append(get_royalties_info(tokenId, salePrices[index]))
+    return result
+
 @public(safe=True)
 def getLockedContentViewCount(tokenId: bytes) -> int:
     """
@@ -536,9 +961,13 @@ def getLockedContent(tokenId: bytes) -> bytes:
     :raise AssertionError: raised if witness is not owner
     :emits UnlockIncremented
     """
-    owner = get_owner_of(tokenId)
+    record = get_token_record(tokenId)
+    owner = record_owner(record)
 
     expect(check_witness(owner), "getLockedContent - prohibited access to locked content!")
+    flags = record_flags(tokenId, record)
+    if (flags & TOKEN_FLAG_VIEWED) == 0:
+        set_token_record(tokenId, mk_token_record(owner, flags | TOKEN_FLAG_VIEWED, record_creator(record)))
     set_locked_view_counter(tokenId)
     
     debug(['getLockedContent: ', get_locked_content(tokenId)])
@@ -548,143 +977,6 @@ def getLockedContent(tokenId: bytes) -> bytes:
     return content
 
 
-@public(safe=True)
-def getAuthorizedAddress() -> list[UInt160]:
-    """
-    Configure authorized addresses.
-
-    When this contract address is included in the transaction signature,
-    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
-    For example, this method needs to be called when withdrawing token from the contract.
-
-    :param address: the address of the account that is being authorized
-    :type address: UInt160
-    :param authorized: authorization status of this address
-    :type authorized: bool
-    :return: whether the transaction signature is correct
-    :raise AssertionError: raised if witness is not verified.
-    """
-    serialized = get(AUTH_ADDRESSES, get_read_only_context())
-    auth = cast(list[UInt160], deserialize(serialized))
-
-    return auth
-
-
-@public
-def setAuthorizedAddress(address: UInt160, authorized: bool):
-    """
-    Configure authorized addresses.
-
-    When this contract address is included in the transaction signature,
-    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
-    For example, this method needs to be called when withdrawing token from the contract.
-
-    :param address: the address of the account that is being authorized
-    :type address: UInt160
-    :param authorized: authorization status of this address
-    :type authorized: bool
-    :return: whether the transaction signature is correct
-    :raise AssertionError: raised if witness is not verified.
-    """
-    verified: bool = verify()
-    expect(verified, 'setAuthorizedAddress - `account` is not allowed for setAuthorizedAddress')
-    expect(validateAddress(address), "setAuthorizedAddress - not a valid address")
-    expect(isinstance(authorized, bool), "setAuthorizedAddress - authorized has to be of type bool")
-    serialized = get(AUTH_ADDRESSES, get_read_only_context())
-    auth = cast(list[UInt160], deserialize(serialized))
-    expect(len(auth) <= 10, "setAuthorizedAddress - authorized addresses count has to be <= 10")
-
-    if authorized:
-        found = False
-        for i in auth:
-            if i == address:
-                found = True
-                break
-
-        if not found:
-            auth.append(address)
-
-        put(AUTH_ADDRESSES, serialize(auth))
-        on_auth(address, 0, True)
-    else:
-        auth.remove(address)
-        put(AUTH_ADDRESSES, serialize(auth))
-        on_auth(address, 0, False)
-
-
-@public
-def updatePause(status: bool) -> bool:
-    """
-    Set contract pause status.
-
-    :param status: the status of the contract pause
-    :type status: bool
-    :return: the contract pause status
-    :raise AssertionError: raised if witness is not verified.
-    """
-    verified: bool = verify()
-    expect(verified, 'updatePause - `account` is not allowed for updatePause')
-    expect(isinstance(status, bool), "updatePause - status has to be of type bool")
-    put_bool(PAUSED, status)
-    debug(['updatePause: ', get_bool(PAUSED, get_read_only_context())])
-    return get_bool(PAUSED, get_read_only_context())
-
-
-@public
-def verify() -> bool:
-    """
-    Check if the address is allowed.
-
-    When this contract address is included in the transaction signature,
-    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
-    For example, this method needs to be called when withdrawing token from the contract.
-
-    :return: whether the transaction signature is correct
-    """
-    serialized = get(AUTH_ADDRESSES, get_read_only_context())
-    auth = cast(list[UInt160], deserialize(serialized))
-    tx = cast(Transaction, script_container)
-    for addr in auth:
-        if check_witness(addr):
-            debug(["Verification successful", addr, tx.sender])
-            return True
-
-    debug(["Verification failed", addr])
-    return False
-
-
-@public(safe=True)
-def isPaused() -> bool:
-    """
-    Get the contract pause status.
-
-    If the contract is paused, some operations are restricted.
-
-    :return: whether the contract is paused
-    """
-    debug(['isPaused: ', get_bool(PAUSED)])
-    if get_bool(PAUSED, get_read_only_context()):
-        return True
-    return False
-
-
-@public
-def update(script: bytes, manifest: bytes):
-    """
-    Upgrade the contract.
-
-    :param script: the contract script
-    :type script: bytes 
-    :param manifest: the contract manifest
-    :type manifest: bytes 
-    :raise AssertionError: raised if witness is not verified
-    """
-    verified: bool = verify()
-    expect(verified, 'update - `account` is not allowed for update')
-    update_contract(script, manifest) 
-    debug(['update called and done'])
-
-
 @public
 def destroy():
     """
@@ -707,24 +999,51 @@ def internal_burn(tokenId: bytes) -> bool:
     :return: whether the burn was successful.
     :raise AssertionError: raised if `tokenId` is not a valid NFT.
     """
-    owner = get_owner_of(tokenId)
+    record = get_token_record(tokenId)
+    owner = record_owner(record)
 
     if not check_witness(owner):
         return False
 
-    remove_owner_of(tokenId)
     set_balance(owner, -1)
     add_to_supply(-1)
+    remove_token(tokenId, owner, record)
+    return True
+
+
+def remove_token(tokenId: bytes, owner: UInt160, record: bytes):
+    """
+    Remove the records of a token and notify its burn, without updating the balance and the supply - internal
+
+    :param tokenId: the token to remove
+    :type tokenId: bytes
+    :param owner: the owner of the token
+    :type owner: UInt160
+    :param record: the token record
+    :type record: bytes
+    """
+    remove_token_record(tokenId)
     remove_meta(tokenId)
-    remove_locked_content(tokenId)
-    remove_royalties(tokenId)
+
+    # only delete the optional records that were written
+    flags = record_flags(tokenId, record)
+    if (flags & TOKEN_FLAG_LOCKED) != 0:
+        remove_locked_content(tokenId)
+    if (flags & TOKEN_FLAG_ROYALTIES) != 0:
+        remove_royalties(tokenId)
+    if (flags & TOKEN_FLAG_VIEWED) != 0:
+        remove_locked_view_counter(tokenId)
+    if (flags & TOKEN_FLAG_CREATOR) != 0:
+        creator = record_creator(record)
+        if len(creator) == 0:
+            creator = owner
+        remove_token_creator(cast(UInt160, creator), tokenId)
     remove_token_account(owner, tokenId)
-    
+
     post_transfer(owner, None, tokenId, None)
-    return True
 
 
-def internal_mint(account: UInt160, meta: bytes, lockedContent: bytes, royalties: bytes) -> bytes:
+def internal_mint(account: UInt160, meta: bytes, lockedContent: bytes, royalties: bytes, ordered: bool) -> bytes:
     """
     Mint new token - internal
 
@@ -736,45 +1055,414 @@ def internal_mint(account: UInt160, meta: bytes, lockedContent: bytes, royalties
     :type lockedContent: bytes 
     :param royalties: the royalties to use for this token
     :type royalties: bytes 
+    :param ordered: whether the token gets an ordered token id
+    :type ordered: bool
     :return: tokenId of the token minted
     :raise AssertionError: raised if meta is empty, or if contract is paused.
     """
-    expect(len(meta) != 0, 'internal_mint - `meta` can not be empty')
-
     tokenId = get_int(TOKEN_COUNT, get_read_only_context()) + 1
     put_int(TOKEN_COUNT, tokenId)
-    tokenIdBytes = to_bytes(tokenId)
 
-    set_owner_of(tokenIdBytes, account)
     set_balance(account, 1)
     add_to_supply(1)
 
+    return add_token(account, mk_token_id(tokenId, ordered), meta, lockedContent, royalties)
+
+
+def internal_multi_mint(account: UInt160, meta: List[bytes], lockedContent: List[bytes], royalties: List[bytes],
+                        collectionId: bytes) -> List[bytes]:
+    """
+    Mint new tokens - internal
+
+    :param account: the address of the account that is minting tokens
+    :type account: UInt160
+    :param meta: the metadata to use for each token
+    :type meta: List[bytes]
+    :param lockedContent: the lock content to use for each token
+    :type lockedContent: List[bytes]
+    :param royalties: the royalties to use for each token
+    :type royalties: List[bytes]
+    :param collectionId: the collection of the tokens, empty if they're not in a collection
+    :type collectionId: bytes
+    :return: list of tokenId of the tokens minted
+    :raise AssertionError: raised if royalties or lockContent or meta is not a list or if their lengths differ, if the
+        contract is paused, if check witness fails or if a `meta` is in a format reserved to the contract.
+    """
+    expect(isinstance(meta, list), "multiMint - meta format should be a list!")
+    expect(isinstance(lockedContent, list), "multiMint - lock content format should be a list!")
+    expect(isinstance(royalties, list), "multiMint - royalties format should be a list!")
+    state = get_contract_state()
+    expect((state & STATE_PAUSED) == 0, "multiMint - contract paused")
+    expect(check_witness(account), "multiMint - invalid witness")
+
+    count = len(meta)
+    expect(len(lockedContent) == count and len(royalties) == count,
+           "multiMint - meta, lock content and royalties should have the same length")
+
+    nfts: List[bytes] = []
+    if count == 0:
+        return nfts
+
+    # reserve the ids of the whole batch, and account for it at once
+    lastId = get_int(TOKEN_COUNT, get_read_only_context())
+    put_int(TOKEN_COUNT, lastId + count)
+    set_balance(account, count)
+    add_to_supply(count)
+
+    ordered = (state & STATE_ORDERED_IDS) != 0
+    for i in range(0, count):
+        tokenMeta = meta[i]
+        expect(not is_reserved_meta(tokenMeta), "multiMint - `meta` format is reserved")
+        if len(collectionId) != 0:
+            # the metadata shared with the collection is only stored once, with the collection
+            tokenMeta = serialize([collectionId, tokenMeta])
+        tokenId = mk_token_id(lastId + i + 1, ordered)
+        nfts.append(add_token(account, tokenId, tokenMeta, lockedContent[i], royalties[i]))
+    return nfts
+
+
+def add_token(account: UInt160, tokenIdBytes: bytes, meta: bytes, lockedContent: bytes, royalties: bytes) -> bytes:
+    """
+    Write the records of a new token and notify its mint, without updating the balance and the supply - internal
+
+    :param account: the address of the account that is minting token
+    :type account: UInt160
+    :param tokenIdBytes: the id of the new token
+    :type tokenIdBytes: bytes
+    :param meta: the metadata to use for this token
+    :type meta: bytes
+    :param lockedContent: the lock content to use for this token
+    :type lockedContent: bytes
+    :param royalties: the royalties to use for this token
+    :type royalties: bytes
+    :return: tokenId of the token minted
+    :raise AssertionError: raised if meta is empty.
+    """
+    expect(len(meta) != 0, 'internal_mint - `meta` can not be empty')
+
     add_meta(tokenIdBytes, meta)
     debug(['metadata: ', meta])
 
+    flags = 0
     if len(lockedContent) != 0:
         add_locked_content(tokenIdBytes, lockedContent)
+        flags = flags | TOKEN_FLAG_LOCKED
         debug(['locked: ', lockedContent])
 
     if len(royalties) != 0:
-        expect(validateRoyalties(royalties), "internal_mint - not a valid royalties format")
-        add_royalties(tokenIdBytes, cast(str, royalties))
+        add_royalties(tokenIdBytes, royalties, validateRoyalties(royalties))
+        flags = flags | TOKEN_FLAG_ROYALTIES
         debug(['royalties: ', royalties])
 
+    # the creator is the owner until the token is transferred
+    set_token_record(tokenIdBytes, mk_token_record(account, flags | TOKEN_FLAG_CREATOR, b''))
     add_token_account(account, tokenIdBytes)
+    add_token_creator(account, tokenIdBytes)
     post_transfer(None, account, tokenIdBytes, None)
     return tokenIdBytes
 
 
-def validateRoyalties(bytes: bytes) -> bool:
+def validateRoyalties(royalties: bytes) -> List[List[Any]]:
+    """
+    Validate and normalize the royalties json given on mint, in a single pass - internal
+
+    :param royalties: the royalties json
+    :type royalties: bytes
+    :return: the [recipient, bps] pair of each royalty
+    :raise AssertionError: raised if a royalty doesn't have an address or a value, if an address is not valid or
+        repeated, if a value is negative or if the values add up to more than MAX_ROYALTIES_BPS.
+    """
+    deserialized = cast(List[Dict[str, Any]], json_deserialize(cast(str, royalties)))
+    version = address_version
+
+    normalized: List[List[Any]] = []
+    recipients: Dict[bytes, bool] = {}
+    total = 0
+    for royalty in deserialized:
+        fields = cast(Dict[Any, Any], royalty)
+        expect(has_key(fields, "address") and has_key(fields, "value"), "internal_mint - not a valid royalties format")
+
+        # a wrong address checksum faults the mint
+        decoded = base58_check_decode(cast(str, royalty["address"]))
+        expect(len(decoded) == 21, "internal_mint - not a valid royalties address")
+        expect(decoded[0] == version, "internal_mint - not a valid royalties address")
+        recipient = decoded[1:21]
+        expect(not has_key(recipients, recipient), "internal_mint - duplicated royalties address")
+        recipients[recipient] = True
+
+        value = royalty["value"]
+        if isinstance(value, str):
+            value = atoi(value, 10)
+        expect(isinstance(value, int), "internal_mint - not a valid royalties value")
+        bps = cast(int, value)
+        expect(bps >= 0, "internal_mint - not a valid royalties value")
+        total = total + bps
 
-    strRoyalties: str = cast(str, bytes)
-    deserialized = cast(List[Dict[str, str]], json_deserialize(strRoyalties))
+        normalized.append([recipient, bps])
 
+    expect(total <= MAX_ROYALTIES_BPS, "internal_mint - royalties can not exceed 50%")
+    return normalized
+
+
+def parse_royalties(royalties: bytes) -> List[List[Any]]:
+    """
+    Parse the royalties json stored by tokens minted before they were normalized - internal
+
+    :param royalties: the royalties json
+    :type royalties: bytes
+    :return: the [recipient, bps] pair of each royalty
+    :raise AssertionError: raised if a royalty doesn't have an address or a value.
+    """
+    deserialized = cast(List[Dict[str, Any]], json_deserialize(cast(str, royalties)))
+
+    normalized: List[List[Any]] = []
     for royalty in deserialized:
-        if "address" not in royalty or "value" not in royalty:
-            return False
-    return True
+        fields = cast(Dict[Any, Any], royalty)
+        expect(has_key(fields, "address") and has_key(fields, "value"), "internal_mint - not a valid royalties format")
+        value = royalty["value"]
+        if isinstance(value, str):
+            value = atoi(value, 10)
+        recipient: UInt160 = to_script_hash(cast(UInt160, royalty["address"]))
+        normalized.append([recipient, value])
+    return normalized
+
+
+def is_reserved_meta(meta: bytes) -> bool:
+    """
+    Check whether metadata given on mint starts like the metadata the contract writes itself - internal
+
+    The metadata of the tokens of a collection is only written by `multiMintInCollection`, otherwise a token could be
+    minted in the collection of anyone, and URI metadata only by `mintUri`, which checks the size of the content hash.
+
+    :param meta: the metadata given on mint
+    :type meta: bytes
+    :return: whether the first byte of `meta` tells apart the metadata of a collection token or URI metadata
+    """
+    if len(meta) == 0:
+        return False
+    first = meta[0]
+    return first == SERIALIZED_ARRAY or first == URI_META
+
+
+def read_properties(meta: bytes) -> Any:
+    """
+    Get the properties of a token from its stored metadata - internal
+
+    :param meta: the metadata stored for the token
+    :type meta: bytes
+    :return: the properties of the token, over the properties of its collection if it's in one, or None if its
+        collection doesn't exist
+    """
+    if meta[0] == URI_META:
+        return uri_properties(meta)
+    if meta[0] == COMPRESSED_META:
+        return json_deserialize(cast(str, decompress_meta(meta)))
+    if meta[0] != SERIALIZED_ARRAY:
+        return json_deserialize(cast(str, meta))
+
+    entry = cast(List[bytes], deserialize(meta))
+    collection = get(mk_collection_key(entry[0]), get_read_only_context())
+    if len(collection) == 0:
+        return None
+    properties = cast(Dict[Any, Any], json_deserialize(cast(str, collection[OWNER_SIZE:])))
+    if len(entry[1]) != 0:
+        tokenProperties = cast(Dict[Any, Any], json_deserialize(cast(str, entry[1])))
+        for key in tokenProperties.keys():
+            properties[key] = tokenProperties[key]
+    return properties
+
+
+def checked_properties(meta: bytes) -> Any:
+    """
+    Get the properties of a token from its stored metadata, or None if it doesn't have the structure of its format -
+    internal
+
+    The failures of `deserialize` can't be caught, so the structure of compressed and collection token metadata is
+    checked before it's deserialized. Tokens minted before these formats were reserved can start with their first byte.
+    The json is parsed as is, like `properties` does.
+
+    :param meta: the metadata stored for the token
+    :type meta: bytes
+    :return: the properties of the token, or None if its metadata doesn't have the structure of its format or if its
+        collection doesn't exist
+    """
+    first = meta[0]
+    if first == URI_META:
+        if len(meta) <= CONTENT_HASH_SIZE:
+            return None
+    if first == COMPRESSED_META:
+        if serialized_parts_count(meta, 1, META_DICTIONARY_SIZE) < 0:
+            return None
+    if first == SERIALIZED_ARRAY:
+        if serialized_parts_count(meta, 0, 0) != 2:
+            return None
+    return read_properties(meta)
+
+
+def serialized_parts_count(data: bytes, start: int, dictionarySize: int) -> int:
+    """
+    Check `data` ends with a serialized array of byte strings and dictionary indexes, without deserializing it -
+    internal
+
+    :param data: the bytes ending with the serialized array
+    :type data: bytes
+    :param start: the offset of the serialized array in `data`
+    :type start: int
+    :param dictionarySize: the number of strings the dictionary indexes can refer to, 0 if there can't be any index
+    :type dictionarySize: int
+    :return: the number of parts of the array, or -1 if `data` doesn't end with such an array
+    """
+    size = len(data)
+    if size <= start:
+        return -1
+    itemType: int = data[start]
+    if itemType != SERIALIZED_ARRAY:
+        return -1
+    header = read_var_int(data, start + 1)
+    count = header[0]
+    offset = header[1]
+    if count < 0:
+        return -1
+
+    parsed = 0
+    while parsed < count:
+        if offset >= size:
+            return -1
+        itemType = data[offset]
+        item = read_var_int(data, offset + 1)
+        length = item[0]
+        offset = item[1]
+        if length < 0:
+            return -1
+        if offset + length > size:
+            return -1
+
+        if itemType == SERIALIZED_INTEGER:
+            # the index of the first string is serialized empty, the others as a single byte
+            if length > 1:
+                return -1
+            index: int = 0
+            if length == 1:
+                index = data[offset]
+            if index >= dictionarySize:
+                return -1
+        elif itemType != SERIALIZED_BYTESTRING:
+            return -1
+        offset = offset + length
+        parsed = parsed + 1
+
+    if offset != size:
+        return -1
+    return count
+
+
+def read_var_int(data: bytes, offset: int) -> List[int]:
+    """
+    Read a variable length integer of up to 2 bytes, as `serialize` writes the sizes - internal
+
+    :param data: the bytes to read
+    :type data: bytes
+    :param offset: the offset of the integer in `data`
+    :type offset: int
+    :return: the integer and the offset following it, the integer being -1 if `data` doesn't hold one at `offset`
+    """
+    size = len(data)
+    if offset >= size:
+        return [-1, offset]
+    value: int = data[offset]
+    if value < 0xFD:
+        return [value, offset + 1]
+    if value > 0xFD:
+        return [-1, offset]
+    if offset + 3 > size:
+        return [-1, offset]
+    return [to_int(data[offset + 1:offset + 3] + b'\x00'), offset + 3]
+
+
+def uri_properties(meta: bytes) -> Dict[Any, Any]:
+    """
+    Get the properties of a token minted with `mintUri` - internal
+
+    :param meta: the metadata stored for the token, starting with URI_META
+    :type meta: bytes
+    :return: the URI and the content hash of the metadata
+    """
+    properties: Dict[Any, Any] = {}
+    properties['tokenURI'] = meta[CONTENT_HASH_SIZE + 1:]
+    properties['contentHash'] = meta[1:CONTENT_HASH_SIZE + 1]
+    return properties
+
+
+def decompress_meta(meta: bytes) -> bytes:
+    """
+    Get the json of compressed metadata - internal
+
+    The dictionary can only be appended to, the metadata already minted refers to its strings by index. It's the
+    dictionary of the off-chain codec in metadata.py.
+
+    :param meta: the compressed metadata, starting with COMPRESSED_META
+    :type meta: bytes
+    :return: the json of the metadata
+    """
+    dictionary: List[bytes] = [
+        b'{"name":"',
+        b'","description":"',
+        b'","image":"',
+        b'","tokenURI":"',
+        b'","external_url":"',
+        b'","animation_url":"',
+        b'","attributes":[{"trait_type":"',
+        b'"},{"trait_type":"',
+        b'","display_type":"',
+        b'","value":"',
+        b'","value":',
+        b'},{"trait_type":"',
+        b'","properties":{"',
+        b'https://ghostmarket.io/',
+        b'https://ipfs.io/ipfs/',
+        b'https://',
+        b'ipfs://',
+    ]
+    json = b''
+    for part in cast(List[Any], deserialize(meta[1:])):
+        if isinstance(part, int):
+            json = json + dictionary[part]
+        else:
+            json = json + cast(bytes, part)
+    return json
+
+
+def find_page(prefix: bytes, start: bytes, limit: int) -> List[Any]:
+    """
+    Get a page of the keys under `prefix`, in storage order - internal
+
+    :param prefix: the storage prefix to look for
+    :type prefix: bytes
+    :param start: the page starts after this key, without the prefix
+    :type start: bytes
+    :param limit: the maximum number of keys in the page
+    :type limit: int
+    :return: the list of keys without the prefix, and the last one if there are more keys after it or else empty bytes.
+    :raise AssertionError: raised if `limit` is not between 1 and MAX_PAGE_SIZE.
+    """
+    expect(limit > 0, "limit has to be positive")
+    expect(limit <= MAX_PAGE_SIZE, "limit can not exceed the max page size")
+
+    page: List[bytes] = []
+    skip = len(start) != 0
+    keys = find(prefix, get_read_only_context(), FindOptions.REMOVE_PREFIX | FindOptions.KEYS_ONLY)
+    while keys.next():
+        key = cast(bytes, keys.value)
+        if skip:
+            # compared instead of matched, so the cursor stays valid if its token is burned
+            skip = memory_compare(key, start) <= 0
+        if not skip:
+            if len(page) == limit:
+                return [page, page[limit - 1]]
+            page.append(key)
+
+    cursor = b''
+    return [page, cursor]
 
 
 def remove_token_account(holder: UInt160, tokenId: bytes):
@@ -789,37 +1477,114 @@ def add_token_account(holder: UInt160, tokenId: bytes):
     put(key, tokenId)
 
 
+def remove_token_creator(creator: UInt160, tokenId: bytes):
+    key = mk_creator_key(creator) + tokenId
+    debug(['remove_token_creator: ', key, tokenId])
+    delete(key)
+
+
+def add_token_creator(creator: UInt160, tokenId: bytes):
+    key = mk_creator_key(creator) + tokenId
+    debug(['add_token_creator: ', key, tokenId])
+    put(key, tokenId)
+
+
 def get_owner_of(tokenId: bytes) -> UInt160:
     key = mk_token_key(tokenId)
     debug(['get_owner_of: ', key, tokenId])
-    owner = get_uint160(key, get_read_only_context())
-    return owner
+    return record_owner(get(key, get_read_only_context()))
 
 
-def remove_owner_of(tokenId: bytes):
+def get_token_record(tokenId: bytes) -> bytes:
     key = mk_token_key(tokenId)
-    debug(['remove_owner_of: ', key, tokenId])
+    debug(['get_token_record: ', key, tokenId])
+    return get(key, get_read_only_context())
+
+
+def remove_token_record(tokenId: bytes):
+    key = mk_token_key(tokenId)
+    debug(['remove_token_record: ', key, tokenId])
     delete(key)
 
 
-def set_owner_of(tokenId: bytes, owner: UInt160):
+def set_token_record(tokenId: bytes, record: bytes):
     key = mk_token_key(tokenId)
-    debug(['set_owner_of: ', key, tokenId])
-    put_uint160(key, owner)
+    debug(['set_token_record: ', key, tokenId, record])
+    put(key, record)
+
+
+def record_owner(record: bytes) -> UInt160:
+    if len(record) == OWNER_SIZE:
+        return cast(UInt160, record)
+    if len(record) == 0:
+        return UInt160()
+    return cast(UInt160, record[:OWNER_SIZE])
+
+
+def record_flags(tokenId: bytes, record: bytes) -> int:
+    if len(record) == OWNER_SIZE:
+        return legacy_record_flags(tokenId)
+    return record[OWNER_SIZE]
+
+
+def legacy_record_flags(tokenId: bytes) -> int:
+    """
+    Compute the flags of a record that is the owner alone, from the optional records of the token - internal
+
+    The record was written before the flags were packed in it, or the token has none of the optional records.
+    """
+    flags = 0
+    if len(get_locked_content(tokenId)) != 0:
+        flags = flags | TOKEN_FLAG_LOCKED
+    if len(get_royalties(tokenId)) != 0:
+        flags = flags | TOKEN_FLAG_ROYALTIES
+    if get_locked_view_counter(tokenId) != 0:
+        flags = flags | TOKEN_FLAG_VIEWED
+    return flags
+
+
+def record_creator(record: bytes) -> bytes:
+    # empty while the token hasn't left the account of its creator
+    if len(record) <= OWNER_SIZE + 1:
+        return b''
+    return record[OWNER_SIZE + 1:]
+
+
+def with_record_owner(record: bytes, owner: UInt160) -> bytes:
+    if len(record) == OWNER_SIZE:
+        return owner
+    if len(record) == OWNER_SIZE + 1:
+        flags: int = record[OWNER_SIZE]
+        if (flags & TOKEN_FLAG_CREATOR) != 0:
+            # the token leaves the account of its creator, which is written after the flags
+            return owner + record[OWNER_SIZE:] + record[:OWNER_SIZE]
+    return owner + record[OWNER_SIZE:]
+
+
+def migrate_storage():
+    """
+    Migrate the storage written by previous versions of the contract - internal
+
+    The contract state and the authorized addresses are moved to the ghost_runtime keys. The token records are left as
+    they are, rewriting them would read every token in the `update` transaction: the flags of the records written
+    before they were packed are computed when they're needed, see `record_flags`.
+    """
+    migrate_runtime(AUTH_ADDRESSES)
+    put_int(STORAGE_VERSION, PACKED_STORAGE_VERSION)
 
 
 def add_to_supply(amount: int):
-    total = totalSupply() + (amount)
+    total = get_int(SUPPLY_PREFIX, get_read_only_context()) + (amount)
     debug(['add_to_supply: ', amount])
     put_int(SUPPLY_PREFIX, total)
 
 
 def set_balance(owner: UInt160, amount: int):
-    old = balanceOf(owner)
+    key = mk_balance_key(owner)
+    old = get_int(key, get_read_only_context())
     new = old + (amount)
     debug(['set_balance: ', amount])
 
-    key = mk_balance_key(owner)
     if (new > 0):
         put_int(key, new)
     else:
@@ -871,44 +1636,37 @@ def get_royalties(tokenId: bytes) -> bytes:
     return val
 
 def get_royalties_info(tokenId: bytes, salePrice: int) -> List[List[Any]]:
-    key = mk_royalties_key(tokenId)
+    key = mk_royalties_info_key(tokenId)
     val = get(key, get_read_only_context())
 
-    result: List[List[Any]] = []
-
-    if len(val) == 0:
-        return result
-
-    strRoyalties: str = cast(str, val)
-    deserialized = cast(List[Dict[str, str]], json_deserialize(strRoyalties))
-
-    for royalty in deserialized:
-        royalties: List[Any] = []
-
-        val: int = 0
-        if isinstance(royalty["value"], str):
-            val = atoi(royalty["value"], 10)
-        else:
-            val = royalty["value"]
-        amount: int = salePrice * val // 10000
-
-        recipient: UInt160 = to_script_hash(cast(UInt160,(royalty["address"])))
-        royalties.append(recipient)
-        royalties.append(amount)
-        result.append(royalties)
-
-    return result
+    royalties: List[List[Any]]
+    if len(val) != 0:
+        royalties = cast(List[List[Any]], deserialize(val))
+    else:
+        # tokens minted before the royalties were parsed on mint only have their json
+        val = get_royalties(tokenId)
+        if len(val) == 0:
+            result: List[List[Any]] = []
+            return result
+        royalties = parse_royalties(val)
+
+    # the pairs are fresh copies, the bps are replaced by the amounts in place
+    for royalty in royalties:
+        royalty[1] = salePrice * cast(int, royalty[1]) // 10000
+    return royalties
 
-def add_royalties(tokenId: bytes, royalties: str):
+def add_royalties(tokenId: bytes, royalties: bytes, info: List[List[Any]]):
     key = mk_royalties_key(tokenId)
     debug(['add_royalties: ', key, tokenId])
-    put_str(key, royalties)
+    put(key, royalties)
+    put(mk_royalties_info_key(tokenId), serialize(info))
 
 
 def remove_royalties(tokenId: bytes):
     key = mk_royalties_key(tokenId)
     debug(['remove_royalties: ', key, tokenId])
     delete(key)
+    delete(mk_royalties_info_key(tokenId))
 
 
 def get_locked_view_counter(tokenId: bytes) -> int:
@@ -934,19 +1692,9 @@ def set_locked_view_counter(tokenId: bytes):
 # HELPERS
 # -------------------------------------------
 
-def expect(condition: bool, message: str):
-    allow_notify = get_call_flags() & CallFlags.ALLOW_NOTIFY
-    if allow_notify == CallFlags.ALLOW_NOTIFY:
-        assert condition, message
-    else:
-        assert condition, message
-
-def validateAddress(address: UInt160) -> bool:
-    if not isinstance(address, UInt160):
-        return False
-    if address == 0:
-        return False
-    return True
+def has_key(values: Dict[Any, Any], key: Any) -> bool:
+    # neo3-boa expands each `in` to the checks of every container type, they're only compiled once here
+    return key in values
 
 
 def mk_account_key(address: UInt160) -> bytes:
@@ -957,10 +1705,52 @@ def mk_balance_key(address: UInt160) -> bytes:
     return BALANCE_PREFIX + address
 
 
+def mk_creator_key(address: UInt160) -> bytes:
+    return CREATOR_PREFIX + address
+
+
 def mk_token_key(tokenId: bytes) -> bytes:
     return TOKEN_PREFIX + tokenId
 
 
+def mk_collection_key(collectionId: bytes) -> bytes:
+    return COLLECTION_PREFIX + collectionId
+
+
+def mk_token_id(tokenId: int, ordered: bool) -> bytes:
+    if ordered:
+        return mk_ordered_token_id(tokenId)
+    return to_bytes(tokenId)
+
+
+def mk_ordered_token_id(tokenId: int) -> bytes:
+    # the offset gives every number the same length, its last byte is left out
+    return to_bytes(swap_bytes(tokenId) + ORDERED_ID_OFFSET)[:ORDERED_ID_SIZE]
+
+
+def ordered_token_number(tokenId: bytes) -> int:
+    # the trailing zero keeps the number positive
+    return swap_bytes(to_int(tokenId + b'\x00'))
+
+
+def swap_bytes(value: int) -> int:
+    # the byte order is swapped with integer operations, converting each byte costs more
+    swapped = 0
+    remaining = value
+    index = 0
+    while index < ORDERED_ID_SIZE:
+        swapped = (swapped << 8) | (remaining & 0xff)
+        remaining = remaining >> 8
+        index += 1
+    return swapped
+
+
+def mk_token_record(owner: UInt160, flags: int, creator: bytes) -> bytes:
+    if flags == 0:
+        return owner
+    return owner + to_bytes(flags) + creator
+
+
 def mk_token_data_key(tokenId: bytes) -> bytes:
     return TOKEN_DATA_PREFIX + tokenId
 
@@ -977,5 +1767,10 @@ def mk_royalties_key(tokenId: bytes) -> bytes:
     return ROYALTIES_PREFIX + tokenId
 
 
+def mk_royalties_info_key(tokenId: bytes) -> bytes:
+    return ROYALTIES_INFO_PREFIX + tokenId
+
+
 def mk_lv_key(tokenId: bytes) -> bytes:
     return LOCKED_VIEW_COUNT_PREFIX + tokenId
+
@@ -4,12 +4,17 @@ from boa3.builtin.compile_time import CreateNewEvent, NeoMetadata, public
 from boa3.builtin.type.helper import to_int, to_bool
 from boa3.builtin.contract import Nep17TransferEvent, abort
 from boa3.builtin.interop.blockchain import get_contract, Transaction
-from boa3.builtin.interop.contract import CallFlags, call_contract, get_call_flags, update_contract
+from boa3.builtin.interop.contract import call_contract
 from boa3.builtin.interop.runtime import check_witness, script_container
-from boa3.builtin.interop.storage import delete, get, get_int, get_bool, put, put_int, put_bool, get_read_only_context
-from boa3.builtin.interop.stdlib import serialize, deserialize
+from boa3.builtin.interop.storage import delete, get, get_int, put, put_int, get_read_only_context
 from boa3.builtin.type import UInt160
 
+# a single import, neo3-boa only exports the public methods of the last import of a module
+from ghost_runtime import (
+    getAuthorizedAddress, setAuthorizedAddress, isPaused, updatePause, update,
+    contract_deployed, contract_paused, debug, expect, init_runtime, migrate_runtime, validateAddress
+)
+
 
 # -------------------------------------------
 # METADATA
@@ -32,7 +37,7 @@ def manifest_metadata() -> NeoMetadata:
 # -------------------------------------------
 
 
-# Authorized address prefix
+# List of the authorized addresses written by previous versions, moved to the ghost_runtime keys on update
 AUTH_ADDRESSES = b'AU'
 
 # Supply of the token
@@ -47,12 +52,6 @@ TOKEN_DECIMALS = 8
 # Total Supply of tokens in the system
 TOKEN_TOTAL_SUPPLY = 100_000_000 * 100_000_000  # 100m total supply * 10^8 (decimals)
 
-# Whether the smart contract was deployed or not
-DEPLOYED = b'deployed'
-
-# Whether the smart contract is paused or not
-PAUSED = b'paused'
-
 # Allowance prefix
 ALLOWANCE_PREFIX = b'ALL'
 
@@ -63,16 +62,6 @@ ALLOWANCE_PREFIX = b'ALL'
 
 on_transfer = Nep17TransferEvent
 
-on_auth = CreateNewEvent(
-    # trigger when an address has been authorized
-    [
-        ('authorized', UInt160),
-        ('type', int),
-        ('add', bool),
-    ],
-    'Authorized'
-)
-
 on_approve = CreateNewEvent(
     # trigger when an approval has been made
     [
@@ -84,24 +73,6 @@ on_approve = CreateNewEvent(
 )
 
 
-# DEBUG_START
-# -------------------------------------------
-# DEBUG
-# -------------------------------------------
-
-on_debug = CreateNewEvent(
-    [
-        ('params', list),
-    ],
-    'Debug'
-)
-
-def debug(params: list):
-    allow_notify = get_call_flags() & CallFlags.ALLOW_NOTIFY
-    if allow_notify == CallFlags.ALLOW_NOTIFY:
-        on_debug(params)
-# DEBUG_END
-
 # -------------------------------------------
 # NEP-17 METHODS
 # -------------------------------------------
@@ -204,7 +175,7 @@ def approve(from_address: UInt160, spender: UInt160, amount: int) -> bool:
     expect(validateAddress(spender), "approve - invalid spender address")
     expect(amount >= 0, "approve - amount has to be >= 0")
     # contract should not be paused
-    expect(not isPaused(), "approve - contract paused")
+    expect(not contract_paused(), "approve - contract paused")
 
     if amount == 0:
         remove_allowance(from_address, spender)
@@ -240,7 +211,7 @@ def transferFrom(spender: UInt160, from_address: UInt160, to_address: UInt160, a
     expect(validateAddress(from_address), "transferFrom - invalid from address")
     expect(validateAddress(to_address), "transferFrom - invalid to address")
     # contract should not be paused
-    expect(not isPaused(), "transferFrom - contract paused")
+    expect(not contract_paused(), "transferFrom - contract paused")
     # the parameter amount must be greater than or equal to 0. If not, this method should throw an exception.
     expect(amount >= 0, "transferFrom - amount must be greater than or equal to 0")
 
@@ -307,7 +278,7 @@ def transfer(from_address: UInt160, to_address: UInt160, amount: int, data: Any)
     expect(validateAddress(from_address), "transfer - invalid from address")
     expect(validateAddress(to_address), "transfer - invalid to address")
     # contract should not be paused
-    expect(not isPaused(), "transfer - contract paused")
+    expect(not contract_paused(), "transfer - contract paused")
     # the parameter amount must be greater than or equal to 0. If not, this method should throw an exception.
     expect(amount >= 0, "transfer - amount must be greater than or equal to 0")
 
@@ -340,6 +311,71 @@ def transfer(from_address: UInt160, to_address: UInt160, amount: int, data: Any)
     return True
 
 
+@public
+def multiTransfer(from_address: UInt160, transfers: List[List[Any]], data: Any) -> bool:
+    """
+    Transfers amounts of NEP-17 tokens from one account to multiple accounts
+
+    Each transfer is a `[to_address, amount]` pair. The witness of `from_address` is checked and its balance is read and
+    written once for the whole batch. If the method succeeds, it fires one `Transfer` event per transfer. The onPayment
+    methods of the receiving contracts are called once all the balances are updated.
+
+    :param from_address: the address to transfer from
+    :type from_address: UInt160
+    :param transfers: the address to transfer to and the amount of NEP-17 tokens to transfer, for each transfer
+    :type transfers: List[List[Any]]
+    :param data: whatever data is pertinent to the onPayment method
+    :type data: Any
+
+    :return: whether the transfers were successful, no transfer is done if the from account balance is not enough
+    :raise AssertionError: raised if `from_address` or any `to_address` length is not 20, if any transfer is not a pair
+        or if any amount is less than zero.
+    """
+    expect(validateAddress(from_address), "multiTransfer - invalid from address")
+    # contract should not be paused
+    expect(not contract_paused(), "multiTransfer - contract paused")
+
+    total = 0
+    for transfer_item in transfers:
+        expect(len(transfer_item) == 2, "multiTransfer - invalid transfer")
+        to_address = cast(UInt160, transfer_item[0])
+        amount = cast(int, transfer_item[1])
+        expect(validateAddress(to_address), "multiTransfer - invalid to address")
+        expect(amount >= 0, "multiTransfer - amount must be greater than or equal to 0")
+        # amounts sent to yourself don't change the balance
+        if to_address != from_address:
+            total += amount
+
+    # The function MUST return false if the from account balance does not have enough tokens to spend.
+    from_balance = get_int(from_address, get_read_only_context())
+    if from_balance < total:
+        return False
+
+    if not check_witness(from_address):
+        return False
+
+    if total != 0:
+        if from_balance == total:
+            delete(from_address)
+        else:
+            put_int(from_address, from_balance - total)
+
+        for transfer_item in transfers:
+            to_address = cast(UInt160, transfer_item[0])
+            amount = cast(int, transfer_item[1])
+            if to_address != from_address and amount != 0:
+                to_balance = get_int(to_address, get_read_only_context())
+                put_int(to_address, to_balance + amount)
+
+    # the receivers are only called once all the balances are updated
+    for transfer_item in transfers:
+        to_address = cast(UInt160, transfer_item[0])
+        amount = cast(int, transfer_item[1])
+        on_transfer(from_address, to_address, amount)
+        post_transfer(from_address, to_address, amount, data)
+    return True
+
+
 def post_transfer(from_address: Union[UInt160, None], to_address: Union[UInt160, None], amount: int, data: Any):
     """
     Checks if the one receiving NEP-17 tokens is a smart contract and if it's one the onPayment method will be called
@@ -377,9 +413,10 @@ def _deploy(data: Any, upgrade: bool):
     The contracts initial entry point, on deployment.
     """
     if upgrade:
+        migrate_runtime(AUTH_ADDRESSES)
         return
 
-    if get_bool(DEPLOYED, get_read_only_context()):
+    if contract_deployed():
         abort()
 
     if get_int(SUPPLY_KEY, get_read_only_context()) > 0:
@@ -388,174 +425,18 @@ def _deploy(data: Any, upgrade: bool):
     tx = cast(Transaction, script_container)
     owner: UInt160 = tx.sender
 
-    put_bool(DEPLOYED, True)
-    put_bool(PAUSED, False)
+    init_runtime(owner)
     put_int(SUPPLY_KEY, TOKEN_TOTAL_SUPPLY)
     put_int(owner, TOKEN_TOTAL_SUPPLY)
 
-    auth: List[UInt160] = []
-    auth.append(owner)
-    serialized = serialize(auth)
-    put(AUTH_ADDRESSES, serialized)
-
     on_transfer(None, owner, TOKEN_TOTAL_SUPPLY)
     post_transfer(None, owner, TOKEN_TOTAL_SUPPLY, None)
 
 
-@public
-def update(script: bytes, manifest: bytes):
-    """
-    Upgrade the contract.
-
-    :param script: the contract script
-    :type script: bytes
-    :param manifest: the contract manifest
-    :type manifest: bytes
-    :raise AssertionError: raised if witness is not verified
-    """
-    verified: bool = verify()
-    expect(verified, 'update - `account` is not allowed for update')
-    update_contract(script, manifest) 
-    debug(['update called and done'])
-
-
-# -------------------------------------------
-# GHOSTMARKET METHODS
-# -------------------------------------------
-
-@public(safe=True)
-def getAuthorizedAddress() -> list[UInt160]:
-    """
-    Configure authorized addresses.
-
-    When this contract address is included in the transaction signature,
-    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
-    For example, this method needs to be called when withdrawing token from the contract.
-
-    :param address: the address of the account that is being authorized
-    :type address: UInt160
-    :param authorized: authorization status of this address
-    :type authorized: bool
-    :return: whether the transaction signature is correct
-    :raise AssertionError: raised if witness is not verified.
-    """
-    serialized = get(AUTH_ADDRESSES, get_read_only_context())
-    auth = cast(list[UInt160], deserialize(serialized))
-
-    return auth
-
-
-@public
-def setAuthorizedAddress(address: UInt160, authorized: bool):
-    """
-    Configure authorized addresses.
-
-    When this contract address is included in the transaction signature,
-    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
-    For example, this method needs to be called when withdrawing token from the contract.
-
-    :param address: the address of the account that is being authorized
-    :type address: UInt160
-    :param authorized: authorization status of this address
-    :type authorized: bool
-    :return: whether the transaction signature is correct
-    :raise AssertionError: raised if witness is not verified.
-    """
-    verified: bool = verify()
-    expect(verified, 'setAuthorizedAddress - `account` is not allowed for setAuthorizedAddress')
-    expect(validateAddress(address), "setAuthorizedAddress - invalid address in set auth")
-    expect(isinstance(authorized, bool), "setAuthorizedAddress - authorized has to be of type bool")
-    serialized = get(AUTH_ADDRESSES, get_read_only_context())
-    auth = cast(list[UInt160], deserialize(serialized))
-    expect(len(auth) <= 10, "setAuthorizedAddress - authorized addresses count has to be <= 10")
-
-    if authorized:
-        found = False
-        for i in auth:
-            if i == address:
-                found = True
-                break
-
-        if not found:
-            auth.append(address)
-
-        put(AUTH_ADDRESSES, serialize(auth))
-        on_auth(address, 0, True)
-    else:
-        auth.remove(address)
-        put(AUTH_ADDRESSES, serialize(auth))
-        on_auth(address, 0, False)
-
-
-@public(safe=True)
-def isPaused() -> bool:
-    """
-    Get the contract pause status.
-
-    If the contract is paused, some operations are restricted.
-
-    :return: whether the contract is paused
-    """
-    debug(['isPaused: ', get_bool(PAUSED)])
-    if get_bool(PAUSED, get_read_only_context()):
-        return True
-    return False
-
-
-@public
-def updatePause(status: bool) -> bool:
-    """
-    Set contract pause status.
-
-    :param status: the status of the contract pause
-    :type status: bool
-    :return: the contract pause status
-    :raise AssertionError: raised if witness is not verified.
-    """
-    verified: bool = verify()
-    expect(verified, 'updatePause - `account` is not allowed for updatePause')
-    expect(isinstance(status, bool), "updatePause - status has to be of type bool")
-    put_bool(PAUSED, status)
-    debug(['updatePause: ', get_bool(PAUSED)])
-    return get_bool(PAUSED, get_read_only_context())
-
-
-def verify() -> bool:
-    """
-    Check if the address is allowed.
-
-    When this contract address is included in the transaction signature,
-    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
-    For example, this method needs to be called when withdrawing token from the contract.
-
-    :return: whether the transaction signature is correct
-    """
-    serialized = get(AUTH_ADDRESSES, get_read_only_context())
-    auth = cast(list[UInt160], deserialize(serialized))
-    tx = cast(Transaction, script_container)
-    for addr in auth: 
-        if check_witness(addr):
-            debug(["Verification successful", addr, tx.sender])
-            return True
-
-    debug(["Verification failed", addr])
-    return False
-
-
 # -------------------------------------------
 # HELPERS
 # -------------------------------------------
 
-def expect(condition: bool, message: str):
-    assert condition, message
-
-def validateAddress(address: UInt160) -> bool:
-    if not isinstance(address, UInt160):
-        return False
-    if address == 0:
-        return False
-    return True
-
 def remove_allowance(owner: UInt160, spender: UInt160):
     key = mk_allowance_key(owner, spender)
     debug(['remove_allowance: ', key, owner, spender])
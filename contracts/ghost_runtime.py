@@ -0,0 +1,299 @@
+"""
+Runtime shared by the GhostMarket contracts: contract state, authorized addresses, pause and update.
+
+The contracts import the public methods they expose from this module, and the helpers they use. Both contracts use the
+same storage keys for everything stored here.
+"""
+
+from typing import List, cast
+
+from boa3.builtin.compile_time import CreateNewEvent, public
+from boa3.builtin.interop.blockchain import Transaction
+from boa3.builtin.interop.contract import CallFlags, get_call_flags, update_contract
+from boa3.builtin.interop.runtime import check_witness, script_container
+from boa3.builtin.interop.stdlib import deserialize
+from boa3.builtin.interop.storage import delete, find, get, get_bool, get_int, put_bool, put_int, get_read_only_context
+from boa3.builtin.interop.storage.findoptions import FindOptions
+from boa3.builtin.type import UInt160
+
+
+# -------------------------------------------
+# RUNTIME SETTINGS
+# -------------------------------------------
+
+# Contract wide flags, packed in a single word so they're read with a single storage read. New flags get the next bit.
+CONTRACT_STATE = b'STATE'
+STATE_DEPLOYED = 1
+STATE_PAUSED = 2
+
+# Whether the smart contract was deployed or paused, written by previous versions and moved to CONTRACT_STATE on update
+DEPLOYED = b'deployed'
+PAUSED = b'paused'
+
+# Authorized address prefix
+AUTH_PREFIX = b'AUP'
+
+# Maximum number of authorized addresses
+MAX_AUTH_ADDRESSES = 10
+
+
+# -------------------------------------------
+# EVENTS
+# -------------------------------------------
+
+on_auth = CreateNewEvent(
+    # trigger when an address has been authorized/whitelisted.
+    [
+        ('authorized', UInt160),
+        ('type', int),
+        ('add', bool),
+    ],
+    'Authorized'
+)
+
+# DEBUG_START
+# -------------------------------------------
+# DEBUG
+# -------------------------------------------
+
+on_debug = CreateNewEvent(
+    [
+        ('params', list),
+    ],
+    'Debug'
+)
+
+def debug(params: list):
+    allow_notify = get_call_flags() & CallFlags.ALLOW_NOTIFY
+    if allow_notify == CallFlags.ALLOW_NOTIFY:
+        on_debug(params)
+
+# DEBUG_END
+# -------------------------------------------
+# GHOSTMARKET METHODS
+# -------------------------------------------
+
+@public(safe=True)
+def getAuthorizedAddress() -> list[UInt160]:
+    """
+    Get the authorized addresses.
+
+    :return: the addresses allowed to administrate the contract
+    """
+    return get_authorized_addresses()
+
+
+@public
+def setAuthorizedAddress(address: UInt160, authorized: bool):
+    """
+    Configure authorized addresses.
+
+    When this contract address is included in the transaction signature,
+    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
+    For example, this method needs to be called when withdrawing token from the contract.
+
+    :param address: the address of the account that is being authorized
+    :type address: UInt160
+    :param authorized: authorization status of this address
+    :type authorized: bool
+    :raise AssertionError: raised if witness is not verified.
+    """
+    verified: bool = verify()
+    expect(verified, 'setAuthorizedAddress - `account` is not allowed for setAuthorizedAddress')
+    expect(validateAddress(address), "setAuthorizedAddress - not a valid address")
+    expect(isinstance(authorized, bool), "setAuthorizedAddress - authorized has to be of type bool")
+
+    if authorized:
+        if not is_authorized(address):
+            expect(len(get_authorized_addresses()) < MAX_AUTH_ADDRESSES,
+                   "setAuthorizedAddress - authorized addresses count has to be <= 10")
+            put_bool(mk_auth_key(address), True)
+        on_auth(address, 0, True)
+    else:
+        delete(mk_auth_key(address))
+        on_auth(address, 0, False)
+
+
+@public
+def verify() -> bool:
+    """
+    Check if the address is allowed.
+
+    When this contract address is included in the transaction signature,
+    this method will be triggered as a VerificationTrigger to verify that the signature is correct.
+    For example, this method needs to be called when withdrawing token from the contract.
+
+    Only exported by the contracts importing it, the GM token uses it internally to check the authorized addresses.
+
+    :return: whether the transaction signature is correct
+    """
+    tx = cast(Transaction, script_container)
+    sender = tx.sender
+    # the authorized address signing is usually the sender, checked with a single storage read
+    if is_authorized(sender):
+        if check_witness(sender):
+            debug(["Verification successful", sender])
+            return True
+
+    for addr in get_authorized_addresses():
+        if addr != sender:
+            if check_witness(addr):
+                debug(["Verification successful", addr, sender])
+                return True
+
+    debug(["Verification failed", sender])
+    return False
+
+
+@public(safe=True)
+def isPaused() -> bool:
+    """
+    Get the contract pause status.
+
+    If the contract is paused, some operations are restricted.
+
+    :return: whether the contract is paused
+    """
+    debug(['isPaused: ', get_contract_state()])
+    return contract_paused()
+
+
+@public
+def updatePause(status: bool) -> bool:
+    """
+    Set contract pause status.
+
+    :param status: the status of the contract pause
+    :type status: bool
+    :return: the contract pause status
+    :raise AssertionError: raised if witness is not verified.
+    """
+    verified: bool = verify()
+    expect(verified, 'updatePause - `account` is not allowed for updatePause')
+    expect(isinstance(status, bool), "updatePause - status has to be of type bool")
+    state = set_contract_flag(STATE_PAUSED, status)
+    debug(['updatePause: ', state])
+    return status
+
+
+@public
+def update(script: bytes, manifest: bytes):
+    """
+    Upgrade the contract.
+
+    :param script: the contract script
+    :type script: bytes
+    :param manifest: the contract manifest
+    :type manifest: bytes
+    :raise AssertionError: raised if witness is not verified
+    """
+    verified: bool = verify()
+    expect(verified, 'update - `account` is not allowed for update')
+    update_contract(script, manifest)
+    debug(['update called and done'])
+
+
+# -------------------------------------------
+# HELPERS
+# -------------------------------------------
+
+def expect(condition: bool, message: str):
+    assert condition, message
+
+
+def validateAddress(address: UInt160) -> bool:
+    if not isinstance(address, UInt160):
+        return False
+    if address == 0:
+        return False
+    return True
+
+
+def init_runtime(owner: UInt160):
+    """
+    Write the state of a newly deployed contract, with `owner` as its only authorized address.
+    """
+    put_int(CONTRACT_STATE, STATE_DEPLOYED)
+    put_bool(mk_auth_key(owner), True)
+
+
+def migrate_runtime(auth_addresses_key: bytes):
+    """
+    Migrate the runtime storage written by previous versions of a contract.
+
+    :param auth_addresses_key: the key the contract stored its list of authorized addresses under
+    """
+    migrate_contract_state()
+    migrate_authorized_addresses(auth_addresses_key)
+
+
+def get_contract_state() -> int:
+    return get_int(CONTRACT_STATE, get_read_only_context())
+
+
+def set_contract_flag(flag: int, enabled: bool) -> int:
+    """
+    Set or clear a flag of the contract state, keeping the other flags.
+
+    :return: the new contract state
+    """
+    state = get_contract_state()
+    if enabled:
+        state = state | flag
+    else:
+        state = state & ~flag
+    put_int(CONTRACT_STATE, state)
+    return state
+
+
+def contract_deployed() -> bool:
+    return (get_int(CONTRACT_STATE, get_read_only_context()) & STATE_DEPLOYED) != 0
+
+
+def contract_paused() -> bool:
+    return (get_int(CONTRACT_STATE, get_read_only_context()) & STATE_PAUSED) != 0
+
+
+def migrate_contract_state():
+    if get_contract_state() != 0:
+        return
+
+    state = 0
+    if get_bool(DEPLOYED, get_read_only_context()):
+        state = state | STATE_DEPLOYED
+    if get_bool(PAUSED, get_read_only_context()):
+        state = state | STATE_PAUSED
+    put_int(CONTRACT_STATE, state)
+    delete(DEPLOYED)
+    delete(PAUSED)
+    debug(['migrate_contract_state: ', state])
+
+
+def migrate_authorized_addresses(auth_addresses_key: bytes):
+    serialized = get(auth_addresses_key, get_read_only_context())
+    if len(serialized) == 0:
+        return
+
+    for address in cast(List[UInt160], deserialize(serialized)):
+        put_bool(mk_auth_key(address), True)
+    delete(auth_addresses_key)
+    debug(['migrate_authorized_addresses: ', serialized])
+
+
+def is_authorized(address: UInt160) -> bool:
+    return get_bool(mk_auth_key(address), get_read_only_context())
+
+
+def get_authorized_addresses() -> List[UInt160]:
+    addresses: List[UInt160] = []
+    keys = find(AUTH_PREFIX, get_read_only_context(), FindOptions.REMOVE_PREFIX | FindOptions.KEYS_ONLY)
+    while keys.next():
+        key = cast(bytes, keys.value)
+        # the GM balances are stored under the bare address, the ones starting with the prefix are skipped
+        if len(key) == 20:
+            addresses.append(cast(UInt160, key))
+    return addresses
+
+
+def mk_auth_key(address: UInt160) -> bytes:
+    return AUTH_PREFIX + address
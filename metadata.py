@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Off-chain codec of the compressed token metadata of GhostMarketNFT.
+
+    ./metadata.py compress meta.json    # hex of the metadata to mint, compressed when it's smaller
+    ./metadata.py decompress <hex>      # json of metadata read from the contract storage
+
+Compressed metadata is COMPRESSED_META followed by a serialized NeoVM array of the json split in parts: byte strings
+copied as is, and integers, the index of a string of META_DICTIONARY. The contract decompresses it when the properties
+of the token are read.
+"""
+
+import argparse
+import base64
+import json
+import sys
+
+COMPRESSED_META = 0x01
+URI_META = 0x02
+CONTENT_HASH_SIZE = 32
+
+# Serialized NeoVM stack item types
+ARRAY_TYPE = 0x40
+BYTESTRING_TYPE = 0x28
+INTEGER_TYPE = 0x21
+
+# Same strings, in the same order, as the dictionary of `decompress_meta` in GhostMarketNFT. Strings can only be added
+# at the end, the minted metadata refers to them by index.
+META_DICTIONARY = [
+    b'{"name":"',
+    b'","description":"',
+    b'","image":"',
+    b'","tokenURI":"',
+    b'","external_url":"',
+    b'","animation_url":"',
+    b'","attributes":[{"trait_type":"',
+    b'"},{"trait_type":"',
+    b'","display_type":"',
+    b'","value":"',
+    b'","value":',
+    b'},{"trait_type":"',
+    b'","properties":{"',
+    b'https://ghostmarket.io/',
+    b'https://ipfs.io/ipfs/',
+    b'https://',
+    b'ipfs://',
+]
+
+
+def write_var_int(value: int) -> bytes:
+    if value < 0xFD:
+        return bytes([value])
+    if value <= 0xFFFF:
+        return b'\xfd' + value.to_bytes(2, 'little')
+    return b'\xfe' + value.to_bytes(4, 'little')
+
+
+def read_var_int(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    :return: the value read at `offset`, and the offset following it
+    """
+    prefix = data[offset]
+    if prefix < 0xFD:
+        return prefix, offset + 1
+    size = 2 if prefix == 0xFD else 4 if prefix == 0xFE else 8
+    return int.from_bytes(data[offset + 1:offset + 1 + size], 'little'), offset + 1 + size
+
+
+def split_meta(meta: bytes) -> list[bytes | int]:
+    """
+    Split `meta` in literal parts and dictionary indexes, taking the longest dictionary string at each position.
+    """
+    parts: list[bytes | int] = []
+    literal = bytearray()
+    position = 0
+    while position < len(meta):
+        match = max(
+            (index for index, word in enumerate(META_DICTIONARY) if meta.startswith(word, position)),
+            key=lambda index: len(META_DICTIONARY[index]),
+            default=None
+        )
+        if match is None:
+            literal.append(meta[position])
+            position += 1
+            continue
+
+        if len(literal) > 0:
+            parts.append(bytes(literal))
+            literal.clear()
+        parts.append(match)
+        position += len(META_DICTIONARY[match])
+
+    if len(literal) > 0:
+        parts.append(bytes(literal))
+    return parts
+
+
+def compress_meta(meta: bytes) -> bytes:
+    """
+    Compress the json metadata of a token, as it's decompressed by the contract.
+    """
+    return encode_parts(split_meta(meta))
+
+
+def encode_parts(parts: list[bytes | int]) -> bytes:
+    """
+    Get the compressed metadata made of `parts`, literal byte strings and dictionary indexes.
+    """
+    serialized = bytearray([ARRAY_TYPE])
+    serialized += write_var_int(len(parts))
+    for part in parts:
+        if isinstance(part, int):
+            # the dictionary is smaller than 128 strings, each index is a single byte but 0 which is empty
+            index = part.to_bytes(1, 'little') if part > 0 else b''
+            serialized += bytes([INTEGER_TYPE]) + write_var_int(len(index)) + index
+        else:
+            serialized += bytes([BYTESTRING_TYPE]) + write_var_int(len(part)) + part
+    return bytes([COMPRESSED_META]) + bytes(serialized)
+
+
+def decompress_meta(stored: bytes) -> bytes:
+    """
+    Get the json of the metadata stored for a token, as returned by `propertiesJson`.
+    """
+    if len(stored) > 0 and stored[0] == URI_META:
+        return json.dumps({
+            'tokenURI': stored[CONTENT_HASH_SIZE + 1:].decode('utf-8'),
+            'contentHash': base64.b64encode(stored[1:CONTENT_HASH_SIZE + 1]).decode('ascii'),
+        }, separators=(',', ':')).encode('utf-8')
+    if len(stored) == 0 or stored[0] != COMPRESSED_META:
+        return stored
+    if stored[1] != ARRAY_TYPE:
+        raise ValueError('compressed metadata is not a serialized array')
+
+    count, offset = read_var_int(stored, 2)
+    meta = bytearray()
+    for _ in range(count):
+        item_type = stored[offset]
+        size, offset = read_var_int(stored, offset + 1)
+        value = stored[offset:offset + size]
+        offset += size
+        if item_type == INTEGER_TYPE:
+            meta += META_DICTIONARY[int.from_bytes(value, 'little', signed=True)]
+        elif item_type == BYTESTRING_TYPE:
+            meta += value
+        else:
+            raise ValueError(f'unexpected item type {item_type:#x} in compressed metadata')
+    return bytes(meta)
+
+
+def mint_meta(meta: bytes) -> bytes:
+    """
+    Get the metadata to mint a token with: the json minified and compressed, unless compressing it doesn't save space.
+
+    The properties of the token are the same, `propertiesJson` returns the minified json.
+    """
+    minified = json.dumps(json.loads(meta), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    compressed = compress_meta(minified)
+    return compressed if len(compressed) < len(meta) else meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress or decompress GhostMarketNFT token metadata.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compress_parser = subparsers.add_parser('compress', help='print the hex of the metadata to mint')
+    compress_parser.add_argument('path', help='json file of the metadata')
+    decompress_parser = subparsers.add_parser('decompress', help='print the json of stored metadata')
+    decompress_parser.add_argument('hex', help='hex of the metadata, as stored')
+    args = parser.parse_args()
+
+    if args.command == 'compress':
+        with open(args.path, 'rb') as meta_file:
+            meta = meta_file.read()
+        minted = mint_meta(meta)
+        print(minted.hex())
+        print(f'{len(meta)} -> {len(minted)} bytes', file=sys.stderr)
+    else:
+        print(decompress_meta(bytes.fromhex(args.hex)).decode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
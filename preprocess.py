@@ -0,0 +1,509 @@
+import ast
+import copy
+import io
+import operator
+import os
+import re
+import tokenize
+
+GHOST_ROOT = os.path.dirname(os.path.abspath(__file__))
+# folder of the modules shared by the contracts, the compiler has to be given it as project root
+CONTRACTS_DIR = os.path.join(GHOST_ROOT, 'contracts')
+
+DEBUG_FUNCTIONS = ['debug', 'on_debug']
+DEBUG_BLOCK_START = '# DEBUG_START'
+DEBUG_BLOCK_END = '# DEBUG_END'
+
+KEY_HELPER_NAME = re.compile(r'^mk_\w+_key$')
+ASSERT_FUNCTIONS = ['expect']
+
+# only operators that behave the same on the NeoVM as in Python, so folding doesn't change the result
+FOLDABLE_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Pow: operator.pow,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitAnd: operator.and_,
+    ast.BitXor: operator.xor,
+}
+FOLDABLE_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Invert: operator.invert,
+}
+# NeoVM integers are 256 bits long
+MAX_INT_BITS = 255
+
+
+def debug_block_lines(source: str) -> list[tuple[int, int]]:
+    """
+    Get the line ranges enclosed by the `# DEBUG_START` / `# DEBUG_END` markers, markers included.
+    """
+    blocks = []
+    start = None
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type != tokenize.COMMENT:
+            continue
+        if token.string.startswith(DEBUG_BLOCK_START):
+            start = token.start[0]
+        elif token.string.startswith(DEBUG_BLOCK_END):
+            if start is None:
+                raise ValueError(f'line {token.start[0]}: {DEBUG_BLOCK_END} without {DEBUG_BLOCK_START}')
+            blocks.append((start, token.start[0]))
+            start = None
+
+    if start is not None:
+        raise ValueError(f'line {start}: {DEBUG_BLOCK_START} without {DEBUG_BLOCK_END}')
+    return blocks
+
+
+def is_debug_statement(node: ast.stmt) -> bool:
+    if isinstance(node, ast.FunctionDef):
+        return node.name in DEBUG_FUNCTIONS
+    if isinstance(node, ast.Assign):
+        return any(isinstance(target, ast.Name) and target.id in DEBUG_FUNCTIONS for target in node.targets)
+    return (isinstance(node, ast.Expr)
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+            and node.value.func.id in DEBUG_FUNCTIONS)
+
+
+class DebugStripper(ast.NodeTransformer):
+    """
+    Removes the debug helpers and their imports, every `debug(...)` statement and every statement inside a debug block.
+    """
+
+    def __init__(self, blocks: list[tuple[int, int]]):
+        self.blocks = blocks
+
+    def in_debug_block(self, node: ast.stmt) -> bool:
+        return any(start <= node.lineno and node.end_lineno <= end for start, end in self.blocks)
+
+    def strip(self, body: list[ast.stmt], keep_empty: bool = False) -> list[ast.stmt]:
+        stripped = [self.visit(node) for node in body
+                    if not self.in_debug_block(node) and not is_debug_statement(node)]
+        stripped = [node for node in stripped if node is not None]
+        if len(stripped) == 0 and not keep_empty:
+            stripped.append(ast.Pass())
+        return stripped
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> ast.AST | None:
+        node.names = [alias for alias in node.names if alias.name not in DEBUG_FUNCTIONS]
+        if len(node.names) == 0:
+            return None
+        return node
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        for field in ('body', 'orelse', 'finalbody'):
+            body = getattr(node, field, None)
+            if isinstance(body, list) and all(isinstance(item, ast.stmt) for item in body):
+                keep_empty = field != 'body' or isinstance(node, ast.Module)
+                setattr(node, field, self.strip(body, keep_empty))
+
+        for field, value in ast.iter_fields(node):
+            if field in ('body', 'orelse', 'finalbody'):
+                continue
+            if isinstance(value, list):
+                setattr(node, field, [self.visit(item) if isinstance(item, ast.AST) else item for item in value])
+            elif isinstance(value, ast.AST):
+                setattr(node, field, self.visit(value))
+        return node
+
+
+def local_names(function: ast.FunctionDef) -> set[str]:
+    """
+    Get the names of the arguments and of every variable assigned in a function.
+    """
+    arguments = function.args
+    names = {arg.arg for arg in arguments.posonlyargs + arguments.args + arguments.kwonlyargs}
+    if arguments.vararg is not None:
+        names.add(arguments.vararg.arg)
+    if arguments.kwarg is not None:
+        names.add(arguments.kwarg.arg)
+
+    for node in ast.walk(function):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+    return names
+
+
+class ScopedTransformer(ast.NodeTransformer):
+    """
+    Keeps track of the local names of the function being visited, so module names shadowed by them are left alone.
+    """
+
+    def __init__(self):
+        self.scope: set[str] = set()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        outer_scope = self.scope
+        self.scope = outer_scope | local_names(node)
+        self.generic_visit(node)
+        self.scope = outer_scope
+        return node
+
+
+class ConstantFolder(ScopedTransformer):
+    """
+    Evaluates at compile time the operations whose operands are all literals or module constants.
+
+    A module constant is a name assigned only once, at module level, to a literal.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.constants: dict[str, object] = {}
+
+    def visit_Module(self, node: ast.Module) -> ast.AST:
+        store_count: dict[str, int] = {}
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and not isinstance(child.ctx, ast.Load):
+                store_count[child.id] = store_count.get(child.id, 0) + 1
+
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign)
+                    and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name)):
+                statement.value = self.visit(statement.value)
+                name = statement.targets[0].id
+                if isinstance(statement.value, ast.Constant) and store_count[name] == 1:
+                    self.constants[name] = statement.value.value
+
+        self.generic_visit(node)
+        return node
+
+    def constant_value(self, node: ast.expr) -> tuple[bool, object]:
+        if isinstance(node, ast.Constant):
+            return True, node.value
+        if (isinstance(node, ast.Name)
+                and node.id in self.constants
+                and node.id not in self.scope):
+            return True, self.constants[node.id]
+        return False, None
+
+    @staticmethod
+    def foldable(value: object) -> bool:
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, int):
+            return value.bit_length() <= MAX_INT_BITS
+        return isinstance(value, (str, bytes))
+
+    def fold(self, node: ast.expr, evaluate) -> ast.expr:
+        try:
+            value = evaluate()
+        except (TypeError, ValueError, OverflowError):
+            return node
+
+        if not self.foldable(value):
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        function = FOLDABLE_OPERATORS.get(type(node.op))
+        left_is_constant, left = self.constant_value(node.left)
+        right_is_constant, right = self.constant_value(node.right)
+        if function is None or not left_is_constant or not right_is_constant:
+            return node
+        if not self.foldable(left) or not self.foldable(right):
+            return node
+        if isinstance(left, (str, bytes)) and not isinstance(node.op, ast.Add):
+            return node
+        if isinstance(node.op, ast.Pow) and (not isinstance(right, int) or right > MAX_INT_BITS):
+            return node
+
+        return self.fold(node, lambda: function(left, right))
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        function = FOLDABLE_UNARY_OPERATORS.get(type(node.op))
+        is_constant, value = self.constant_value(node.operand)
+        if function is None or not is_constant or not isinstance(value, int) or not self.foldable(value):
+            return node
+
+        return self.fold(node, lambda: function(value))
+
+
+def key_helper_expression(function: ast.FunctionDef) -> ast.expr | None:
+    """
+    Get the returned expression of a trivial `mk_*_key` helper, or None if it can't be inlined.
+
+    The helper must be a single return statement using each of its positional arguments exactly once, in the order
+    they are declared, so the arguments are evaluated the same way once inlined.
+    """
+    if not KEY_HELPER_NAME.match(function.name) or function.decorator_list:
+        return None
+
+    arguments = function.args
+    if (arguments.posonlyargs or arguments.kwonlyargs or arguments.defaults
+            or arguments.vararg is not None or arguments.kwarg is not None):
+        return None
+
+    body = function.body
+    if (len(body) > 1
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)):
+        body = body[1:]  # docstring
+    if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+        return None
+
+    expression = body[0].value
+    parameters = [arg.arg for arg in arguments.args]
+    used = [node.id for node in sorted((node for node in ast.walk(expression) if isinstance(node, ast.Name)),
+                                       key=lambda name: (name.lineno, name.col_offset))
+            if node.id in parameters]
+    if used != parameters:
+        return None
+    if any(isinstance(node, (ast.Call, ast.NamedExpr, ast.Lambda)) for node in ast.walk(expression)):
+        return None
+    return expression
+
+
+class ArgumentReplacer(ast.NodeTransformer):
+
+    def __init__(self, arguments: dict[str, ast.expr]):
+        self.arguments = arguments
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in self.arguments:
+            return self.arguments[node.id]
+        return node
+
+
+class KeyHelperInliner(ScopedTransformer):
+    """
+    Replaces the calls to trivial `mk_*_key` helpers by the expression they return, saving a CALL per key.
+
+    Helpers that are not referenced anymore are removed from the module.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.helpers: dict[str, tuple[ast.FunctionDef, ast.expr, set[str]]] = {}
+
+    def visit_Module(self, node: ast.Module) -> ast.AST:
+        for statement in node.body:
+            if isinstance(statement, ast.FunctionDef):
+                expression = key_helper_expression(statement)
+                if expression is not None:
+                    parameters = {arg.arg for arg in statement.args.args}
+                    free_names = {child.id for child in ast.walk(expression)
+                                  if isinstance(child, ast.Name) and child.id not in parameters}
+                    self.helpers[statement.name] = (statement, expression, free_names)
+
+        self.generic_visit(node)
+
+        referenced = {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+        node.body = [statement for statement in node.body
+                     if not (isinstance(statement, ast.FunctionDef)
+                             and statement.name in self.helpers
+                             and statement.name not in referenced)]
+        return node
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        if node.name in self.helpers:
+            return node
+        return super().visit_FunctionDef(node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.func, ast.Name) or node.func.id not in self.helpers or node.func.id in self.scope:
+            return node
+
+        helper, expression, free_names = self.helpers[node.func.id]
+        if (node.keywords
+                or len(node.args) != len(helper.args.args)
+                or any(isinstance(arg, ast.Starred) for arg in node.args)
+                or free_names & self.scope):
+            return node
+
+        arguments = {param.arg: arg for param, arg in zip(helper.args.args, node.args)}
+        inlined = ArgumentReplacer(arguments).visit(copy.deepcopy(expression))
+        return ast.copy_location(inlined, node)
+
+
+def is_assert_helper(function: ast.FunctionDef) -> bool:
+    """
+    Check whether `function` only asserts its first argument with its second one as message, like `expect` does.
+    """
+    arguments = function.args
+    if (function.decorator_list or arguments.posonlyargs or arguments.kwonlyargs or arguments.defaults
+            or arguments.vararg is not None or arguments.kwarg is not None or len(arguments.args) != 2):
+        return False
+
+    body = function.body
+    if len(body) != 1 or not isinstance(body[0], ast.Assert):
+        return False
+    condition, message = arguments.args
+    return (isinstance(body[0].test, ast.Name) and body[0].test.id == condition.arg
+            and isinstance(body[0].msg, ast.Name) and body[0].msg.id == message.arg)
+
+
+class AssertInliner(ScopedTransformer):
+    """
+    Replaces every `expect(condition, message)` statement by `assert condition, message`, so each check compiles to a
+    bare ASSERTMSG instead of a CALL to the helper. The helper and its imports are removed.
+    """
+
+    def visit_Module(self, node: ast.Module) -> ast.AST:
+        body = []
+        for statement in node.body:
+            if isinstance(statement, ast.FunctionDef) and statement.name in ASSERT_FUNCTIONS:
+                if not is_assert_helper(statement):
+                    raise ValueError(f'line {statement.lineno}: `{statement.name}` can only be a bare assertion')
+            else:
+                body.append(statement)
+        node.body = body
+
+        self.generic_visit(node)
+        return node
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> ast.AST | None:
+        node.names = [alias for alias in node.names if alias.name not in ASSERT_FUNCTIONS]
+        if len(node.names) == 0:
+            return None
+        return node
+
+    def visit_Expr(self, node: ast.Expr) -> ast.AST:
+        self.generic_visit(node)
+        call = node.value
+        if (not isinstance(call, ast.Call)
+                or not isinstance(call.func, ast.Name)
+                or call.func.id not in ASSERT_FUNCTIONS
+                or call.func.id in self.scope):
+            return node
+
+        if call.keywords or len(call.args) != 2 or any(isinstance(arg, ast.Starred) for arg in call.args):
+            raise ValueError(f'line {node.lineno}: `{call.func.id}` takes a condition and a message')
+        return ast.copy_location(ast.Assert(test=call.args[0], msg=call.args[1]), node)
+
+
+def inline_assertions_tree(tree: ast.Module) -> ast.Module:
+    tree = AssertInliner().visit(tree)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in ASSERT_FUNCTIONS:
+            raise ValueError(f'line {node.lineno}: `{node.id}` is only inlined when called as a statement')
+    return tree
+
+
+def strip_debug_tree(source: str) -> ast.Module:
+    tree = ast.parse(source)
+    tree = DebugStripper(debug_block_lines(source)).visit(tree)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in DEBUG_FUNCTIONS:
+            raise ValueError(f'line {node.lineno}: `{node.id}` is still referenced after stripping debug calls')
+    return tree
+
+
+def strip_debug(source: str) -> str:
+    """
+    Get the contract source without its debug instrumentation.
+
+    :raise ValueError: raised if the debug markers are unbalanced or if any reference to the debug helpers remains.
+    """
+    tree = strip_debug_tree(source)
+    return ast.unparse(ast.fix_missing_locations(tree)) + '\n'
+
+
+def transform(source: str) -> str:
+    """
+    Get the release version of a contract source: debug instrumentation stripped, `expect` calls turned into
+    assertions, constant expressions folded and trivial key helpers inlined.
+
+    :raise ValueError: raised if the debug markers are unbalanced, if any reference to the debug helpers remains or if
+        `expect` is used other than as a statement.
+    """
+    tree = strip_debug_tree(source)
+    tree = inline_assertions_tree(tree)
+    tree = ConstantFolder().visit(tree)
+    tree = KeyHelperInliner().visit(tree)
+    return ast.unparse(ast.fix_missing_locations(tree)) + '\n'
+
+
+def preprocess_contract(path: str) -> str:
+    """
+    Get the release source of the contract at `path`.
+    """
+    with open(path) as contract_file:
+        return transform(contract_file.read())
+
+
+def imported_modules(source: str, search_path: list[str]) -> list[str]:
+    """
+    Get the paths of the local modules imported by `source`, looked up in `search_path` like the compiler does.
+
+    Only top level modules are looked up, the other imports are left to the compiler.
+    """
+    names = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+            names.append(node.module)
+        elif isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+
+    paths = []
+    for name in names:
+        if '.' in name:
+            continue
+        for folder in search_path:
+            path = os.path.join(folder, name + '.py')
+            if os.path.isfile(path):
+                if path not in paths:
+                    paths.append(path)
+                break
+    return paths
+
+
+def contract_sources(path: str, release: bool = True) -> dict[str, str]:
+    """
+    Get the source of the contract at `path` and of every local module it imports, keyed by file name, the contract
+    first. Modules are looked up in the contract folder, then in `CONTRACTS_DIR`.
+
+    :param release: whether the release sources are returned, instead of the sources as they are
+    """
+    search_path = [os.path.dirname(os.path.abspath(path)), CONTRACTS_DIR]
+    sources: dict[str, str] = {}
+    pending = [path]
+    while len(pending) > 0:
+        module_path = pending.pop(0)
+        file_name = os.path.basename(module_path)
+        if file_name in sources:
+            continue
+
+        with open(module_path) as module_file:
+            source = module_file.read()
+        sources[file_name] = transform(source) if release else source
+        pending.extend(imported_modules(source, search_path))
+    return sources
+
+
+def write_sources(sources: dict[str, str], build_dir: str) -> str:
+    """
+    Write the sources returned by `contract_sources` into `build_dir`, side by side so the compiler finds the modules
+    next to the contract.
+
+    :return: the path of the contract
+    """
+    paths = []
+    for file_name, source in sources.items():
+        paths.append(os.path.join(build_dir, file_name))
+        with open(paths[-1], 'w') as source_file:
+            source_file.write(source)
+    return paths[0]
+
+
+def write_contract(path: str, build_dir: str) -> str:
+    """
+    Write the release source of the contract at `path` and of the modules it imports into `build_dir`, keeping their
+    file names so the compiled contract keeps its name. The source tree is left untouched.
+
+    :return: the path of the preprocessed contract
+    """
+    return write_sources(contract_sources(path), build_dir)
@@ -0,0 +1,377 @@
+import hashlib
+import json
+import os
+import sys
+
+from neo3.api.helpers import unwrap
+from neo3.contracts.contract import CONTRACT_HASHES
+from neo3.contracts.manifest import ContractManifest
+from neo3.core import types
+from neo3.network.payloads.verification import Signer
+from neo3.wallet import account
+from neo3.wallet.utils import script_hash_to_address
+
+from boa3.internal.neo.vm.type.String import String
+from deploy_fee import DEPLOY_SYSTEM_FEE, DeployFeeTestCase
+from gas_bench import GasBenchmarkCase
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metadata
+
+
+def make_meta(size: int) -> bytes:
+    meta = '{"name": "NEP11", "description": "", "image": "{some image URI}"}'
+    padding = max(size - len(meta), 0)
+    return bytes(meta.replace('""', '"' + 'x' * padding + '"', 1), 'utf-8')
+
+
+def make_nft_meta(attributes: int) -> bytes:
+    meta = {
+        'name': 'Ghost #12',
+        'description': 'A ghost of the GhostMarket collection',
+        'image': 'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12.png',
+        'external_url': 'https://ghostmarket.io/asset/n3/ghost/12',
+        'attributes': [{'trait_type': f'Trait {i}', 'value': f'Value {i}'} for i in range(attributes)],
+    }
+    return bytes(json.dumps(meta), 'utf-8')
+
+
+def make_royalties(count: int) -> bytes:
+    if count == 0:
+        return b''
+    royalties = [
+        {"address": script_hash_to_address(types.UInt160(bytes([i + 1]) * 20)), "value": 100}
+        for i in range(count)
+    ]
+    return bytes(json.dumps(royalties), 'utf-8')
+
+
+class BenchGHOST(GasBenchmarkCase, DeployFeeTestCase):
+    CONTRACT_NAME = 'GhostMarketNFT'
+    REPORT_NAME = 'ghost'
+
+    META_SIZES = [128, 512, 896]
+    ROYALTY_COUNTS = [0, 1, 5, 10]
+    BATCH_SIZES = [1, 5, 20]
+
+    TOKEN_META = make_meta(128)
+    TOKEN_LOCKED = bytes('lockedContent', 'utf-8')
+
+    owner: account.Account
+    account1: account.Account
+    account2: account.Account
+
+    META_TOKENS: dict[int, bytes]
+    ROYALTY_TOKENS: dict[int, bytes]
+
+    @classmethod
+    def setupTestCase(cls):
+        cls.owner = cls.node.wallet.account_new(label='owner', password='123')
+        cls.account1 = cls.node.wallet.account_new(label='test1', password='123')
+        cls.account2 = cls.node.wallet.account_new(label='test2', password='123')
+
+        super().setupTestCase()
+
+    @classmethod
+    async def asyncSetupClass(cls) -> None:
+        await super().asyncSetupClass()
+
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.owner.script_hash, 1000)
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account1.script_hash, 1000)
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account2.script_hash, 100)
+
+        await cls.set_up_contract('..', 'contracts/NEP11', 'GhostMarketNFT.py', signing_account=cls.owner)
+
+        cls.META_TOKENS = {}
+        for size in cls.META_SIZES:
+            cls.META_TOKENS[size] = await cls.mint_token(cls.owner, make_meta(size), make_royalties(1))
+
+        cls.ROYALTY_TOKENS = {}
+        for count in cls.ROYALTY_COUNTS:
+            cls.ROYALTY_TOKENS[count] = await cls.mint_token(cls.owner, cls.TOKEN_META, make_royalties(count))
+
+    @classmethod
+    async def mint_token(cls, minter: account.Account, meta: bytes, royalties: bytes, locked: bytes = None) -> bytes:
+        if locked is None:
+            locked = cls.TOKEN_LOCKED
+        result, _ = await cls.call(
+            'mint',
+            [minter.script_hash, meta, locked, royalties],
+            return_type=bytes,
+            signing_accounts=[minter]
+        )
+        return result
+
+    async def test_bench_read_methods(self):
+        token = self.ROYALTY_TOKENS[1]
+
+        await self.measure('symbol')
+        await self.measure('decimals')
+        await self.measure('totalSupply')
+        await self.measure('balanceOf', [self.owner.script_hash])
+        await self.measure('tokensOf', [self.owner.script_hash])
+        await self.measure('tokens')
+        await self.measure('tokensOfPaged', [self.owner.script_hash, b'', 10])
+        await self.measure('tokensPaged', [b'', 10])
+        await self.measure('tokensByCreator', [self.owner.script_hash, b'', 10])
+        await self.measure('ownerOf', [token])
+        await self.measure('getLockedContentViewCount', [token])
+        await self.measure('getAuthorizedAddress')
+        await self.measure('verify')
+        await self.measure('verify', case='authorized', signers=[Signer(self.owner.script_hash)])
+        await self.measure('isPaused')
+
+    async def test_bench_properties(self):
+        for size, token in self.META_TOKENS.items():
+            case = f'meta={size}'
+            await self.measure('properties', [token], case=case, params={'meta': size})
+            await self.measure('propertiesJson', [token], case=case, params={'meta': size})
+
+    async def test_bench_royalties(self):
+        sale_price = 10_000_000
+        for count, token in self.ROYALTY_TOKENS.items():
+            case = f'royalties={count}'
+            await self.measure('getRoyalties', [token], case=case, params={'royalties': count})
+            await self.measure(
+                'royaltyInfo', [token, CONTRACT_HASHES.GAS_TOKEN, sale_price],
+                case=case, params={'royalties': count}
+            )
+
+    async def test_bench_read_many(self):
+        tokens = [*self.META_TOKENS.values(), *self.ROYALTY_TOKENS.values()]
+        sale_price = 10_000_000
+        for batch in [1, len(tokens)]:
+            case = f'batch={batch}'
+            await self.measure('ownerOfMany', [tokens[:batch]], case=case, params={'batch': batch})
+            await self.measure('propertiesMany', [tokens[:batch]], case=case, params={'batch': batch})
+            await self.measure(
+                'royaltyInfoMany', [tokens[:batch], CONTRACT_HASHES.GAS_TOKEN, [sale_price] * batch],
+                case=case, params={'batch': batch}
+            )
+
+    async def test_bench_mint(self):
+        for size in self.META_SIZES:
+            await self.measure(
+                'mint',
+                [self.owner.script_hash, make_meta(size), self.TOKEN_LOCKED, make_royalties(1)],
+                case=f'meta={size},royalties=1',
+                params={'meta': size, 'royalties': 1},
+                signing_accounts=[self.owner]
+            )
+
+        for count in self.ROYALTY_COUNTS:
+            await self.measure(
+                'mint',
+                [self.owner.script_hash, self.TOKEN_META, self.TOKEN_LOCKED, make_royalties(count)],
+                case=f'meta=128,royalties={count}',
+                params={'meta': 128, 'royalties': count},
+                signing_accounts=[self.owner]
+            )
+
+        await self.measure(
+            'mint',
+            [self.owner.script_hash, self.TOKEN_META, b'', b''],
+            case='meta=128,royalties=0,locked=0',
+            params={'meta': 128, 'royalties': 0, 'locked': 0},
+            signing_accounts=[self.owner]
+        )
+
+    async def test_bench_multi_mint_and_multi_burn(self):
+        for batch in self.BATCH_SIZES:
+            case = f'batch={batch}'
+            execution = await self.measure(
+                'multiMint',
+                [
+                    self.account1.script_hash,
+                    [self.TOKEN_META] * batch,
+                    [self.TOKEN_LOCKED] * batch,
+                    [make_royalties(1)] * batch
+                ],
+                case=case,
+                params={'batch': batch},
+                signing_accounts=[self.account1]
+            )
+            tokens = [item.as_bytes() for item in unwrap.as_list(execution)]
+            self.assertEqual(batch, len(tokens))
+
+            await self.measure(
+                'multiBurn',
+                [tokens],
+                case=case,
+                params={'batch': batch},
+                signing_accounts=[self.account1]
+            )
+
+    async def test_bench_collections(self):
+        batch = self.BATCH_SIZES[-1]
+        shared_meta = make_meta(512)
+        token_meta = [bytes(json.dumps({'edition': str(i + 1)}), 'utf-8') for i in range(batch)]
+
+        execution = await self.measure(
+            'createCollection', [self.owner.script_hash, shared_meta],
+            case='meta=512', params={'meta': 512},
+            signing_accounts=[self.owner]
+        )
+        collection_id = unwrap.as_bytes(execution)
+
+        # the same tokens, minted with their full metadata or in a collection sharing most of it
+        full_meta = [
+            bytes(json.dumps({**json.loads(shared_meta), **json.loads(meta)}), 'utf-8') for meta in token_meta
+        ]
+        await self.measure(
+            'multiMint',
+            [self.owner.script_hash, full_meta, [b''] * batch, [b''] * batch],
+            case=f'batch={batch},meta=512,royalties=0,locked=0',
+            params={'batch': batch, 'meta': 512},
+            signing_accounts=[self.owner]
+        )
+        execution = await self.measure(
+            'multiMintInCollection',
+            [collection_id, token_meta, [b''] * batch, [b''] * batch],
+            case=f'batch={batch},meta=512,royalties=0,locked=0',
+            params={'batch': batch, 'meta': 512},
+            signing_accounts=[self.owner]
+        )
+        token = unwrap.as_list(execution)[0].as_bytes()
+
+        await self.measure('properties', [token], case='collection,meta=512', params={'meta': 512})
+        await self.measure('propertiesJson', [token], case='collection,meta=512', params={'meta': 512})
+
+    async def test_bench_compressed_meta(self):
+        for attributes in [0, 5]:
+            meta = make_nft_meta(attributes)
+            for compressed in [False, True]:
+                minted_meta = metadata.mint_meta(meta) if compressed else meta
+                case = f'nft,attributes={attributes}' + (',compressed' if compressed else '')
+                params = {'meta': len(meta), 'attributes': attributes, 'stored': len(minted_meta)}
+                execution = await self.measure(
+                    'mint',
+                    [self.owner.script_hash, minted_meta, b'', b''],
+                    case=case,
+                    params=params,
+                    signing_accounts=[self.owner]
+                )
+                token = unwrap.as_bytes(execution)
+                await self.measure('properties', [token], case=case, params=params)
+                await self.measure('propertiesJson', [token], case=case, params=params)
+
+    async def test_bench_mint_uri(self):
+        meta = make_nft_meta(5)
+        token_uri = b'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12'
+        params = {'meta': len(meta), 'uri': len(token_uri)}
+        execution = await self.measure(
+            'mintUri',
+            [self.owner.script_hash, token_uri, hashlib.sha256(meta).digest(), b'', b''],
+            case='nft,attributes=5',
+            params=params,
+            signing_accounts=[self.owner]
+        )
+        token = unwrap.as_bytes(execution)
+        await self.measure('properties', [token], case='uri', params=params)
+        await self.measure('propertiesJson', [token], case='uri', params=params)
+
+    async def test_bench_multi_transfer(self):
+        # the tokens are sent to an account no other benchmark uses, so their costs are unchanged
+        receiver = types.UInt160(b'\x7f' * 20)
+        for batch in self.BATCH_SIZES:
+            execution = await self.measure(
+                'multiMint',
+                [self.account1.script_hash, [self.TOKEN_META] * batch, [b''] * batch, [b''] * batch],
+                case=f'batch={batch},royalties=0,locked=0',
+                params={'batch': batch},
+                signing_accounts=[self.account1]
+            )
+            tokens = [item.as_bytes() for item in unwrap.as_list(execution)]
+
+            await self.measure(
+                'multiTransfer',
+                [[receiver] * batch, tokens, None],
+                case=f'batch={batch}',
+                params={'batch': batch},
+                signing_accounts=[self.account1]
+            )
+
+    async def test_bench_transfer_and_burn(self):
+        token = await self.mint_token(self.account1, self.TOKEN_META, make_royalties(1))
+
+        await self.measure(
+            'transfer',
+            [self.account2.script_hash, token, None],
+            signing_accounts=[self.account1]
+        )
+        await self.measure(
+            'transfer',
+            [self.account2.script_hash, token, None],
+            case='self',
+            signing_accounts=[self.account2]
+        )
+        await self.measure('getLockedContent', [token], signing_accounts=[self.account2])
+        await self.measure('burn', [token], signing_accounts=[self.account2])
+
+        token = await self.mint_token(self.account1, self.TOKEN_META, b'', locked=b'')
+        await self.measure('burn', [token], case='royalties=0,locked=0', signing_accounts=[self.account1])
+
+    async def test_bench_ordered_token_ids(self):
+        # a contract of its own, so the other benchmarks keep minting with the default token ids
+        contract_hash = await self.compile_and_deploy(
+            '..', 'contracts/NEP11', 'GhostMarketNFT.py',
+            signing_account=self.account1
+        )
+        await self.measure('enableOrderedTokenIds', target_contract=contract_hash, signing_accounts=[self.account1])
+
+        await self.measure(
+            'mint',
+            [self.account1.script_hash, self.TOKEN_META, b'', b''],
+            case='ordered,meta=128,royalties=0,locked=0',
+            params={'meta': 128, 'royalties': 0, 'locked': 0},
+            target_contract=contract_hash,
+            signing_accounts=[self.account1]
+        )
+        batch = self.BATCH_SIZES[-1]
+        execution = await self.measure(
+            'multiMint',
+            [self.account1.script_hash, [self.TOKEN_META] * batch, [b''] * batch, [b''] * batch],
+            case=f'ordered,batch={batch},royalties=0,locked=0',
+            params={'batch': batch},
+            target_contract=contract_hash,
+            signing_accounts=[self.account1]
+        )
+        tokens = [item.as_bytes() for item in unwrap.as_list(execution)]
+
+        for limit in [1, 10]:
+            await self.measure(
+                'tokensSince', [tokens[0], limit],
+                case=f'limit={limit}',
+                params={'limit': limit},
+                target_contract=contract_hash
+            )
+
+    async def test_bench_admin(self):
+        await self.measure('setAuthorizedAddress', [self.account1.script_hash, True], case='add',
+                           signing_accounts=[self.owner])
+        await self.measure('setAuthorizedAddress', [self.account1.script_hash, False], case='remove',
+                           signing_accounts=[self.owner])
+        await self.measure('updatePause', [True], case='pause', signing_accounts=[self.owner])
+        await self.measure('updatePause', [False], case='unpause', signing_accounts=[self.owner])
+
+    async def test_bench_update_and_destroy(self):
+        path = self.get_contract_path('..', 'contracts/NEP11', 'GhostMarketNFT.py')
+        new_nef, new_manifest = self.get_serialized_output(path)
+        # sent like neo-cli does, parsed and serialized again without the compiler specific fields
+        arg_manifest = String(
+            json.dumps(ContractManifest.from_json(new_manifest).to_json(), separators=(',', ':'))
+        ).to_bytes()
+
+        await self.measure(
+            'update',
+            [new_nef, arg_manifest],
+            signing_accounts=[self.owner],
+            system_fee=DEPLOY_SYSTEM_FEE
+        )
+
+        contract_hash = await self.compile_and_deploy(
+            '..', 'contracts/NEP11', 'GhostMarketNFT.py',
+            signing_account=self.account2
+        )
+        await self.measure('destroy', target_contract=contract_hash, signing_accounts=[self.account2])
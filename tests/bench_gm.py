@@ -0,0 +1,126 @@
+import json
+
+from neo3.contracts.contract import CONTRACT_HASHES
+from neo3.contracts.manifest import ContractManifest
+from neo3.core import types
+from neo3.wallet import account
+
+from boa3.internal.neo.vm.type.String import String
+from gas_bench import GasBenchmarkCase
+
+
+class BenchGM(GasBenchmarkCase):
+    CONTRACT_NAME = 'GhostMarketToken'
+    REPORT_NAME = 'gm'
+
+    DECIMALS = 8
+    AMOUNT = 10 * 10 ** DECIMALS
+    BATCH_SIZES = [1, 5, 20]
+
+    owner: account.Account
+    account1: account.Account
+    account2: account.Account
+    account3: account.Account
+
+    @classmethod
+    def setupTestCase(cls):
+        cls.owner = cls.node.wallet.account_new(label='owner', password='123')
+        cls.account1 = cls.node.wallet.account_new(label='test1', password='123')
+        cls.account2 = cls.node.wallet.account_new(label='test2', password='123')
+        cls.account3 = cls.node.wallet.account_new(label='test3', password='123')
+
+        super().setupTestCase()
+
+    @classmethod
+    async def asyncSetupClass(cls) -> None:
+        await super().asyncSetupClass()
+
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.owner.script_hash, 100)
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account1.script_hash, 100)
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account2.script_hash, 100)
+
+        await cls.set_up_contract('..', 'contracts/NEP17', 'GhostMarketToken.py', signing_account=cls.owner)
+
+    async def test_bench_read_methods(self):
+        await self.measure('symbol')
+        await self.measure('decimals')
+        await self.measure('totalSupply')
+        await self.measure('balanceOf', [self.owner.script_hash])
+        await self.measure('allowance', [self.owner.script_hash, self.account1.script_hash])
+        await self.measure('getAuthorizedAddress')
+        await self.measure('isPaused')
+
+    async def test_bench_transfer(self):
+        await self.measure(
+            'transfer',
+            [self.owner.script_hash, self.account1.script_hash, self.AMOUNT, None],
+            case='new_recipient',
+            signing_accounts=[self.owner]
+        )
+        await self.measure(
+            'transfer',
+            [self.owner.script_hash, self.account1.script_hash, self.AMOUNT, None],
+            case='existing_recipient',
+            signing_accounts=[self.owner]
+        )
+        await self.measure(
+            'transfer',
+            [self.account1.script_hash, self.account2.script_hash, self.AMOUNT, None],
+            case='full_balance',
+            signing_accounts=[self.account1]
+        )
+        await self.measure(
+            'transfer',
+            [self.owner.script_hash, self.owner.script_hash, self.AMOUNT, None],
+            case='self',
+            signing_accounts=[self.owner]
+        )
+
+    async def test_bench_multi_transfer(self):
+        for batch in self.BATCH_SIZES:
+            # new recipients for every batch, that no other benchmark uses
+            recipients = [types.UInt160(bytes([batch, i + 1]) * 10) for i in range(batch)]
+            await self.measure(
+                'multiTransfer',
+                [self.owner.script_hash, [[recipient, self.AMOUNT] for recipient in recipients], None],
+                case=f'batch={batch}',
+                params={'batch': batch},
+                signing_accounts=[self.owner]
+            )
+
+    async def test_bench_transfer_from(self):
+        await self.measure(
+            'approve',
+            [self.owner.script_hash, self.account2.script_hash, 2 * self.AMOUNT],
+            signing_accounts=[self.owner]
+        )
+        await self.measure(
+            'transferFrom',
+            [self.account2.script_hash, self.owner.script_hash, self.account3.script_hash, self.AMOUNT, None],
+            case='partial_allowance',
+            signing_accounts=[self.account2]
+        )
+        await self.measure(
+            'transferFrom',
+            [self.account2.script_hash, self.owner.script_hash, self.account3.script_hash, self.AMOUNT, None],
+            case='full_allowance',
+            signing_accounts=[self.account2]
+        )
+
+    async def test_bench_admin(self):
+        await self.measure('setAuthorizedAddress', [self.account1.script_hash, True], case='add',
+                           signing_accounts=[self.owner])
+        await self.measure('setAuthorizedAddress', [self.account1.script_hash, False], case='remove',
+                           signing_accounts=[self.owner])
+        await self.measure('updatePause', [True], case='pause', signing_accounts=[self.owner])
+        await self.measure('updatePause', [False], case='unpause', signing_accounts=[self.owner])
+
+    async def test_bench_update(self):
+        path = self.get_contract_path('..', 'contracts/NEP17', 'GhostMarketToken.py')
+        new_nef, new_manifest = self.get_serialized_output(path)
+        # sent like neo-cli does, parsed and serialized again without the compiler specific fields
+        arg_manifest = String(
+            json.dumps(ContractManifest.from_json(new_manifest).to_json(), separators=(',', ':'))
+        ).to_bytes()
+
+        await self.measure('update', [new_nef, arg_manifest], signing_accounts=[self.owner])
@@ -0,0 +1,66 @@
+import pathlib
+from typing import Optional
+
+from neo3.api import noderpc
+from neo3.api.helpers.signing import sign_insecure_with_account
+from neo3.api.wrappers import GenericContract
+from neo3.contracts import manifest, nef
+from neo3.core import types
+from neo3.network.payloads.verification import Signer
+from neo3.wallet import account
+
+from boa3_test.tests import boatestcase
+
+
+# The test node computes system fees with test invocations, capped at 15 GAS (`MaxGasInvoke` of the boaconstructor
+# node), while deploying or updating the NFT costs about 1 GAS per KB of nef and manifest. neo-cli caps the test
+# invocation of `deploy` and `update` at 20 GAS, which is the system fee these transactions are sent with instead.
+DEPLOY_SYSTEM_FEE = 20_00000000
+
+
+class DeployFeeTestCase(boatestcase.BoaTestCase):
+    """
+    Test case deploying and updating contracts with DEPLOY_SYSTEM_FEE, instead of the system fee the test node computes.
+    """
+
+    @classmethod
+    async def deploy(cls, path_to_nef: str, signing_account: account.Account) -> types.UInt160:
+        nef_path = pathlib.Path(path_to_nef)
+        contract_nef = nef.NEF.from_file(str(nef_path))
+        contract_manifest = manifest.ContractManifest.from_file(str(nef_path.with_suffix('.manifest.json')))
+
+        receipt = await cls.node.facade.invoke(
+            GenericContract.deploy(contract_nef, contract_manifest),
+            signers=[cls.signing_pair(signing_account)],
+            system_fee=DEPLOY_SYSTEM_FEE
+        )
+        cls._check_vmstate(receipt)
+        cls.deployed_contracts[contract_manifest.name] = receipt.result
+        return receipt.result
+
+    @classmethod
+    async def update_contract(
+            cls,
+            script: bytes,
+            contract_manifest: bytes,
+            signing_account: account.Account,
+            target_contract: Optional[types.UInt160] = None
+    ) -> list[noderpc.Notification]:
+        """
+        Call `update` on the contract under test, or `target_contract`.
+
+        :return: the notifications of the update
+        """
+        contract_hash = cls.contract_hash if target_contract is None else target_contract
+        receipt = await cls.node.facade.invoke(
+            GenericContract(contract_hash).call_function('update', [script, contract_manifest]),
+            signers=[cls.signing_pair(signing_account)],
+            system_fee=DEPLOY_SYSTEM_FEE
+        )
+        execution = receipt.result
+        cls._check_vmstate(execution)
+        return execution.notifications
+
+    @staticmethod
+    def signing_pair(signing_account: account.Account):
+        return sign_insecure_with_account(signing_account, password='123'), Signer(signing_account.script_hash)
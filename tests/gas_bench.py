@@ -0,0 +1,125 @@
+import json
+import os
+from typing import Any, Optional, Sequence
+
+from neo3.api import noderpc
+from neo3.api.helpers.signing import sign_insecure_with_account
+from neo3.api.wrappers import GenericContract
+from neo3.core import types
+from neo3.network.payloads.verification import Signer
+from neo3.wallet import account
+
+from boa3_test.tests import boatestcase
+
+
+REPORT_DIR = os.environ.get('GAS_REPORT_DIR', os.path.dirname(os.path.abspath(__file__)))
+
+
+def storage_size(storage: dict[bytes, bytes]) -> int:
+    return sum(len(key) + len(value) for key, value in storage.items())
+
+
+def storage_written(before: dict[bytes, bytes], after: dict[bytes, bytes]) -> int:
+    """
+    Bytes (key + value) of every storage entry created or modified by an invocation.
+    """
+    return sum(len(key) + len(value) for key, value in after.items() if before.get(key) != value)
+
+
+def result_key(method: str, case: str) -> str:
+    return f'{method}[{case}]' if case else method
+
+
+def report_path(report_name: str) -> str:
+    return os.path.join(REPORT_DIR, f'gas_report_{report_name}.json')
+
+
+class GasBenchmarkCase(boatestcase.BoaTestCase):
+    """
+    Test case recording the GAS consumed and the storage written by each measured contract call.
+
+    Results are written as a json report named after `REPORT_NAME` once the test class is done.
+    """
+    CONTRACT_NAME: str
+    REPORT_NAME: str
+
+    results: dict[str, dict[str, Any]]
+
+    @classmethod
+    def setupTestCase(cls):
+        cls.results = {}
+        super().setupTestCase()
+
+    @classmethod
+    def tearDownClass(cls):
+        report = {
+            'contract': cls.CONTRACT_NAME,
+            'results': dict(sorted(cls.results.items())),
+        }
+        with open(report_path(cls.REPORT_NAME), 'w') as report_file:
+            json.dump(report, report_file, indent=4)
+            report_file.write('\n')
+
+        super().tearDownClass()
+
+    @classmethod
+    async def measure(
+            cls,
+            method: str,
+            args: Optional[list] = None,
+            *,
+            case: str = '',
+            params: Optional[dict[str, Any]] = None,
+            signing_accounts: Optional[Sequence[account.Account]] = None,
+            signers: Optional[Sequence[Signer]] = None,
+            target_contract: Optional[types.UInt160] = None,
+            system_fee: int = 0,
+    ) -> noderpc.ExecutionResult:
+        """
+        Invokes `method` and records its cost under `method[case]`.
+
+        Without signing accounts the call is a test invoke, which doesn't persist any storage. A `system_fee` other
+        than zero is sent as is, instead of the fee computed by test invoking the call first.
+
+        :return: the raw execution result, to be unwrapped by the caller
+        """
+        contract_hash = cls.contract_hash if target_contract is None else target_contract
+        contract = GenericContract(contract_hash)
+
+        if signing_accounts is None:
+            execution = await cls.node.facade.test_invoke_raw(contract.call_function(method, args), signers=signers)
+            written = 0
+            delta = 0
+        else:
+            before = await cls.get_storage(target_contract=contract_hash)
+
+            signing_pairs = []
+            for i, signing_account in enumerate(signing_accounts):
+                signer = Signer(signing_account.script_hash) if signers is None else signers[i]
+                signing_pairs.append((sign_insecure_with_account(signing_account, password='123'), signer))
+
+            receipt = await cls.node.facade.invoke(
+                contract.call_function(method, args),
+                signers=signing_pairs,
+                system_fee=system_fee
+            )
+            execution = receipt.result
+
+            try:
+                after = await cls.get_storage(target_contract=contract_hash)
+            except noderpc.JsonRpcError:
+                # the contract was destroyed along with its storage
+                after = {}
+            written = storage_written(before, after)
+            delta = storage_size(after) - storage_size(before)
+
+        cls._check_vmstate(execution)
+
+        cls.results[result_key(method, case)] = {
+            'method': method,
+            'params': params if params is not None else {},
+            'gas': execution.gas_consumed,
+            'storage_written': written,
+            'storage_delta': delta,
+        }
+        return execution
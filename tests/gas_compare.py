@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Compares the GAS benchmark reports against the committed baseline.
+
+Fails when the GAS consumed or the storage written by a method grows past the threshold, or when a method of the
+baseline is missing from the reports.
+
+    python3 gas_compare.py                  # compare gas_report_*.json to gas_baseline.json
+    python3 gas_compare.py --threshold 2.5  # allow up to 2.5% growth
+    python3 gas_compare.py --allow-missing  # only print the methods of the baseline missing from the reports
+    python3 gas_compare.py --update         # overwrite the baseline with the current reports
+"""
+
+import argparse
+import json
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.environ.get('GAS_REPORT_DIR', TESTS_DIR)
+BASELINE_PATH = os.path.join(TESTS_DIR, 'gas_baseline.json')
+REPORT_NAMES = ['ghost', 'gm']
+
+METRICS = ['gas', 'storage_written']
+
+
+def load_reports(names: list[str]) -> dict[str, dict[str, dict]]:
+    reports = {}
+    for name in names:
+        with open(os.path.join(REPORT_DIR, f'gas_report_{name}.json')) as report_file:
+            report = json.load(report_file)
+        reports[report['contract']] = report['results']
+    return reports
+
+
+def load_baseline(path: str) -> dict[str, dict[str, dict]]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path: str, reports: dict[str, dict[str, dict]]):
+    baseline = {}
+    for contract, results in sorted(reports.items()):
+        baseline[contract] = {
+            key: {metric: result[metric] for metric in METRICS}
+            for key, result in sorted(results.items())
+        }
+    with open(path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent=4)
+        baseline_file.write('\n')
+
+
+def grown_past(old: int, new: int, threshold: float) -> bool:
+    if new <= old:
+        return False
+    if old == 0:
+        return True
+    return (new - old) * 100 / old > threshold
+
+
+def compare(baseline: dict[str, dict[str, dict]], reports: dict[str, dict[str, dict]],
+            threshold: float) -> tuple[list[str], list[str]]:
+    """
+    Prints the per-method diffs and returns the entries that regressed and the entries missing from the reports.
+    """
+    regressions = []
+    missing = []
+    for contract, results in sorted(reports.items()):
+        expected = baseline.get(contract, {})
+        print(f'{contract}')
+
+        for key, result in sorted(results.items()):
+            if key not in expected:
+                print(f'  {key:<48} new: ' + ', '.join(f'{metric}={result[metric]}' for metric in METRICS))
+                continue
+
+            diffs = []
+            regressed = False
+            for metric in METRICS:
+                old = expected[key][metric]
+                new = result[metric]
+                if old != new:
+                    percent = f'{(new - old) * 100 / old:+.2f}%' if old != 0 else 'n/a'
+                    diffs.append(f'{metric} {old} -> {new} ({percent})')
+                if grown_past(old, new, threshold):
+                    regressed = True
+
+            if regressed:
+                regressions.append(f'{contract}.{key}')
+            status = 'REGRESSION' if regressed else ('changed' if diffs else 'ok')
+            print(f'  {key:<48} {status}' + (': ' + ', '.join(diffs) if diffs else ''))
+
+        for key in sorted(set(expected) - set(results)):
+            missing.append(f'{contract}.{key}')
+            print(f'  {key:<48} missing from report')
+
+    return regressions, missing
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare GAS benchmark reports against the stored baseline.')
+    parser.add_argument('reports', nargs='*', default=REPORT_NAMES,
+                        help='report names to compare, as in gas_report_<name>.json (default: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline file (default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=float(os.environ.get('GAS_THRESHOLD', 1.0)),
+                        help='allowed growth of gas and storage written, in percent (default: %(default)s)')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help="don't fail when methods of the baseline are missing from the reports")
+    parser.add_argument('--update', action='store_true', help='overwrite the baseline with the current reports')
+    args = parser.parse_args()
+
+    reports = load_reports(args.reports)
+
+    if args.update:
+        baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else {}
+        baseline.update(reports)
+        save_baseline(args.baseline, baseline)
+        print(f'baseline updated: {args.baseline}')
+        return 0
+
+    regressions, missing = compare(load_baseline(args.baseline), reports, args.threshold)
+    failed = False
+    if regressions:
+        print(f'\n{len(regressions)} method(s) grew more than {args.threshold}%:')
+        for regression in regressions:
+            print(f'  {regression}')
+        failed = True
+    if missing and not args.allow_missing:
+        print(f'\n{len(missing)} method(s) of the baseline missing from the reports:')
+        for key in missing:
+            print(f'  {key}')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+import ast
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from boa3.internal.neo.contracts.neffile import NefFile
+from boa3.internal.neo.vm.opcode.Opcode import Opcode
+from boa3.internal.neo.vm.opcode.OpcodeInfo import OpcodeInfo
+
+GHOST_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(GHOST_ROOT)
+
+import build
+import compile_cache
+import preprocess
+
+
+def syscall_hash(name: str) -> bytes:
+    return hashlib.sha256(name.encode()).digest()[:4]
+
+
+def disassemble(script: bytes) -> list[tuple[Opcode, bytes]]:
+    instructions = []
+    address = 0
+    while address < len(script):
+        opcode = Opcode(script[address:address + 1])
+        info = OpcodeInfo.get_info(opcode)
+        address += 1
+
+        if info.max_data_len > info.data_len:
+            # variable size operand, prefixed by its length
+            operand_size = int.from_bytes(script[address:address + info.data_len], 'little')
+            address += info.data_len
+        else:
+            operand_size = info.data_len
+
+        instructions.append((opcode, script[address:address + operand_size]))
+        address += operand_size
+    return instructions
+
+
+class TestBuild(unittest.TestCase):
+    CONTRACTS = [
+        ('contracts/NEP11', 'GhostMarketNFT.py'),
+        ('contracts/NEP17', 'GhostMarketToken.py'),
+    ]
+
+    def compile_release(self, folder: str, name: str) -> tuple[bytes, dict]:
+        with tempfile.TemporaryDirectory() as build_dir:
+            nef_path = os.path.join(build_dir, name.replace('.py', '.nef'))
+            build.build_contract(os.path.join(GHOST_ROOT, folder, name), nef_path, use_cache=False)
+
+            with open(nef_path, 'rb') as nef:
+                script = NefFile.deserialize(nef.read()).script
+            with open(nef_path.replace('.nef', '.manifest.json')) as manifest:
+                return script, json.load(manifest)
+
+    def test_release_build_has_no_debug_instrumentation(self):
+        get_call_flags = syscall_hash('System.Contract.GetCallFlags')
+
+        for folder, name in self.CONTRACTS:
+            with self.subTest(contract=name):
+                script, manifest = self.compile_release(folder, name)
+
+                events = [event['name'] for event in manifest['abi']['events']]
+                self.assertNotIn('Debug', events)
+
+                instructions = disassemble(script)
+                for opcode, operand in instructions:
+                    if opcode is Opcode.SYSCALL:
+                        self.assertNotEqual(get_call_flags, operand)
+                    elif opcode in (Opcode.PUSHDATA1, Opcode.PUSHDATA2, Opcode.PUSHDATA4):
+                        self.assertNotEqual(b'Debug', operand)
+
+                # every `expect` is compiled to a bare ASSERTMSG, without a call to a helper
+                sources = preprocess.contract_sources(os.path.join(GHOST_ROOT, folder, name))
+                nodes = [node for source in sources.values() for node in ast.walk(ast.parse(source))]
+                self.assertNotIn('expect', [node.id for node in nodes if isinstance(node, ast.Name)])
+                self.assertEqual(len([node for node in nodes if isinstance(node, ast.Assert)]),
+                                 [opcode for opcode, _ in instructions].count(Opcode.ASSERTMSG))
+
+    def test_discover_contracts(self):
+        contracts = [os.path.relpath(path, GHOST_ROOT) for path in build.discover_contracts()]
+        self.assertEqual([os.path.join(folder, name) for folder, name in self.CONTRACTS], contracts)
+
+    def test_compile_cache(self):
+        key = compile_cache.cache_key('source', 'Contract.py', 'mainnet', False)
+        self.assertNotEqual(key, compile_cache.cache_key('changed', 'Contract.py', 'mainnet', False))
+        self.assertNotEqual(key, compile_cache.cache_key('source', 'Other.py', 'mainnet', False))
+        self.assertNotEqual(key, compile_cache.cache_key('source', 'Contract.py', 'testnet', False))
+        self.assertNotEqual(key, compile_cache.cache_key('source', 'Contract.py', 'mainnet', True))
+        self.assertNotEqual(key, compile_cache.cache_key('source', 'Contract.py', 'mainnet', False,
+                                                         modules={'module.py': 'module source'}))
+
+        with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as output_dir:
+            nef_path = os.path.join(output_dir, 'Contract.nef')
+            self.assertFalse(compile_cache.lookup(key, nef_path, cache_dir))
+
+            for output_path, content in zip(compile_cache.output_paths(nef_path), [b'nef', b'manifest']):
+                with open(output_path, 'wb') as output_file:
+                    output_file.write(content)
+            compile_cache.store(key, nef_path, cache_dir)
+            for output_path in compile_cache.output_paths(nef_path)[:2]:
+                os.remove(output_path)
+
+            self.assertTrue(compile_cache.lookup(key, nef_path, cache_dir))
+            with open(nef_path, 'rb') as nef:
+                self.assertEqual(b'nef', nef.read())
+            self.assertFalse(os.path.exists(compile_cache.output_paths(nef_path)[2]))
+
+            # the entries past the size limit are evicted, least recently used first
+            other_key = compile_cache.cache_key('other', 'Contract.py', 'mainnet', False)
+            os.utime(compile_cache.entry_path(key, cache_dir), (0, 0))
+            compile_cache.store(other_key, nef_path, cache_dir, size_limit=len(b'nef') + len(b'manifest'))
+            self.assertFalse(compile_cache.lookup(key, nef_path, cache_dir))
+            self.assertTrue(compile_cache.lookup(other_key, nef_path, cache_dir))
+
+            # an entry missing a required output, like one left by an interrupted store, is a miss and is dropped
+            os.remove(os.path.join(compile_cache.entry_path(other_key, cache_dir), 'contract.manifest.json'))
+            self.assertFalse(compile_cache.lookup(other_key, nef_path, cache_dir))
+            self.assertFalse(os.path.exists(compile_cache.entry_path(other_key, cache_dir)))
+
+    def test_strip_debug(self):
+        source = '\n'.join([
+            'def debug(params: list):',
+            '    pass',
+            '',
+            'def method(value: int) -> int:',
+            '    debug([',
+            '        "multi-line: ",',
+            '        value',
+            '    ])',
+            '    if value > 0:',
+            '        debug(["positive"])',
+            '    else:',
+            '        value = 0',
+            '# DEBUG_START',
+            '    value = value + 1',
+            '# DEBUG_END',
+            '    return value',
+            '',
+        ])
+        expected = '\n'.join([
+            'def method(value: int) -> int:',
+            '    if value > 0:',
+            '        pass',
+            '    else:',
+            '        value = 0',
+            '    return value',
+            '',
+        ])
+        self.assertEqual(expected, preprocess.strip_debug(source))
+
+    def test_strip_debug_imports(self):
+        source = '\n'.join([
+            'from ghost_runtime import debug, expect',
+            'from ghost_runtime import debug',
+            '',
+        ])
+        self.assertEqual('from ghost_runtime import expect\n', preprocess.strip_debug(source))
+
+    def test_contract_sources(self):
+        for folder, name in self.CONTRACTS:
+            with self.subTest(contract=name):
+                sources = preprocess.contract_sources(os.path.join(GHOST_ROOT, folder, name))
+                self.assertEqual([name, 'ghost_runtime.py'], list(sources))
+                for source in sources.values():
+                    self.assertNotIn('debug', source)
+
+                with open(os.path.join(GHOST_ROOT, 'contracts', 'ghost_runtime.py')) as module_file:
+                    module_source = module_file.read()
+                sources = preprocess.contract_sources(os.path.join(GHOST_ROOT, folder, name), release=False)
+                self.assertEqual(module_source, sources['ghost_runtime.py'])
+
+    def test_strip_debug_unbalanced_block(self):
+        with self.assertRaises(ValueError):
+            preprocess.strip_debug('# DEBUG_START\nvalue = 1\n')
+
+    def test_strip_debug_remaining_reference(self):
+        with self.assertRaises(ValueError):
+            preprocess.strip_debug('log = debug\n')
+
+    def test_release_build_leaves_source_tree_untouched(self):
+        for folder, name in self.CONTRACTS:
+            with self.subTest(contract=name):
+                contract_dir = os.path.join(GHOST_ROOT, folder)
+                files = sorted(os.listdir(contract_dir))
+                with open(os.path.join(contract_dir, name)) as contract_file:
+                    source = contract_file.read()
+
+                with tempfile.TemporaryDirectory() as build_dir:
+                    path = preprocess.write_contract(os.path.join(contract_dir, name), build_dir)
+                    self.assertEqual(os.path.join(build_dir, name), path)
+                    self.assertEqual(sorted([name, 'ghost_runtime.py']), sorted(os.listdir(build_dir)))
+
+                self.assertEqual(files, sorted(os.listdir(contract_dir)))
+                with open(os.path.join(contract_dir, name)) as contract_file:
+                    self.assertEqual(source, contract_file.read())
+
+    def test_fold_constants(self):
+        source = '\n'.join([
+            'TOTAL = 100_000_000 * 10 ** 8',
+            'PREFIX = b"A" + b"B"',
+            'COUNTER = 1',
+            'COUNTER = 2',
+            '',
+            'def method(value: int) -> int:',
+            '    return value + TOTAL * 2 + COUNTER * 2 + 7 // 2',
+            '',
+            'def shadowed(TOTAL: int) -> int:',
+            '    return TOTAL * 2',
+            '',
+        ])
+        expected = '\n'.join([
+            'TOTAL = 10000000000000000',
+            "PREFIX = b'AB'",
+            'COUNTER = 1',
+            'COUNTER = 2',
+            '',
+            'def method(value: int) -> int:',
+            '    return value + 20000000000000000 + COUNTER * 2 + 7 // 2',
+            '',
+            'def shadowed(TOTAL: int) -> int:',
+            '    return TOTAL * 2',
+            '',
+        ])
+        self.assertEqual(expected, preprocess.transform(source))
+
+    def test_inline_key_helpers(self):
+        source = '\n'.join([
+            'PREFIX = b"P"',
+            '',
+            'def method(owner: bytes, spender: bytes) -> bytes:',
+            '    return mk_pair_key(owner, spender) + mk_swapped_key(owner, spender)',
+            '',
+            'def mk_pair_key(owner: bytes, spender: bytes) -> bytes:',
+            '    return PREFIX + owner + spender',
+            '',
+            'def mk_swapped_key(owner: bytes, spender: bytes) -> bytes:',
+            '    return PREFIX + spender + owner',
+            '',
+        ])
+        expected = '\n'.join([
+            "PREFIX = b'P'",
+            '',
+            'def method(owner: bytes, spender: bytes) -> bytes:',
+            '    return PREFIX + owner + spender + mk_swapped_key(owner, spender)',
+            '',
+            'def mk_swapped_key(owner: bytes, spender: bytes) -> bytes:',
+            '    return PREFIX + spender + owner',
+            '',
+        ])
+        self.assertEqual(expected, preprocess.transform(source))
+
+    def test_inline_assertions(self):
+        source = '\n'.join([
+            'from ghost_runtime import expect, validateAddress',
+            '',
+            'def method(value: int):',
+            '    expect(value > 0, "method - value has to be positive")',
+            '    if value > 1:',
+            '        expect(validateAddress(value), "method - not a valid address")',
+            '',
+            'def expect(condition: bool, message: str):',
+            '    assert condition, message',
+            '',
+        ])
+        expected = '\n'.join([
+            'from ghost_runtime import validateAddress',
+            '',
+            'def method(value: int):',
+            "    assert value > 0, 'method - value has to be positive'",
+            '    if value > 1:',
+            "        assert validateAddress(value), 'method - not a valid address'",
+            '',
+        ])
+        self.assertEqual(expected, preprocess.transform(source))
+
+    def test_inline_assertions_errors(self):
+        sources = [
+            'checked = expect(True, "message")\n',
+            'expect(True)\n',
+            'def expect(condition: bool, message: str):\n    if not condition:\n        abort()\n',
+        ]
+        for source in sources:
+            with self.subTest(source=source), self.assertRaises(ValueError):
+                preprocess.transform(source)
@@ -1,17 +1,30 @@
+import base64
+import hashlib
 import json
+import os
+import sys
 from typing import Self
 
 from neo3.api import StackItemType
 from neo3.contracts.contract import CONTRACT_HASHES
+from neo3.contracts.manifest import ContractManifest
 from neo3.core import types
 from neo3.wallet import account
+from neo3.wallet.utils import address_to_script_hash
 
 from boa3.internal.neo.vm.type.String import String
 from boa3_test.tests import boatestcase, event
 from neo3.network.payloads import verification
 
+GHOST_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(GHOST_ROOT)
 
-class TestGHOST(boatestcase.BoaTestCase):
+import build
+import metadata
+from deploy_fee import DeployFeeTestCase
+
+
+class TestGHOST(DeployFeeTestCase):
     DECIMALS = 0
     OWNER_BALANCE = 0
     TOTAL_SUPPLY = 0
@@ -33,6 +46,16 @@ class TestGHOST(boatestcase.BoaTestCase):
         'utf-8')
 
     ACCOUNT_PREFIX = b'ACC'
+    AUTH_PREFIX = b'AUP'
+    TOKEN_PREFIX = b'TPF'
+    META_PREFIX = b'MDP'
+    TOKEN_RECORD_PREFIXES = [b'TPF', b'MDP', b'LCP', b'RYP', b'RIP', b'LVCP']
+    TOKEN_FLAG_LOCKED = 1
+    TOKEN_FLAG_ROYALTIES = 2
+    TOKEN_FLAG_CREATOR = 8
+    CREATOR_PREFIX = b'CRP'
+    SERIALIZED_ARRAY = 0x40
+    URI_META = 0x02
 
     @classmethod
     def setupTestCase(cls):
@@ -50,6 +73,7 @@ class TestGHOST(boatestcase.BoaTestCase):
         await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account1.script_hash, 100)
         await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account2.script_hash, 100)
 
+        cls.release_build()
         await cls.set_up_contract('..', 'contracts/NEP11', 'GhostMarketNFT.py', signing_account=cls.owner)
 
         mint_args = [cls.TOKEN_META, cls.TOKEN_LOCKED, cls.ROYALTIES]
@@ -77,9 +101,20 @@ class TestGHOST(boatestcase.BoaTestCase):
         cls.OWNER_BALANCE = mint_amount
         cls.TOTAL_SUPPLY = mint_amount + account_balance
 
+    @classmethod
+    def release_build(cls) -> str:
+        """
+        Write the release build next to the contract, so it's the one deployed and used for the updates.
+
+        The debug instrumentation makes the contract too large to deploy within the test node GAS limit.
+        """
+        path = cls.get_contract_path('..', 'contracts/NEP11', 'GhostMarketNFT.py')
+        return build.build_contract(path, path.replace('.py', '.nef'))
+
     def test_compile(self):
         path = self.get_contract_path('..', 'contracts/NEP11', 'GhostMarketNFT.py')
-        _, manifest = self.assertCompile(path, get_manifest=True)
+        # the modules shared by the contracts are imported from the contracts folder
+        _, manifest = self.assertCompile(path, root_folder=os.path.dirname(os.path.dirname(path)), get_manifest=True)
 
         self.assertIn('supportedstandards', manifest)
         self.assertIsInstance(manifest['supportedstandards'], list)
@@ -87,6 +122,11 @@ class TestGHOST(boatestcase.BoaTestCase):
         self.assertIn('NEP-11', manifest['supportedstandards'])
         self.assertIn('NEP-24', manifest['supportedstandards'])
 
+        # the methods imported from ghost_runtime are exported
+        methods = [method['name'] for method in manifest['abi']['methods']]
+        for method in ['getAuthorizedAddress', 'setAuthorizedAddress', 'isPaused', 'updatePause', 'update', 'verify']:
+            self.assertIn(method, methods)
+
     async def test_symbol(self):
         expected = 'GHOST'
         result, _ = await self.call('symbol', return_type=str)
@@ -149,6 +189,337 @@ class TestGHOST(boatestcase.BoaTestCase):
         )
         self.assertEqual(self.OWNER_BALANCE, len(tokens_of_storage))
 
+    async def walk_pages(self, method: str, args: list, limit: int) -> list[bytes]:
+        tokens = []
+        cursor = b''
+        while True:
+            result, _ = await self.call(method, [*args, cursor, limit], return_type=list)
+            page = [token.encode('utf-8') for token in result[0]]
+            cursor = result[1].encode('utf-8') if isinstance(result[1], str) else result[1]
+            self.assertLessEqual(len(page), limit)
+            tokens.extend(page)
+            if len(cursor) == 0:
+                return tokens
+            self.assertEqual(page[-1], cursor)
+
+    async def test_tokens_paged(self):
+        owner_tokens = await self.get_storage(
+            self.ACCOUNT_PREFIX + self.owner.script_hash.to_array(),
+            remove_prefix=True
+        )
+        result = await self.walk_pages('tokensOfPaged', [self.owner.script_hash], 2)
+        self.assertEqual(len(owner_tokens), len(result))
+        self.assertEqual(set(owner_tokens), set(result))
+
+        result = await self.walk_pages('tokensOfPaged', [types.UInt160.zero()], 2)
+        self.assertEqual([], result)
+
+        all_tokens = await self.get_storage(self.TOKEN_PREFIX, remove_prefix=True)
+        result = await self.walk_pages('tokensPaged', [], 3)
+        self.assertEqual(len(all_tokens), len(result))
+        self.assertEqual(set(all_tokens), set(result))
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('tokensPaged', [b'', 0], return_type=list)
+        self.assertEqual(str(context.exception), 'limit has to be positive')
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('tokensPaged', [b'', 101], return_type=list)
+        self.assertEqual(str(context.exception), 'limit can not exceed the max page size')
+
+    async def test_tokens_by_creator(self):
+        creator = self.account2
+        receiver = self.account1
+
+        tokens, _ = await self.call(
+            'multiMint',
+            [creator.script_hash, [self.TOKEN_META] * 3, [b'', b'', self.TOKEN_LOCKED], [b''] * 3],
+            return_type=list[bytes],
+            signing_accounts=[creator]
+        )
+        created_tokens = await self.get_storage(
+            self.CREATOR_PREFIX + creator.script_hash.to_array(),
+            remove_prefix=True
+        )
+        for token in tokens:
+            self.assertIn(token, created_tokens)
+        result = await self.walk_pages('tokensByCreator', [creator.script_hash], 2)
+        self.assertEqual(set(created_tokens), set(result))
+
+        # the creator index doesn't change with the owner, the creator is written in the record instead
+        await self.call('transfer', [receiver.script_hash, tokens[0], None], return_type=bool,
+                        signing_accounts=[creator])
+        records = await self.get_storage(self.TOKEN_PREFIX + tokens[0])
+        self.assertEqual(
+            receiver.script_hash.to_array() + bytes([self.TOKEN_FLAG_CREATOR]) + creator.script_hash.to_array(),
+            records[self.TOKEN_PREFIX + tokens[0]]
+        )
+        result = await self.walk_pages('tokensByCreator', [creator.script_hash], 100)
+        self.assertIn(tokens[0], result)
+        result = await self.walk_pages('tokensByCreator', [receiver.script_hash], 100)
+        self.assertNotIn(tokens[0], result)
+
+        # flagging the locked content as viewed keeps the creator
+        await self.call('getLockedContent', [tokens[2]], return_type=bytes, signing_accounts=[creator])
+
+        await self.call('burn', [tokens[0]], return_type=bool, signing_accounts=[receiver])
+        await self.call('multiBurn', [tokens[1:]], return_type=list[bool], signing_accounts=[creator])
+        result = await self.walk_pages('tokensByCreator', [creator.script_hash], 100)
+        for token in tokens:
+            self.assertNotIn(token, result)
+        created_tokens = await self.get_storage(self.CREATOR_PREFIX + creator.script_hash.to_array())
+        self.assertEqual(len(result), len(created_tokens))
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('tokensByCreator', [bytes(10), b'', 10], return_type=list)
+        self.assertEqual(str(context.exception), 'tokensByCreator - not a valid address')
+
+    async def test_collections(self):
+        creator = self.account2
+        collection_meta = {'name': 'Collection', 'description': 'Shared description', 'image': '{some image URI}'}
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('createCollection', [creator.script_hash, json.dumps(collection_meta).encode()],
+                            return_type=bytes)
+        self.assertEqual(str(context.exception), 'createCollection - invalid witness')
+
+        collection_id, _ = await self.call(
+            'createCollection',
+            [creator.script_hash, json.dumps(collection_meta).encode()],
+            return_type=bytes,
+            signing_accounts=[creator]
+        )
+
+        token_meta = {'name': 'Token #1', 'edition': '1'}
+        mint_args = [collection_id, [json.dumps(token_meta).encode(), b''], [b'', b''], [b'', b'']]
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('multiMintInCollection', mint_args, return_type=list[bytes])
+        self.assertEqual(str(context.exception), 'multiMint - invalid witness')
+
+        tokens, _ = await self.call('multiMintInCollection', mint_args, return_type=list[bytes],
+                                    signing_accounts=[creator])
+        for token in tokens:
+            result, _ = await self.call('ownerOf', [token], return_type=types.UInt160)
+            self.assertEqual(creator.script_hash, result)
+
+        # the tokens only store their own metadata, with the id of their collection
+        meta_records = await self.get_storage(self.META_PREFIX + tokens[0])
+        self.assertEqual(self.SERIALIZED_ARRAY, meta_records[self.META_PREFIX + tokens[0]][0])
+
+        # the metadata of the token overrides the metadata of the collection
+        expected = [{**collection_meta, **token_meta}, collection_meta]
+        for token, token_property in zip(tokens, expected):
+            result, _ = await self.call('properties', [token], return_type=dict[str, str])
+            self.assertEqual(token_property, result)
+            result, _ = await self.call('propertiesJson', [token], return_type=str)
+            self.assertEqual(token_property, json.loads(result))
+
+        result, _ = await self.call('propertiesMany', [tokens], return_type=list)
+        self.assertEqual(
+            expected,
+            [{key.decode('utf-8'): value.decode('utf-8') for key, value in properties.items()} for properties in result]
+        )
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('multiMintInCollection', [b'missing', [b''], [b''], [b'']], return_type=list[bytes],
+                            signing_accounts=[creator])
+        self.assertEqual(str(context.exception), 'multiMintInCollection - collection not found')
+
+        # metadata written like the metadata of a collection token, minting a token in the collection of someone else
+        spoofed_meta = json.dumps({'name': 'Spoofed'}).encode()
+        spoofed = bytes([metadata.ARRAY_TYPE, 2,
+                         metadata.BYTESTRING_TYPE, len(collection_id), *collection_id,
+                         metadata.BYTESTRING_TYPE, len(spoofed_meta), *spoofed_meta])
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('mint', [self.account1.script_hash, spoofed, b'', b''], return_type=bytes,
+                            signing_accounts=[self.account1])
+        self.assertEqual(str(context.exception), 'mint - `meta` format is reserved')
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('multiMint', [self.account1.script_hash, [self.TOKEN_META, spoofed], [b''] * 2, [b''] * 2],
+                            return_type=list[bytes], signing_accounts=[self.account1])
+        self.assertEqual(str(context.exception), 'multiMint - `meta` format is reserved')
+
+    async def test_compressed_meta(self):
+        minter = self.account2
+        token_meta = {
+            'name': 'Ghost #12',
+            'description': 'Some description',
+            'image': 'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12.png',
+            'external_url': 'https://ghostmarket.io/asset/n3/ghost/12',
+            'attributes': [{'trait_type': 'Eyes', 'value': 'Laser'}, {'trait_type': 'Level', 'value': 5}],
+        }
+        compressed = metadata.mint_meta(json.dumps(token_meta).encode())
+        self.assertEqual(metadata.COMPRESSED_META, compressed[0])
+        # every dictionary string, to check it matches the dictionary of the off-chain codec
+        dictionary_meta = metadata.encode_parts(list(range(len(metadata.META_DICTIONARY))))
+
+        tokens, _ = await self.call(
+            'multiMint',
+            [minter.script_hash, [compressed, dictionary_meta, self.TOKEN_META], [b''] * 3, [b''] * 3],
+            return_type=list[bytes],
+            signing_accounts=[minter]
+        )
+        # told apart by the first byte of the metadata, the token record isn't flagged
+        records = await self.get_storage(self.TOKEN_PREFIX + tokens[0])
+        self.assertEqual(
+            minter.script_hash.to_array() + bytes([self.TOKEN_FLAG_CREATOR]),
+            records[self.TOKEN_PREFIX + tokens[0]]
+        )
+        meta_records = await self.get_storage(self.META_PREFIX + tokens[0])
+        self.assertEqual(compressed, meta_records[self.META_PREFIX + tokens[0]])
+
+        result, _ = await self.call('propertiesJson', [tokens[0]], return_type=bytes)
+        self.assertEqual(metadata.decompress_meta(compressed), result)
+        self.assertEqual(token_meta, json.loads(result))
+        result, _ = await self.call('propertiesJson', [tokens[1]], return_type=bytes)
+        self.assertEqual(b''.join(metadata.META_DICTIONARY), result)
+
+        result, _ = await self.call('properties', [tokens[0]], return_type=dict)
+        self.assertEqual(token_meta['image'].encode(), result[b'image'])
+        self.assertEqual(len(token_meta['attributes']), len(result[b'attributes']))
+
+        result, _ = await self.call('propertiesMany', [[tokens[0], tokens[2]]], return_type=list)
+        self.assertEqual(token_meta['name'].encode(), result[0][b'name'])
+        self.assertEqual(
+            json.loads(self.TOKEN_META),
+            {key.decode('utf-8'): value.decode('utf-8') for key, value in result[1].items()}
+        )
+
+        await self.call('multiBurn', [tokens], return_type=list[bool], signing_accounts=[minter])
+
+    async def test_mint_uri(self):
+        minter = self.account2
+        token_uri = b'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12'
+        content_hash = hashlib.sha256(self.TOKEN_META).digest()
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('mintUri', [minter.script_hash, token_uri, content_hash, b'', b''], return_type=bytes)
+        self.assertEqual(str(context.exception), 'mintUri - invalid witness')
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('mintUri', [minter.script_hash, b'', content_hash, b'', b''], return_type=bytes,
+                            signing_accounts=[minter])
+        self.assertEqual(str(context.exception), 'mintUri - `uri` can not be empty')
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('mintUri', [minter.script_hash, token_uri, content_hash[:20], b'', b''], return_type=bytes,
+                            signing_accounts=[minter])
+        self.assertEqual(str(context.exception), 'mintUri - `contentHash` should be 32 bytes')
+
+        # stored like URI metadata without going through the checks of mintUri, with a hash shorter than 32 bytes
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('mint', [minter.script_hash, bytes([self.URI_META]) + content_hash[:20], b'', b''],
+                            return_type=bytes, signing_accounts=[minter])
+        self.assertEqual(str(context.exception), 'mint - `meta` format is reserved')
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('multiMint', [minter.script_hash, [bytes([self.URI_META]) + token_uri], [b''], [b'']],
+                            return_type=list[bytes], signing_accounts=[minter])
+        self.assertEqual(str(context.exception), 'multiMint - `meta` format is reserved')
+
+        token, _ = await self.call(
+            'mintUri',
+            [minter.script_hash, token_uri, content_hash, self.TOKEN_LOCKED, self.ROYALTIES],
+            return_type=bytes,
+            signing_accounts=[minter]
+        )
+        result, _ = await self.call('ownerOf', [token], return_type=types.UInt160)
+        self.assertEqual(minter.script_hash, result)
+
+        # the metadata isn't stored, only its hash and its URI
+        meta_records = await self.get_storage(self.META_PREFIX + token)
+        stored = meta_records[self.META_PREFIX + token]
+        self.assertEqual(bytes([self.URI_META]) + content_hash + token_uri, stored)
+
+        expected = {b'tokenURI': token_uri, b'contentHash': content_hash}
+        result, _ = await self.call('properties', [token], return_type=dict)
+        self.assertEqual(expected, result)
+        result, _ = await self.call('propertiesMany', [[token]], return_type=list)
+        self.assertEqual([expected], result)
+
+        result, _ = await self.call('propertiesJson', [token], return_type=bytes)
+        self.assertEqual(
+            {'tokenURI': token_uri.decode(), 'contentHash': base64.b64encode(content_hash).decode()},
+            json.loads(result)
+        )
+        self.assertEqual(metadata.decompress_meta(stored), result)
+
+        result, _ = await self.call('getRoyalties', [token], return_type=str)
+        self.assertEqual(json.loads(self.ROYALTIES), json.loads(result))
+
+        await self.call('burn', [token], return_type=bool, signing_accounts=[minter])
+
+    async def test_ordered_token_ids(self):
+        # test_destroy deploys from account2, a destroyed contract can't be deployed again
+        minter = self.account1
+
+        # a contract of its own, so the other tests keep minting with the default token ids
+        self.release_build()
+        contract_hash = await self.compile_and_deploy(
+            '..', 'contracts/NEP11', 'GhostMarketNFT.py',
+            signing_account=minter
+        )
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('tokensSince', [b'', 10], return_type=list[bytes], target_contract=contract_hash)
+        self.assertEqual(str(context.exception), 'tokensSince - ordered token ids are not enabled')
+
+        mint_args = [minter.script_hash, self.TOKEN_META, b'', b'']
+        token, _ = await self.call('mint', mint_args, return_type=bytes, target_contract=contract_hash,
+                                   signing_accounts=[minter])
+        self.assertEqual(b'\x01', token)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('enableOrderedTokenIds', [], return_type=None, target_contract=contract_hash)
+        self.assertEqual(
+            str(context.exception),
+            'enableOrderedTokenIds - `account` is not allowed for enableOrderedTokenIds'
+        )
+
+        for _ in range(2):
+            await self.call('enableOrderedTokenIds', [], return_type=None, target_contract=contract_hash,
+                            signing_accounts=[minter])
+        # the flag is a bit of the contract state, next to deployed
+        self.assertEqual({b'STATE': b'\x05'}, await self.get_storage(b'STATE', target_contract=contract_hash))
+        self.assertEqual(
+            {b'ORDERED_IDS_START': b'\x02'},
+            await self.get_storage(b'ORDERED_IDS_START', target_contract=contract_hash)
+        )
+
+        token, _ = await self.call('mint', mint_args, return_type=bytes, target_contract=contract_hash,
+                                   signing_accounts=[minter])
+        tokens, _ = await self.call(
+            'multiMint',
+            [minter.script_hash, [self.TOKEN_META] * 3, [b''] * 3, [b''] * 3],
+            return_type=list[bytes],
+            target_contract=contract_hash,
+            signing_accounts=[minter]
+        )
+        ordered = [number.to_bytes(8, 'big') for number in range(2, 6)]
+        self.assertEqual(ordered, [token, *tokens])
+
+        # the ordered token ids are stored in mint order
+        stored = await self.get_storage(self.TOKEN_PREFIX, target_contract=contract_hash, remove_prefix=True)
+        self.assertEqual(ordered, [token for token in stored if len(token) == 8])
+
+        result, _ = await self.call('tokensSince', [b'', 10], return_type=list[bytes], target_contract=contract_hash)
+        self.assertEqual(ordered, result)
+        result, _ = await self.call('tokensSince', [ordered[0], 2], return_type=list[bytes],
+                                    target_contract=contract_hash)
+        self.assertEqual(ordered[1:3], result)
+        result, _ = await self.call('tokensSince', [ordered[-1], 10], return_type=list[bytes],
+                                    target_contract=contract_hash)
+        self.assertEqual([], result)
+
+        await self.call('burn', [ordered[1]], return_type=bool, target_contract=contract_hash,
+                        signing_accounts=[minter])
+        result, _ = await self.call('tokensSince', [ordered[0], 10], return_type=list[bytes],
+                                    target_contract=contract_hash)
+        self.assertEqual(ordered[2:], result)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('tokensSince', [b'\x01', 10], return_type=list[bytes], target_contract=contract_hash)
+        self.assertEqual(str(context.exception), 'tokensSince - not an ordered token id')
+
     async def test_transfer_success(self):
         token = self.TOKEN_ID_TRANSFER_TEST
         from_account = self.account1.script_hash
@@ -190,6 +561,82 @@ class TestGHOST(boatestcase.BoaTestCase):
         result, _ = await self.call('totalSupply', [], return_type=int)
         self.assertEqual(total_supply, result)
 
+    async def test_multi_transfer(self):
+        sender = self.account1
+        receiver = self.account2
+
+        tokens, _ = await self.call(
+            'multiMint',
+            [sender.script_hash, [self.TOKEN_META] * 2, [b''] * 2, [b''] * 2],
+            return_type=list[bytes],
+            signing_accounts=[sender]
+        )
+        other_token, _ = await self.call(
+            'mint',
+            [receiver.script_hash, self.TOKEN_META, b'', b''],
+            return_type=bytes,
+            signing_accounts=[receiver]
+        )
+        sender_balance, _ = await self.call('balanceOf', [sender.script_hash], return_type=int)
+        receiver_balance, _ = await self.call('balanceOf', [receiver.script_hash], return_type=int)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('multiTransfer', [[receiver.script_hash], tokens, None], return_type=list[bool])
+        self.assertEqual(str(context.exception), 'multiTransfer - to and tokenIds should have the same length')
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call(
+                'multiTransfer',
+                [[receiver.script_hash], [b'missing'], None],
+                return_type=list[bool],
+                signing_accounts=[sender]
+            )
+        self.assertEqual(str(context.exception), 'Token not found')
+
+        # a token sent to its owner, a token of another owner, and a token transferred twice
+        to = [receiver.script_hash, sender.script_hash, sender.script_hash, receiver.script_hash]
+        token_ids = [tokens[0], tokens[1], other_token, tokens[1]]
+        result, notifications = await self.call(
+            'multiTransfer',
+            [to, token_ids, None],
+            return_type=list[bool],
+            signing_accounts=[sender]
+        )
+        self.assertEqual([True, True, False, True], result)
+
+        transfer_events = self.filter_events(
+            notifications,
+            origin=[self.contract_hash],
+            event_name='Transfer',
+            notification_type=boatestcase.Nep11TransferEvent
+        )
+        self.assertEqual(3, len(transfer_events))
+        for event, destination, token in zip(transfer_events, [to[0], to[1], to[3]], [*tokens, tokens[1]]):
+            self.assertEqual(sender.script_hash, event.source)
+            self.assertEqual(destination, event.destination)
+            self.assertEqual(token.decode('utf-8'), event.token_id)
+
+        result, _ = await self.call('ownerOfMany', [[*tokens, other_token]], return_type=list)
+        self.assertEqual([receiver.script_hash.to_array()] * 3, result)
+
+        result, _ = await self.call('balanceOf', [sender.script_hash], return_type=int)
+        self.assertEqual(sender_balance - 2, result)
+        result, _ = await self.call('balanceOf', [receiver.script_hash], return_type=int)
+        self.assertEqual(receiver_balance + 2, result)
+
+        receiver_tokens = await self.get_storage(
+            self.ACCOUNT_PREFIX + receiver.script_hash.to_array(),
+            remove_prefix=True
+        )
+        for token in tokens:
+            self.assertIn(token, receiver_tokens)
+        sender_tokens = await self.get_storage(
+            self.ACCOUNT_PREFIX + sender.script_hash.to_array(),
+            remove_prefix=True
+        )
+        for token in tokens:
+            self.assertNotIn(token, sender_tokens)
+
     async def test_transfer_fail_no_sign(self):
         token = self.TEST_TOKEN_ID
         from_account = self.account1.script_hash
@@ -283,10 +730,13 @@ class TestGHOST(boatestcase.BoaTestCase):
             )
 
     async def test_update(self):
-        path = self.get_contract_path('..', 'contracts/NEP11', 'GhostMarketNFT.py')
+        path = self.release_build()
 
         new_nef, new_manifest = self.get_serialized_output(path)
-        arg_manifest = String(json.dumps(new_manifest, separators=(',', ':'))).to_bytes()
+        # sent like neo-cli does, parsed and serialized again without the compiler specific fields
+        arg_manifest = String(
+            json.dumps(ContractManifest.from_json(new_manifest).to_json(), separators=(',', ':'))
+        ).to_bytes()
 
         with self.assertRaises(boatestcase.AssertException) as context:
             # missing signature
@@ -297,13 +747,7 @@ class TestGHOST(boatestcase.BoaTestCase):
             )
         self.assertEqual(str(context.exception), 'update - `account` is not allowed for update')
 
-        result, notifications = await self.call(
-            'update',
-            [new_nef, arg_manifest],
-            return_type=None,
-            signing_accounts=[self.owner]
-        )
-        self.assertIsNone(result)
+        notifications = await self.update_contract(new_nef, arg_manifest, self.owner)
 
         update_events = self.filter_events(
             notifications,
@@ -316,6 +760,7 @@ class TestGHOST(boatestcase.BoaTestCase):
     async def test_destroy(self):
         owner_test_destroy = self.account2
 
+        self.release_build()
         contract_hash = await self.compile_and_deploy(
             '..', 'contracts/NEP11', 'GhostMarketNFT.py',
             signing_account=owner_test_destroy
@@ -354,6 +799,8 @@ class TestGHOST(boatestcase.BoaTestCase):
     async def test_verify(self):
         result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160])
         self.assertEqual([self.owner.script_hash], result)
+        # each authorized address has its own key, the list of previous versions isn't written
+        self.assertEqual({}, await self.get_storage(b'AUTH_ADDRESSES'))
 
         result, _ = await self.call('verify', [], return_type=bool, signing_accounts=[self.owner])
         self.assertEqual(True, result)
@@ -407,6 +854,12 @@ class TestGHOST(boatestcase.BoaTestCase):
         self.assertEqual(0, authorized[0].type)
         self.assertEqual(True, authorized[0].add)
 
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160])
+        self.assertEqual(sorted([self.owner.script_hash, account]), sorted(result))
+        self.assertIn(self.AUTH_PREFIX + account.to_array(), await self.get_storage(self.AUTH_PREFIX))
+        result, _ = await self.call('verify', [], return_type=bool, signing_accounts=[self.account1])
+        self.assertEqual(True, result)
+
         # now deauthorize the address
         result, notifications = await self.call(
             'setAuthorizedAddress',
@@ -427,6 +880,11 @@ class TestGHOST(boatestcase.BoaTestCase):
         self.assertEqual(0, authorized[0].type)
         self.assertEqual(False, authorized[0].add)
 
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160])
+        self.assertEqual([self.owner.script_hash], result)
+        result, _ = await self.call('verify', [], return_type=bool, signing_accounts=[self.account1])
+        self.assertEqual(False, result)
+
     async def test_pause(self):
         # missing owner signing transaction
         with self.assertRaises(boatestcase.AssertException) as context:
@@ -443,6 +901,11 @@ class TestGHOST(boatestcase.BoaTestCase):
         
         result, _ = await self.call('updatePause', [True], return_type=bool, signing_accounts=[self.owner], signers=[signer])
         self.assertEqual(True, result)
+        result, _ = await self.call('isPaused', [], return_type=bool)
+        self.assertEqual(True, result)
+        # deployed and paused are packed in a single key
+        self.assertEqual({b'STATE': b'\x03'}, await self.get_storage(b'STATE'))
+        self.assertEqual({}, await self.get_storage(b'paused'))
 
         # should fail because contract is paused
         with self.assertRaises(boatestcase.AssertException) as context:
@@ -457,6 +920,9 @@ class TestGHOST(boatestcase.BoaTestCase):
         # unpause contract
         result, _ = await self.call('updatePause', [False], return_type=bool, signing_accounts=[self.owner], signers=[signer])
         self.assertEqual(False, result)
+        result, _ = await self.call('isPaused', [], return_type=bool)
+        self.assertEqual(False, result)
+        self.assertEqual({b'STATE': b'\x01'}, await self.get_storage(b'STATE'))
 
         _, notifications = await self.call(
             'mint',
@@ -517,9 +983,21 @@ class TestGHOST(boatestcase.BoaTestCase):
         token_property = json.loads(self.TOKEN_META.decode('utf-8').replace("'", "\""))
         self.assertEqual(token_property, result)
 
-        token_royalties = self.ROYALTIES.decode('utf-8')
+        token_royalties = json.loads(self.ROYALTIES)
         result, _ = await self.call('getRoyalties', [token], return_type=str)
-        self.assertEqual(token_royalties, result)
+        self.assertEqual(token_royalties, json.loads(result))
+
+        sale_price = 10_000
+        result, _ = await self.call(
+            'royaltyInfo',
+            [token, CONTRACT_HASHES.GAS_TOKEN, sale_price],
+            return_type=list[list]
+        )
+        expected = [
+            [address_to_script_hash(royalty['address']).to_array(), sale_price * royalty['value'] // 10000]
+            for royalty in token_royalties
+        ]
+        self.assertEqual(expected, result)
 
         # check balances after
         result, _ = await self.call('balanceOf', [test_account.script_hash], return_type=int)
@@ -528,6 +1006,249 @@ class TestGHOST(boatestcase.BoaTestCase):
         result, _ = await self.call('totalSupply', [], return_type=int)
         self.assertEqual(total_supply + 1, result)
 
+    async def test_read_many(self):
+        test_account = self.account2
+        signer = verification.Signer(
+            test_account.script_hash,
+            verification.WitnessScope.CUSTOM_CONTRACTS,
+            allowed_contracts=[self.contract_hash]
+        )
+
+        tokens = []
+        for royalties in [self.ROYALTIES, b'']:
+            token, _ = await self.call(
+                'mint',
+                [test_account.script_hash, self.TOKEN_META, self.TOKEN_LOCKED, royalties],
+                return_type=bytes,
+                signing_accounts=[test_account],
+                signers=[signer]
+            )
+            tokens.append(token)
+        token_ids = [*tokens, b'missing']
+
+        result, _ = await self.call('ownerOfMany', [token_ids], return_type=list)
+        self.assertEqual([test_account.script_hash.to_array(), test_account.script_hash.to_array(), None], result)
+
+        result, _ = await self.call('propertiesMany', [token_ids], return_type=list)
+        token_property = json.loads(self.TOKEN_META.decode('utf-8').replace("'", "\""))
+        self.assertIsNone(result[2])
+        for properties in result[:2]:
+            self.assertEqual(
+                token_property,
+                {key.decode('utf-8'): value.decode('utf-8') for key, value in properties.items()}
+            )
+
+        sale_prices = [10_000, 10_000, 10_000]
+        result, _ = await self.call(
+            'royaltyInfoMany',
+            [token_ids, CONTRACT_HASHES.GAS_TOKEN, sale_prices],
+            return_type=list
+        )
+        expected = [
+            [address_to_script_hash(royalty['address']).to_array(), sale_prices[0] * royalty['value'] // 10000]
+            for royalty in json.loads(self.ROYALTIES)
+        ]
+        self.assertEqual([expected, [], None], result)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('royaltyInfoMany', [token_ids, CONTRACT_HASHES.GAS_TOKEN, [1]], return_type=list)
+        self.assertEqual(
+            str(context.exception),
+            'royaltyInfoMany - tokens and sale prices should have the same length'
+        )
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('ownerOfMany', [[b'missing'] * 101], return_type=list)
+        self.assertEqual(str(context.exception), 'ownerOfMany - too many tokens')
+
+        # compressed metadata isn't validated on mint, a token that can't be decompressed doesn't fail the batch
+        compressed = metadata.encode_parts([0, b'Ghost', 2, b'ipfs://Qm'])
+        undecodable_meta = [
+            bytes([metadata.COMPRESSED_META, 0xff]),
+            compressed[:-1],
+            compressed + b'\x00',
+            metadata.encode_parts([len(metadata.META_DICTIONARY)]),
+            bytes([metadata.COMPRESSED_META, metadata.ARRAY_TYPE, 1, 0x30, 1, 0]),
+        ]
+        undecodable, _ = await self.call(
+            'multiMint',
+            [test_account.script_hash, undecodable_meta, [b''] * 5, [b''] * 5],
+            return_type=list[bytes],
+            signing_accounts=[test_account]
+        )
+        result, _ = await self.call('propertiesMany', [[tokens[0], *undecodable]], return_type=list)
+        self.assertEqual(
+            token_property,
+            {key.decode('utf-8'): value.decode('utf-8') for key, value in result[0].items()}
+        )
+        self.assertEqual([None] * 5, result[1:])
+
+        await self.call('multiBurn', [undecodable], return_type=list[bool], signing_accounts=[test_account])
+
+    async def test_mint_royalties_validation(self):
+        test_account = self.account2
+        first = 'NZcuGiwRu1QscpmCyxj5XwQBUf6sk7dJJN'
+        second = 'NiNmXL8FjEUEs1nfX9uHFBNaenxDHJtmuB'
+
+        invalid_royalties = [
+            ([{'address': first}], 'internal_mint - not a valid royalties format'),
+            ([{'address': first, 'value': 3000}, {'address': second, 'value': '2001'}],
+             'internal_mint - royalties can not exceed 50%'),
+            ([{'address': first, 'value': 1000}, {'address': first, 'value': 1000}],
+             'internal_mint - duplicated royalties address'),
+            ([{'address': first, 'value': -1}], 'internal_mint - not a valid royalties value'),
+            ([{'address': first, 'value': True}], 'internal_mint - not a valid royalties value'),
+        ]
+        for royalties, message in invalid_royalties:
+            with self.subTest(royalties=royalties):
+                with self.assertRaises(boatestcase.AssertException) as context:
+                    await self.call(
+                        'mint',
+                        [test_account.script_hash, self.TOKEN_META, b'', json.dumps(royalties).encode()],
+                        return_type=bytes,
+                        signing_accounts=[test_account]
+                    )
+                self.assertEqual(message, str(context.exception))
+
+        # the address checksum is checked on chain, the last character is changed to break it
+        royalties = [{'address': first[:-1] + 'M', 'value': 1000}]
+        with self.assertRaises(boatestcase.FaultException):
+            await self.call(
+                'mint',
+                [test_account.script_hash, self.TOKEN_META, b'', json.dumps(royalties).encode()],
+                return_type=bytes,
+                signing_accounts=[test_account]
+            )
+
+        # getRoyalties returns the json given on mint, string values and whitespace included
+        royalties = json.dumps([{'value': '3000', 'address': first}, {'address': second, 'value': 2000}]).encode()
+        token, _ = await self.call(
+            'mint',
+            [test_account.script_hash, self.TOKEN_META, b'', royalties],
+            return_type=bytes,
+            signing_accounts=[test_account]
+        )
+        result, _ = await self.call('getRoyalties', [token], return_type=bytes)
+        self.assertEqual(royalties, result)
+
+        sale_price = 10_000
+        result, _ = await self.call('royaltyInfo', [token, CONTRACT_HASHES.GAS_TOKEN, sale_price],
+                                    return_type=list[list])
+        self.assertEqual(
+            [
+                [address_to_script_hash(first).to_array(), sale_price * 3000 // 10000],
+                [address_to_script_hash(second).to_array(), sale_price * 2000 // 10000]
+            ],
+            result
+        )
+
+    async def test_token_record(self):
+        test_account = self.account2
+
+        for locked, royalties, flags in [
+            (b'', b'', 0),
+            (self.TOKEN_LOCKED, b'', self.TOKEN_FLAG_LOCKED),
+            (b'', self.ROYALTIES, self.TOKEN_FLAG_ROYALTIES),
+            (self.TOKEN_LOCKED, self.ROYALTIES, self.TOKEN_FLAG_LOCKED | self.TOKEN_FLAG_ROYALTIES),
+        ]:
+            token, _ = await self.call(
+                'mint',
+                [test_account.script_hash, self.TOKEN_META, locked, royalties],
+                return_type=bytes,
+                signing_accounts=[test_account]
+            )
+
+            records = await self.get_storage(self.TOKEN_PREFIX + token)
+            # the creator is the owner until the token is transferred
+            expected = test_account.script_hash.to_array() + bytes([flags | self.TOKEN_FLAG_CREATOR])
+            self.assertEqual(expected, records[self.TOKEN_PREFIX + token])
+
+            result, _ = await self.call('ownerOf', [token], return_type=types.UInt160)
+            self.assertEqual(test_account.script_hash, result)
+
+    async def test_multi_mint_and_multi_burn(self):
+        minter = self.account1
+        other = self.account2
+        batch = 3
+
+        balance, _ = await self.call('balanceOf', [minter.script_hash], return_type=int)
+        total_supply, _ = await self.call('totalSupply', [], return_type=int)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call(
+                'multiMint',
+                [minter.script_hash, [self.TOKEN_META] * batch, [self.TOKEN_LOCKED] * batch, [self.ROYALTIES] * batch],
+                return_type=list[bytes]
+            )
+        self.assertEqual(str(context.exception), 'multiMint - invalid witness')
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call(
+                'multiMint',
+                [minter.script_hash, [self.TOKEN_META] * batch, [self.TOKEN_LOCKED] * batch, [self.ROYALTIES]],
+                return_type=list[bytes],
+                signing_accounts=[minter]
+            )
+        self.assertEqual(
+            str(context.exception),
+            'multiMint - meta, lock content and royalties should have the same length'
+        )
+
+        tokens, notifications = await self.call(
+            'multiMint',
+            [minter.script_hash, [self.TOKEN_META] * batch, [self.TOKEN_LOCKED] * batch, [self.ROYALTIES] * batch],
+            return_type=list[bytes],
+            signing_accounts=[minter]
+        )
+        self.assertEqual(batch, len(tokens))
+        ids = [int.from_bytes(token, 'little') for token in tokens]
+        self.assertEqual(list(range(ids[0], ids[0] + batch)), ids)
+
+        mint_events = self.filter_events(
+            notifications,
+            origin=[self.contract_hash],
+            event_name='Transfer',
+            notification_type=boatestcase.Nep11TransferEvent
+        )
+        self.assertEqual(batch, len(mint_events))
+
+        result, _ = await self.call('balanceOf', [minter.script_hash], return_type=int)
+        self.assertEqual(balance + batch, result)
+        result, _ = await self.call('totalSupply', [], return_type=int)
+        self.assertEqual(total_supply + batch, result)
+
+        other_token, _ = await self.call(
+            'mint',
+            [other.script_hash, self.TOKEN_META, b'', b''],
+            return_type=bytes,
+            signing_accounts=[other]
+        )
+        other_balance, _ = await self.call('balanceOf', [other.script_hash], return_type=int)
+
+        # tokens of several owners, and a token burned twice
+        result, notifications = await self.call(
+            'multiBurn',
+            [[tokens[0], other_token, tokens[1], tokens[0], tokens[2]]],
+            return_type=list[bool],
+            signing_accounts=[minter, other]
+        )
+        self.assertEqual([True, True, True, False, True], result)
+
+        burn_events = self.filter_events(
+            notifications,
+            origin=[self.contract_hash],
+            event_name='Transfer',
+            notification_type=boatestcase.Nep11TransferEvent
+        )
+        self.assertEqual(4, len(burn_events))
+
+        result, _ = await self.call('balanceOf', [minter.script_hash], return_type=int)
+        self.assertEqual(balance, result)
+        result, _ = await self.call('balanceOf', [other.script_hash], return_type=int)
+        self.assertEqual(other_balance - 1, result)
+        result, _ = await self.call('totalSupply', [], return_type=int)
+        self.assertEqual(total_supply, result)
+
     async def test_properties_success(self):
         token = self.TEST_TOKEN_ID
         expected = json.loads(self.TOKEN_META.decode('utf-8').replace("'", "\""))
@@ -563,6 +1284,8 @@ class TestGHOST(boatestcase.BoaTestCase):
         balance, _ = await self.call('balanceOf', [test_account.script_hash], return_type=int)
         total_supply, _ = await self.call('totalSupply', [], return_type=int)
 
+        await self.call('getLockedContent', [token], return_type=bytes, signing_accounts=[test_account])
+
         result, _ = await self.call(
             'burn',
             [token],
@@ -597,3 +1320,9 @@ class TestGHOST(boatestcase.BoaTestCase):
 
         result, _ = await self.call('totalSupply', [], return_type=int)
         self.assertEqual(total_supply - 1, result)
+
+        # no record of the token is left behind
+        for prefix in self.TOKEN_RECORD_PREFIXES:
+            key = prefix + token.encode('utf-8')
+            records = await self.get_storage(key)
+            self.assertNotIn(key, records)
@@ -1,4 +1,7 @@
+import os
+
 from neo3.contracts.contract import CONTRACT_HASHES
+from neo3.core import types
 from neo3.wallet import account
 
 from boa3_test.tests import boatestcase
@@ -45,7 +48,8 @@ class TestGM(boatestcase.BoaTestCase):
 
     def test_compile(self):
         path = self.get_contract_path('..', 'contracts/NEP17', 'GhostMarketToken.py')
-        _, manifest = self.assertCompile(path, get_manifest=True)
+        # the modules shared by the contracts are imported from the contracts folder
+        _, manifest = self.assertCompile(path, root_folder=os.path.dirname(os.path.dirname(path)), get_manifest=True)
 
         self.assertIn('supportedstandards', manifest)
         self.assertIsInstance(manifest['supportedstandards'], list)
@@ -53,6 +57,13 @@ class TestGM(boatestcase.BoaTestCase):
         self.assertIn('NEP-17', manifest['supportedstandards'])
         self.assertIn('NEP-17-1', manifest['supportedstandards'])
 
+        # the methods imported from ghost_runtime are exported
+        methods = [method['name'] for method in manifest['abi']['methods']]
+        for method in ['getAuthorizedAddress', 'setAuthorizedAddress', 'isPaused', 'updatePause', 'update']:
+            self.assertIn(method, methods)
+        # the token doesn't sign as itself
+        self.assertNotIn('verify', methods)
+
     async def test_symbol(self):
         expected = 'GM'
         result, _ = await self.call('symbol', return_type=str)
@@ -144,6 +155,71 @@ class TestGM(boatestcase.BoaTestCase):
         self.assertEqual(balance_from - amount, new_balance_from)
         self.assertEqual(balance_to + amount, new_balance_to)
 
+    async def test_multi_transfer(self):
+        from_account = self.account1
+        from_script_hash = from_account.script_hash
+        # an account no other test uses, its balance starts at zero
+        to_script_hash = types.UInt160(b'\x01' * 20)
+
+        balance_from, _ = await self.call('balanceOf', [from_script_hash], return_type=int)
+        transfers = [[to_script_hash, 10], [from_script_hash, 5], [to_script_hash, 3]]
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call(
+                'multiTransfer',
+                [from_script_hash, [[to_script_hash, -1]], None],
+                return_type=bool,
+                signing_accounts=[from_account]
+            )
+        self.assertEqual(str(context.exception), 'multiTransfer - amount must be greater than or equal to 0')
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call(
+                'multiTransfer',
+                [from_script_hash, [[to_script_hash]], None],
+                return_type=bool,
+                signing_accounts=[from_account]
+            )
+        self.assertEqual(str(context.exception), 'multiTransfer - invalid transfer')
+
+        # missing signature
+        result, _ = await self.call('multiTransfer', [from_script_hash, transfers, None], return_type=bool)
+        self.assertEqual(False, result)
+
+        # the whole batch is refused when the balance can't cover it
+        result, notifications = await self.call(
+            'multiTransfer',
+            [from_script_hash, [*transfers, [to_script_hash, balance_from]], None],
+            return_type=bool,
+            signing_accounts=[from_account]
+        )
+        self.assertEqual(False, result)
+        self.assertEqual(0, len(self.filter_events(notifications, event_name='Transfer')))
+
+        result, notifications = await self.call(
+            'multiTransfer',
+            [from_script_hash, transfers, None],
+            return_type=bool,
+            signing_accounts=[from_account]
+        )
+        self.assertEqual(True, result)
+
+        transfer_events = self.filter_events(
+            notifications,
+            event_name='Transfer',
+            notification_type=boatestcase.Nep17TransferEvent
+        )
+        self.assertEqual(len(transfers), len(transfer_events))
+        for event, (to, amount) in zip(transfer_events, transfers):
+            self.assertEqual(from_script_hash, event.source)
+            self.assertEqual(to, event.destination)
+            self.assertEqual(amount, event.amount)
+
+        result, _ = await self.call('balanceOf', [from_script_hash], return_type=int)
+        self.assertEqual(balance_from - 13, result)
+        result, _ = await self.call('balanceOf', [to_script_hash], return_type=int)
+        self.assertEqual(13, result)
+
     async def test_transfer_fail_no_sign(self):
         from_account = self.owner.script_hash
         to_account = self.account1.script_hash
@@ -212,6 +288,65 @@ class TestGM(boatestcase.BoaTestCase):
                 signing_accounts=[self.owner]
             )
 
+    async def test_authorize(self):
+        account = self.account1.script_hash
+
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160])
+        self.assertEqual([self.owner.script_hash], result)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('updatePause', [False], return_type=bool, signing_accounts=[self.account1])
+        self.assertEqual(str(context.exception), 'updatePause - `account` is not allowed for updatePause')
+
+        await self.call(
+            'setAuthorizedAddress',
+            [account, True],
+            return_type=None,
+            signing_accounts=[self.owner]
+        )
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160])
+        self.assertEqual(sorted([self.owner.script_hash, account]), sorted(result))
+
+        result, _ = await self.call('updatePause', [False], return_type=bool, signing_accounts=[self.account1])
+        self.assertEqual(False, result)
+
+        await self.call(
+            'setAuthorizedAddress',
+            [account, False],
+            return_type=None,
+            signing_accounts=[self.owner]
+        )
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160])
+        self.assertEqual([self.owner.script_hash], result)
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call('updatePause', [False], return_type=bool, signing_accounts=[self.account1])
+        self.assertEqual(str(context.exception), 'updatePause - `account` is not allowed for updatePause')
+
+    async def test_pause(self):
+        result, _ = await self.call('updatePause', [True], return_type=bool, signing_accounts=[self.owner])
+        self.assertEqual(True, result)
+        result, _ = await self.call('isPaused', [], return_type=bool)
+        self.assertEqual(True, result)
+        # deployed and paused are packed in a single key
+        self.assertEqual({b'STATE': b'\x03'}, await self.get_storage(b'STATE'))
+        self.assertEqual({}, await self.get_storage(b'paused'))
+
+        with self.assertRaises(boatestcase.AssertException) as context:
+            await self.call(
+                'transfer',
+                [self.owner.script_hash, self.account1.script_hash, 1, None],
+                return_type=bool,
+                signing_accounts=[self.owner]
+            )
+        self.assertEqual(str(context.exception), 'transfer - contract paused')
+
+        result, _ = await self.call('updatePause', [False], return_type=bool, signing_accounts=[self.owner])
+        self.assertEqual(False, result)
+        result, _ = await self.call('isPaused', [], return_type=bool)
+        self.assertEqual(False, result)
+        self.assertEqual({b'STATE': b'\x01'}, await self.get_storage(b'STATE'))
+
     async def test_on_nep17_payment_abort(self):
         # trying to call onNEP17Payment() will result in an abort 
         with self.assertRaises(boatestcase.AbortException):
@@ -0,0 +1,101 @@
+import ast
+import base64
+import json
+import os
+import sys
+import unittest
+
+GHOST_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(GHOST_ROOT)
+
+import metadata
+
+
+NFT_META = {
+    'name': 'Ghost #12',
+    'description': 'A ghost of the GhostMarket collection',
+    'image': 'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12.png',
+    'external_url': 'https://ghostmarket.io/asset/n3/ghost/12',
+    'attributes': [
+        {'trait_type': 'Background', 'value': 'Blue'},
+        {'trait_type': 'Eyes', 'value': 'Laser'},
+        {'trait_type': 'Level', 'value': 5, 'display_type': 'number'},
+    ],
+}
+
+
+class TestMetadata(unittest.TestCase):
+
+    def test_dictionary_matches_contract(self):
+        with open(os.path.join(GHOST_ROOT, 'contracts/NEP11', 'GhostMarketNFT.py')) as contract_file:
+            tree = ast.parse(contract_file.read())
+
+        decompress = next(
+            node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef) and node.name == 'decompress_meta'
+        )
+        dictionary = next(
+            node.value for node in ast.walk(decompress)
+            if isinstance(node, ast.AnnAssign) and node.target.id == 'dictionary'
+        )
+        self.assertEqual(metadata.META_DICTIONARY, ast.literal_eval(dictionary))
+
+        dictionary_size = next(
+            node.value for node in tree.body
+            if isinstance(node, ast.Assign) and node.targets[0].id == 'META_DICTIONARY_SIZE'
+        )
+        self.assertEqual(len(metadata.META_DICTIONARY), ast.literal_eval(dictionary_size))
+
+    def test_compress_round_trip(self):
+        for meta in [
+            json.dumps(NFT_META, separators=(',', ':')).encode(),
+            json.dumps(NFT_META).encode(),
+            'no dictionary string, non ascii é'.encode(),
+            b''.join(metadata.META_DICTIONARY),
+            b'x' * 300,
+        ]:
+            with self.subTest(meta=meta):
+                compressed = metadata.compress_meta(meta)
+                self.assertEqual(metadata.COMPRESSED_META, compressed[0])
+                self.assertEqual(meta, metadata.decompress_meta(compressed))
+
+    def test_compress_serialized_array(self):
+        compressed = metadata.compress_meta(b'{"name":"Ghost","image":"ipfs://Qm')
+        self.assertEqual(
+            bytes([
+                metadata.COMPRESSED_META, metadata.ARRAY_TYPE, 5,
+                metadata.INTEGER_TYPE, 0,
+                metadata.BYTESTRING_TYPE, 5, *b'Ghost',
+                metadata.INTEGER_TYPE, 1, 2,
+                metadata.INTEGER_TYPE, 1, 16,
+                metadata.BYTESTRING_TYPE, 2, *b'Qm',
+            ]),
+            compressed
+        )
+
+    def test_decompress_uncompressed(self):
+        meta = json.dumps(NFT_META).encode()
+        self.assertEqual(meta, metadata.decompress_meta(meta))
+        self.assertEqual(b'', metadata.decompress_meta(b''))
+
+    def test_decompress_uri_meta(self):
+        content_hash = bytes(range(32))
+        stored = bytes([metadata.URI_META]) + content_hash + b'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12'
+        self.assertEqual(
+            {'tokenURI': 'ipfs://QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG/12',
+             'contentHash': base64.b64encode(content_hash).decode()},
+            json.loads(metadata.decompress_meta(stored))
+        )
+
+    def test_mint_meta(self):
+        meta = json.dumps(NFT_META, indent=4).encode()
+        minted = metadata.mint_meta(meta)
+        self.assertLess(len(minted), len(meta) // 2)
+        self.assertEqual(NFT_META, json.loads(metadata.decompress_meta(minted)))
+
+        # kept as is when compressing doesn't save space
+        meta = b'{"a":1}'
+        self.assertEqual(meta, metadata.mint_meta(meta))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+import itertools
+import json
+import os
+import sys
+
+from neo3.contracts.contract import CONTRACT_HASHES
+from neo3.contracts.manifest import ContractManifest
+from neo3.core import types
+from neo3.wallet import account
+from neo3.wallet.utils import address_to_script_hash
+
+from boa3.internal.neo.vm.type.String import String
+from deploy_fee import DeployFeeTestCase
+
+GHOST_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(GHOST_ROOT)
+
+import build
+
+
+class TestUpgrade(DeployFeeTestCase):
+    """
+    Update deployments of the contracts as they were first released, in tests/baseline, to the current contracts.
+    """
+    TOKEN_META = bytes('{ "name": "NEP11", "description": "Some description", "image": "{some image URI}" }', 'utf-8')
+    TOKEN_LOCKED = bytes('lockedContent', 'utf-8')
+    # string values, which the first release returned as they were minted
+    ROYALTIES = bytes(
+        '[{"address": "NZcuGiwRu1QscpmCyxj5XwQBUf6sk7dJJN", "value": "2000"}, '
+        '{"address": "NiNmXL8FjEUEs1nfX9uHFBNaenxDHJtmuB", "value": "3000"}]',
+        'utf-8')
+
+    TOKEN_PREFIX = b'TPF'
+    # the optional records of a token, deleted on burn if the token has them
+    OPTIONAL_RECORD_PREFIXES = [b'LCP', b'RYP', b'RIP', b'LVCP']
+
+    owner: account.Account
+    account1: account.Account
+    account2: account.Account
+
+    @classmethod
+    def setupTestCase(cls):
+        cls.owner = cls.node.wallet.account_new(label='owner', password='123')
+        cls.account1 = cls.node.wallet.account_new(label='test1', password='123')
+        cls.account2 = cls.node.wallet.account_new(label='test2', password='123')
+
+        super().setupTestCase()
+
+    @classmethod
+    async def asyncSetupClass(cls) -> None:
+        await super().asyncSetupClass()
+
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.owner.script_hash, 100)
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account1.script_hash, 100)
+        await cls.transfer(CONTRACT_HASHES.GAS_TOKEN, cls.genesis.script_hash, cls.account2.script_hash, 100)
+
+    async def update_from_baseline(self, contract_hash: types.UInt160, *path: str):
+        """
+        Update the baseline deployment `contract_hash` to the current contract at `path`, sending its manifest like
+        neo-cli does.
+        """
+        contract_path = self.get_contract_path(*path)
+        if path[-1] == 'GhostMarketNFT.py':
+            # the debug instrumentation makes the NFT too large to be deployed
+            contract_path = build.build_contract(contract_path, contract_path.replace('.py', '.nef'))
+
+        new_nef, new_manifest = self.get_serialized_output(contract_path)
+        arg_manifest = String(
+            json.dumps(ContractManifest.from_json(new_manifest).to_json(), separators=(',', ':'))
+        ).to_bytes()
+        await self.update_contract(new_nef, arg_manifest, self.owner, target_contract=contract_hash)
+
+    async def authorize_accounts(self, contract_hash: types.UInt160):
+        """
+        Authorize account1 and account2 on the baseline deployment `contract_hash`, stored in a single list.
+        """
+        for authorized in [self.account1, self.account2]:
+            await self.call('setAuthorizedAddress', [authorized.script_hash, True], return_type=None,
+                            target_contract=contract_hash, signing_accounts=[self.owner])
+
+    async def assert_still_paused(self, contract_hash: types.UInt160):
+        """
+        Check the baseline deployment `contract_hash`, paused before the update, is still paused, then unpause it.
+        """
+        result, _ = await self.call('isPaused', [], return_type=bool, target_contract=contract_hash)
+        self.assertEqual(True, result)
+        self.assertEqual({}, await self.get_storage(b'paused', target_contract=contract_hash))
+
+        await self.call('updatePause', [False], return_type=bool, target_contract=contract_hash,
+                        signing_accounts=[self.owner])
+        result, _ = await self.call('isPaused', [], return_type=bool, target_contract=contract_hash)
+        self.assertEqual(False, result)
+
+    async def assert_authorized_accounts(self, contract_hash: types.UInt160, auth_addresses_key: bytes):
+        """
+        Check the addresses authorized on the baseline deployment `contract_hash` are still authorized after the update,
+        and account1 can administrate it.
+        """
+        expected = sorted(authorized.script_hash for authorized in [self.owner, self.account1, self.account2])
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160],
+                                    target_contract=contract_hash)
+        self.assertEqual(expected, sorted(result))
+
+        storage = await self.get_storage(auth_addresses_key, target_contract=contract_hash)
+        self.assertNotIn(auth_addresses_key, storage)
+
+        await self.call('setAuthorizedAddress', [self.account2.script_hash, False], return_type=None,
+                        target_contract=contract_hash, signing_accounts=[self.account1])
+        result, _ = await self.call('getAuthorizedAddress', [], return_type=list[types.UInt160],
+                                    target_contract=contract_hash)
+        self.assertEqual(sorted([self.owner.script_hash, self.account1.script_hash]), sorted(result))
+
+    async def test_update_nft(self):
+        contract_hash = await self.compile_and_deploy('baseline', 'GhostMarketNFT.py', signing_account=self.owner)
+        await self.authorize_accounts(contract_hash)
+
+        # a token for each combination of the optional records
+        tokens: list[tuple[bytes, bytes, bytes, bool]] = []
+        combinations = itertools.product([b'', self.TOKEN_LOCKED], [b'', self.ROYALTIES], [False, True])
+        for locked, royalties, viewed in combinations:
+            token, _ = await self.call(
+                'mint',
+                [self.owner.script_hash, self.TOKEN_META, locked, royalties],
+                return_type=bytes,
+                target_contract=contract_hash,
+                signing_accounts=[self.owner]
+            )
+            if viewed:
+                await self.call('getLockedContent', [token], return_type=bytes, target_contract=contract_hash,
+                                signing_accounts=[self.owner])
+            tokens.append((token, locked, royalties, viewed))
+
+        # metadata the first release stored as sent, starting like the metadata formats added since
+        token_meta = json.dumps({'name': 'Legacy'}).encode()
+        missing_collection = bytes([0x40, 2, 0x28, 7, *b'missing', 0x28, len(token_meta), *token_meta])
+        legacy_tokens: list[bytes] = []
+        for meta in [bytes([0x01, 0x40, 1]), bytes([0x40, 2, 0x28]), missing_collection, bytes([0x02, 1, 2, 3])]:
+            token, _ = await self.call('mint', [self.owner.script_hash, meta, b'', b''], return_type=bytes,
+                                       target_contract=contract_hash, signing_accounts=[self.owner])
+            legacy_tokens.append(token)
+
+        await self.call('updatePause', [True], return_type=bool, target_contract=contract_hash,
+                        signing_accounts=[self.owner])
+        await self.update_from_baseline(contract_hash, '..', 'contracts/NEP11', 'GhostMarketNFT.py')
+
+        await self.assert_still_paused(contract_hash)
+
+        result, _ = await self.call('propertiesMany', [[tokens[0][0], *legacy_tokens]], return_type=list,
+                                    target_contract=contract_hash)
+        self.assertEqual(
+            json.loads(self.TOKEN_META),
+            {key.decode('utf-8'): value.decode('utf-8') for key, value in result[0].items()}
+        )
+        self.assertEqual([None] * len(legacy_tokens), result[1:])
+
+        await self.assert_authorized_accounts(contract_hash, b'AUTH_ADDRESSES')
+        result, _ = await self.call('verify', [], return_type=bool, target_contract=contract_hash,
+                                    signing_accounts=[self.account1])
+        self.assertEqual(True, result)
+
+        # the token records aren't rewritten by the update
+        for token, _, _, _ in tokens:
+            records = await self.get_storage(self.TOKEN_PREFIX + token, target_contract=contract_hash)
+            self.assertEqual(self.owner.script_hash.to_array(), records[self.TOKEN_PREFIX + token])
+
+        sale_price = 10_000
+        for token, locked, royalties, viewed in tokens:
+            with self.subTest(locked=locked, royalties=royalties, viewed=viewed):
+                result, _ = await self.call('ownerOf', [token], return_type=types.UInt160,
+                                            target_contract=contract_hash)
+                self.assertEqual(self.owner.script_hash, result)
+
+                expected = [
+                    [address_to_script_hash(royalty['address']).to_array(), sale_price * int(royalty['value']) // 10000]
+                    for royalty in (json.loads(royalties) if len(royalties) > 0 else [])
+                ]
+                result, _ = await self.call('royaltyInfo', [token, CONTRACT_HASHES.GAS_TOKEN, sale_price],
+                                            return_type=list[list], target_contract=contract_hash)
+                self.assertEqual(expected, result)
+
+                # the royalties of the tokens minted before are returned as they were minted
+                result, _ = await self.call('getRoyalties', [token], return_type=bytes, target_contract=contract_hash)
+                self.assertEqual(royalties, result)
+
+                result, _ = await self.call('getLockedContentViewCount', [token], return_type=int,
+                                            target_contract=contract_hash)
+                self.assertEqual(1 if viewed else 0, result)
+
+                # viewed tokens are burned without being unlocked again, which would flag their record
+                if len(locked) > 0 and not viewed:
+                    result, _ = await self.call('getLockedContent', [token], return_type=bytes,
+                                                target_contract=contract_hash, signing_accounts=[self.owner])
+                    self.assertEqual(locked, result)
+
+                result, _ = await self.call('burn', [token], return_type=bool, target_contract=contract_hash,
+                                            signing_accounts=[self.owner])
+                self.assertEqual(True, result)
+                for prefix in [self.TOKEN_PREFIX, *self.OPTIONAL_RECORD_PREFIXES]:
+                    self.assertEqual({}, await self.get_storage(prefix + token, target_contract=contract_hash))
+
+        # the royalties of the tokens minted since are returned as they were minted too
+        token, _ = await self.call('mint', [self.owner.script_hash, self.TOKEN_META, b'', self.ROYALTIES],
+                                   return_type=bytes, target_contract=contract_hash, signing_accounts=[self.owner])
+        result, _ = await self.call('getRoyalties', [token], return_type=bytes, target_contract=contract_hash)
+        self.assertEqual(self.ROYALTIES, result)
+
+    async def test_update_gm(self):
+        contract_hash = await self.compile_and_deploy('baseline', 'GhostMarketToken.py', signing_account=self.owner)
+        await self.authorize_accounts(contract_hash)
+
+        await self.call('updatePause', [True], return_type=bool, target_contract=contract_hash,
+                        signing_accounts=[self.owner])
+        await self.update_from_baseline(contract_hash, '..', 'contracts/NEP17', 'GhostMarketToken.py')
+
+        await self.assert_still_paused(contract_hash)
+
+        # the list was stored under the first bytes of the prefix of the authorized addresses
+        await self.assert_authorized_accounts(contract_hash, b'AU')